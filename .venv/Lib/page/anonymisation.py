@@ -0,0 +1,76 @@
+import random
+import sqlite3
+
+# Largeur minimale d'un numéro d'anonymat (4 chiffres : 1000 à 9999)
+LARGEUR_MINIMALE = 4
+
+# Proportion maximale de numéros attribués dans l'espace choisi, pour qu'ils restent difficiles à deviner
+DENSITE_MAXIMALE = 0.1
+
+# Générateur basé sur l'aléa du système : les numéros ne sont pas prévisibles
+_aleatoire = random.SystemRandom()
+
+
+def largeur_automatique(nombre_total):
+    """Plus petite largeur (en chiffres) gardant la densité des numéros sous DENSITE_MAXIMALE"""
+    largeur = LARGEUR_MINIMALE
+    while 9 * 10 ** (largeur - 1) * DENSITE_MAXIMALE < nombre_total:
+        largeur += 1
+    return largeur
+
+
+def tirer_sans_remise(debut, fin, deja_pris, nombre, aleatoire=_aleatoire):
+    """Tire `nombre` entiers distincts dans [debut, fin) en évitant ceux de `deja_pris`.
+
+    On tire des rangs parmi les numéros libres puis on les convertit en numéros en
+    sautant les numéros déjà pris : une seule passe, sans aucune collision à réessayer.
+    """
+    pris = sorted({n - debut for n in deja_pris if debut <= n < fin})
+    libres = (fin - debut) - len(pris)
+    if nombre > libres:
+        raise ValueError(f"Seulement {libres} numéro(s) libre(s) pour {nombre} candidat(s)")
+
+    rangs = aleatoire.sample(range(libres), nombre)
+
+    # Conversion rang -> numéro, en parcourant les rangs par ordre croissant
+    numeros = [0] * nombre
+    sautes = 0
+    for position in sorted(range(nombre), key=rangs.__getitem__):
+        rang = rangs[position]
+        while sautes < len(pris) and pris[sautes] <= rang + sautes:
+            sautes += 1
+        numeros[position] = debut + rang + sautes
+    return numeros
+
+
+def attribuer_anonymats(conn, largeur=None):
+    """Attribue un numéro d'anonymat unique à chaque candidat qui n'en a pas, en une seule transaction.
+
+    Retourne le nombre de candidats anonymisés.
+    """
+    cursor = conn.cursor()
+    try:
+        # Verrou d'écriture pris avant la lecture des numéros déjà attribués
+        cursor.execute("BEGIN IMMEDIATE")
+
+        cursor.execute("SELECT id FROM candidat WHERE anonymat IS NULL OR anonymat = 0 ORDER BY id")
+        candidats = [candidat_id for (candidat_id,) in cursor.fetchall()]
+        if not candidats:
+            conn.rollback()
+            return 0
+
+        cursor.execute("SELECT anonymat FROM candidat WHERE anonymat IS NOT NULL AND anonymat <> 0")
+        deja_pris = [anonymat for (anonymat,) in cursor.fetchall()]
+
+        if largeur is None:
+            largeur = largeur_automatique(len(candidats) + len(deja_pris))
+        numeros = tirer_sans_remise(10 ** (largeur - 1), 10 ** largeur, deja_pris, len(candidats))
+
+        # L'index unique sur candidat(anonymat) garantit qu'aucun doublon ne peut être écrit
+        cursor.executemany("UPDATE candidat SET anonymat = ? WHERE id = ?", zip(numeros, candidats))
+        conn.commit()
+    except (sqlite3.Error, ValueError):
+        conn.rollback()
+        raise
+
+    return len(candidats)
@@ -0,0 +1,2071 @@
+import sqlite3
+from functools import partial
+
+from PyQt5.QtWidgets import (
+    QApplication, QMainWindow, QPushButton, QVBoxLayout, QHBoxLayout, QWidget,
+    QLabel, QStackedWidget, QFormLayout, QLineEdit, QDateEdit, QComboBox,
+    QMessageBox, QTableWidget, QTableWidgetItem, QSpinBox, QDialog, QFrame,
+    QAbstractItemView, QDoubleSpinBox, QFileDialog, QTableView, QDockWidget
+)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
+from PyQt5.QtGui import QTextDocument
+
+import anonymisation
+import consolidation
+import deliberation
+import depot
+import importation
+import rapports
+import statistiques
+from connexion import get_connexion
+from modeles import ModeleSQL, ModeleGrilleNotes, DelegueActions
+from taches import DELAI_FERMETURE, GestionnaireTaches, PanneauTaches
+
+
+
+class BFEMApp(QMainWindow):
+    def __init__(self, email_membre):
+        super().__init__()
+        self.setWindowTitle("Gestion du BFEM")
+        self.setGeometry(100, 100, 1200, 700)
+        self.setStyleSheet("background-color: #1E1E1E; color: white;")
+
+        # Récupérer les informations du jury et du membre
+        self.jury_info, self.membre_connecte = self.get_jury_info(email_membre)
+
+        self.theme_sombre = True  # Commence en mode sombre
+
+        # Pages de liste déjà construites, réutilisées d'un affichage à l'autre
+        self.pages = {}
+
+        # Tâches longues exécutées hors du thread de l'interface
+        self.taches = GestionnaireTaches(self)
+
+        # Interface principale
+        self.init_ui()
+
+    def init_ui(self):
+        """Initialisation de l'interface utilisateur"""
+        self.header = self.create_header()
+        self.sidebar = self.create_sidebar()
+        self.main_content = QStackedWidget()
+
+        # Pages principales
+        self.dashboard_page = self.create_dashboard_page()
+        self.main_content.addWidget(self.dashboard_page)
+
+        # Page Gestion des candidats
+        self.gestion_candidats_page = QLabel("Gestion des candidats", alignment=Qt.AlignCenter)
+        self.gestion_candidats_page.setStyleSheet("font-size: 24px; font-weight: bold; color: #FFA500;")
+        self.main_content.addWidget(self.gestion_candidats_page)
+
+        # Layout principal
+        main_layout = QHBoxLayout()
+        main_layout.addWidget(self.sidebar)
+        content_layout = QVBoxLayout()
+        content_layout.addWidget(self.header)
+        content_layout.addWidget(self.main_content)
+        main_layout.addLayout(content_layout)
+
+        container = QWidget()
+        container.setLayout(main_layout)
+        self.setCentralWidget(container)
+
+        self.creer_panneau_taches()
+
+    # header
+    def create_header(self):
+        """Créer l'en-tête de l'application avec un design moderne"""
+        header = QWidget()
+        header.setStyleSheet("""
+            background-color: #1E1E1E;
+            padding: 10px;
+            border-bottom: 2px solid #3A3A3A;
+        """)
+        layout = QHBoxLayout()
+
+        # Bouton Menu
+        menu_button = QPushButton("📂 Menu", clicked=self.toggle_sidebar)
+        menu_button.setStyleSheet("""
+            QPushButton {
+                background-color: #444;
+                color: white;
+                padding: 10px 15px;
+                border-radius: 5px;
+                font-size: 14px;
+                border: none;
+            }
+            QPushButton:hover {
+                background-color: #555;
+            }
+            QPushButton:pressed {
+                background-color: #666;
+            }
+        """)
+
+        # Bouton Déconnexion
+        logout_button = QPushButton("🔴 Déconnexion", clicked=self.close)
+        logout_button.setStyleSheet("""
+            QPushButton {
+                background-color: #FF4444;
+                color: white;
+                padding: 10px 15px;
+                border-radius: 5px;
+                font-size: 14px;
+                border: none;
+            }
+            QPushButton:hover {
+                background-color: #FF5555;
+            }
+            QPushButton:pressed {
+                background-color: #FF6666;
+            }
+        """)
+
+        # Informations du jury
+        jury_label = QLabel(f"📌 {self.jury_info}")
+        jury_label.setStyleSheet("""
+            QLabel {
+                font-size: 16px;
+                color: #00A8E8;
+                font-weight: bold;
+            }
+        """)
+
+        # Informations du membre connecté
+        membre_label = QLabel(f"👤 {self.membre_connecte}")
+        membre_label.setStyleSheet("""
+            QLabel {
+                font-size: 14px;
+                color: #FFFFFF;
+                font-weight: bold;
+            }
+        """)
+
+        # Bouton du panneau des tâches de fond
+        taches_button = QPushButton("⏳ Tâches", clicked=self.toggle_panneau_taches)
+        taches_button.setStyleSheet(menu_button.styleSheet())
+
+        # Ajout des widgets au layout
+        layout.addWidget(menu_button)
+        layout.addWidget(jury_label)
+        layout.addStretch()  # Espace flexible pour pousser les éléments à droite
+        layout.addWidget(taches_button)
+        layout.addWidget(membre_label)
+        layout.addWidget(logout_button)
+
+        header.setLayout(layout)
+        return header
+
+    # le sideBar
+    def create_sidebar(self):
+        """Créer la barre latérale avec sous-menus bien organisés"""
+        sidebar = QWidget()
+        sidebar.setStyleSheet("background-color: #2C2C2C; padding: 10px;")
+        sidebar.setFixedWidth(250)
+        layout = QVBoxLayout()
+
+        # 🔹 TABLEAU DE BORD
+        self.btn_dashboard = QPushButton("🏠 Tableau de bord", clicked=self.afficher_tableau_de_bord)
+        self.btn_dashboard.setStyleSheet("background-color: #444; color: white; padding: 10px; border-radius: 5px;")
+        layout.addWidget(self.btn_dashboard)
+
+        # 🔹 GESTION DES CANDIDATS
+        self.btn_candidats = QPushButton("👥 Gestion des candidats", clicked=self.toggle_candidats_submenu)
+        self.btn_candidats.setStyleSheet("background-color: #444; color: white; padding: 10px; border-radius: 5px;")
+        layout.addWidget(self.btn_candidats)
+
+        # Sous-menu des candidats
+        self.candidats_submenu = QVBoxLayout()
+        self.candidats_submenu.setSpacing(5)
+        self.candidats_submenu.setContentsMargins(20, 0, 0, 0)
+
+        self.btn_liste_candidats = QPushButton("📋 Liste des candidats", clicked=self.open_liste_candidats)
+        self.btn_ajouter_candidat = QPushButton("➕ Ajouter un candidat", clicked=self.open_add_candidat_form)
+        self.btn_generer_anonyme = QPushButton("🔀 Générer Anonymat", clicked=self.generer_anonymat)
+        self.btn_liste_releves = QPushButton("📜 Liste des relevés", clicked=self.open_liste_releves)
+        self.btn_importer_candidats = QPushButton("📥 Importer des candidats (CSV)", clicked=self.importer_candidats_csv)
+
+        # Ajout du bouton pour exporter en PDF
+        self.btn_liste_candidats_pdf = QPushButton("📄 Liste des candidats en PDF", clicked=self.exporter_candidats_pdf)
+        self.btn_exporter_centre = QPushButton("📦 Exporter le centre (base nationale)", clicked=self.exporter_centre)
+
+        # Appliquer le même style à tous les boutons du sous-menu
+        for btn in [self.btn_ajouter_candidat, self.btn_liste_candidats, self.btn_generer_anonyme,
+                    self.btn_liste_releves, self.btn_liste_candidats_pdf, self.btn_importer_candidats,
+                    self.btn_exporter_centre]:
+            btn.setStyleSheet(
+                "background-color: #555; color: white; padding: 8px; border-radius: 5px; margin-left: 20px;")
+
+        # Ajouter les boutons au sous-menu
+        self.candidats_submenu.addWidget(self.btn_ajouter_candidat)
+        self.candidats_submenu.addWidget(self.btn_importer_candidats)
+        self.candidats_submenu.addWidget(self.btn_liste_candidats)
+        self.candidats_submenu.addWidget(self.btn_generer_anonyme)
+        self.candidats_submenu.addWidget(self.btn_liste_releves)
+        self.candidats_submenu.addWidget(self.btn_liste_candidats_pdf)  # ✅ Nouveau bouton ajouté ici
+        self.candidats_submenu.addWidget(self.btn_exporter_centre)
+
+        # Convertir en widget et cacher par défaut
+        self.candidats_submenu_widget = QWidget()
+        self.candidats_submenu_widget.setLayout(self.candidats_submenu)
+        self.candidats_submenu_widget.setVisible(False)
+        layout.addWidget(self.candidats_submenu_widget)
+
+        # 🔹 SÉPARATEUR VISUEL
+        layout.addWidget(self.create_separator())
+
+        # 🔹 GESTION DU PREMIER TOUR
+        self.btn_notes_matieres = QPushButton("📚 Gestion du premier tour", clicked=self.toggle_notes_submenu)
+        self.btn_notes_matieres.setStyleSheet(
+            "background-color: #444; color: white; padding: 10px; border-radius: 5px;")
+        layout.addWidget(self.btn_notes_matieres)
+
+        # Sous-menu des notes et matières
+        self.notes_submenu = QVBoxLayout()
+        self.notes_submenu.setSpacing(5)
+        self.notes_submenu.setContentsMargins(20, 0, 0, 0)
+
+        self.btn_ajouter_matiere = QPushButton("✏️ Ajouter une matière", clicked=self.open_add_matiere_form)
+        self.btn_liste_matieres = QPushButton("📋 Liste des matières", clicked=self.open_liste_matieres)
+        self.btn_ajouter_note = QPushButton("📝 Ajouter une note", clicked=self.open_add_note_form)  # ✅ Ajout
+        self.btn_liste_notes = QPushButton("📊 Liste des notes", clicked=self.open_liste_notes)  # ✅ Ajout
+        self.btn_importer_notes = QPushButton("📥 Importer des notes (CSV)", clicked=lambda: self.importer_notes_csv(1))
+
+        # Appliquer un style uniforme
+        for btn in [self.btn_liste_matieres, self.btn_ajouter_matiere, self.btn_ajouter_note, self.btn_liste_notes,
+                    self.btn_importer_notes]:
+            btn.setStyleSheet(
+                "background-color: #555; color: white; padding: 8px; border-radius: 5px; margin-left: 20px;")
+
+        # Ajouter les boutons au sous-menu
+        self.notes_submenu.addWidget(self.btn_liste_matieres)
+        self.notes_submenu.addWidget(self.btn_ajouter_matiere)
+        self.notes_submenu.addWidget(self.btn_ajouter_note)  # ✅ Ajout
+        self.notes_submenu.addWidget(self.btn_liste_notes)  # ✅ Ajout
+        self.notes_submenu.addWidget(self.btn_importer_notes)
+
+        # Convertir en widget et cacher par défaut
+        self.notes_submenu_widget = QWidget()
+        self.notes_submenu_widget.setLayout(self.notes_submenu)
+        self.notes_submenu_widget.setVisible(False)
+        layout.addWidget(self.notes_submenu_widget)
+
+        # 🔹 SÉPARATEUR VISUEL
+        layout.addWidget(self.create_separator())
+        # 🔹 RÉSULTATS PREMIER TOUR
+        self.btn_resultats_premier_tour = QPushButton("📊 Résultats Premier Tour", clicked=self.toggle_resultats_submenu)
+        self.btn_resultats_premier_tour.setStyleSheet(
+            "background-color: #444; color: white; padding: 10px; border-radius: 5px;")
+        layout.addWidget(self.btn_resultats_premier_tour)
+
+        # Sous-menu des résultats du premier tour
+        self.resultats_submenu = QVBoxLayout()
+        self.resultats_submenu.setSpacing(5)
+        self.resultats_submenu.setContentsMargins(20, 0, 0, 0)
+
+        self.btn_deliberation = QPushButton("⚖️ Délibération", clicked=self.open_deliberation)
+        self.btn_liste_admis = QPushButton("✅ Liste des admis", clicked=self.open_liste_admis)
+        self.btn_liste_admissibles = QPushButton("🟠 Liste des admissibles", clicked=self.open_liste_admissibles)
+        self.btn_liste_ajournes = QPushButton("❌ Liste des ajournés", clicked=self.open_liste_ajournes)
+        self.btn_releve_notes = QPushButton("📄 Relevé de notes", clicked=self.open_releve_notes)
+
+        # Appliquer le même style à tous les boutons du sous-menu
+        for btn in [self.btn_deliberation, self.btn_liste_admis, self.btn_liste_admissibles, self.btn_liste_ajournes,
+                    self.btn_releve_notes]:
+            btn.setStyleSheet(
+                "background-color: #555; color: white; padding: 8px; border-radius: 5px; margin-left: 20px;")
+
+        # Ajouter les boutons au sous-menu
+        self.resultats_submenu.addWidget(self.btn_deliberation)
+        self.resultats_submenu.addWidget(self.btn_liste_admis)
+        self.resultats_submenu.addWidget(self.btn_liste_admissibles)
+        self.resultats_submenu.addWidget(self.btn_liste_ajournes)
+        self.resultats_submenu.addWidget(self.btn_releve_notes)
+
+        # Convertir en widget et cacher par défaut
+        self.resultats_submenu_widget = QWidget()
+        self.resultats_submenu_widget.setLayout(self.resultats_submenu)
+        self.resultats_submenu_widget.setVisible(False)
+        layout.addWidget(self.resultats_submenu_widget)
+
+        # 🔹 SÉPARATEUR VISUEL
+        layout.addWidget(self.create_separator())
+
+        # 🔹 GESTION DU DEUXIÈME TOUR
+        self.btn_notes_matieres_2em_tour = QPushButton("📚 Gestion du deuxième tour",
+                                                       clicked=self.toggle_notes_2em_tour_submenu)
+        self.btn_notes_matieres_2em_tour.setStyleSheet(
+            "background-color: #444; color: white; padding: 10px; border-radius: 5px;")
+        layout.addWidget(self.btn_notes_matieres_2em_tour)
+
+        # Sous-menu des notes et matières du 2e tour
+        self.notes_2em_tour_submenu = QVBoxLayout()
+        self.notes_2em_tour_submenu.setSpacing(5)
+        self.notes_2em_tour_submenu.setContentsMargins(20, 0, 0, 0)
+
+        self.btn_ajouter_matiere_2em_tour = QPushButton("✏️ Ajouter une matière du 2e tour",
+                                                        clicked=self.open_add_matiere_2em_tour_form)
+        self.btn_liste_matieres_2em_tour = QPushButton("📋 Liste des matières du 2e tour",
+                                                       clicked=self.open_liste_matieres_2em_tour)
+        self.btn_ajouter_note_2em_tour = QPushButton("📝 Ajouter une note du 2e tour",
+                                                     clicked=self.open_add_note_2em_tour_form)
+        self.btn_liste_notes_2em_tour = QPushButton("📊 Liste des notes du 2e tour",
+                                                    clicked=self.open_liste_notes_2em_tour)
+        self.btn_importer_notes_2em_tour = QPushButton("📥 Importer des notes du 2e tour (CSV)",
+                                                       clicked=lambda: self.importer_notes_csv(2))
+
+        # Appliquer un style uniforme
+        for btn in [self.btn_ajouter_matiere_2em_tour, self.btn_liste_matieres_2em_tour, self.btn_ajouter_note_2em_tour,
+                    self.btn_liste_notes_2em_tour, self.btn_importer_notes_2em_tour]:
+            btn.setStyleSheet(
+                "background-color: #555; color: white; padding: 8px; border-radius: 5px; margin-left: 20px;")
+
+        # Ajouter les boutons au sous-menu
+        self.notes_2em_tour_submenu.addWidget(self.btn_liste_matieres_2em_tour)
+        self.notes_2em_tour_submenu.addWidget(self.btn_ajouter_matiere_2em_tour)
+        self.notes_2em_tour_submenu.addWidget(self.btn_ajouter_note_2em_tour)
+        self.notes_2em_tour_submenu.addWidget(self.btn_liste_notes_2em_tour)
+        self.notes_2em_tour_submenu.addWidget(self.btn_importer_notes_2em_tour)
+
+        # Convertir en widget et cacher par défaut
+        self.notes_2em_tour_submenu_widget = QWidget()
+        self.notes_2em_tour_submenu_widget.setLayout(self.notes_2em_tour_submenu)
+        self.notes_2em_tour_submenu_widget.setVisible(False)
+        layout.addWidget(self.notes_2em_tour_submenu_widget)
+
+        # 🔹 SÉPARATEUR VISUEL
+        layout.addWidget(self.create_separator())
+
+        # 🔹 RÉSULTATS DEUXIÈME TOUR
+        self.btn_resultats_deuxieme_tour = QPushButton("📊 Résultats Deuxième Tour",
+                                                       clicked=self.toggle_resultats_2eme_tour)
+        self.btn_resultats_deuxieme_tour.setStyleSheet(
+            "background-color: #444; color: white; padding: 10px; border-radius: 5px;"
+        )
+        layout.addWidget(self.btn_resultats_deuxieme_tour)
+
+        # Sous-menu des résultats du deuxième tour
+        self.resultats_2eme_tour_submenu = QVBoxLayout()
+        self.resultats_2eme_tour_submenu.setSpacing(5)
+        self.resultats_2eme_tour_submenu.setContentsMargins(20, 0, 0, 0)
+
+        self.btn_deliberation_2eme_tour = QPushButton("⚖️ Délibération", clicked=self.open_deliberation_2eme_tour)
+        self.btn_liste_admis_2eme_tour = QPushButton("✅ Liste des admis", clicked=self.open_liste_admis_2eme_tour)
+        self.btn_liste_ajournes_2eme_tour = QPushButton("❌ Liste des ajournés",
+                                                        clicked=self.open_liste_ajournes_2eme_tour)
+        self.btn_releve_notes_2eme_tour = QPushButton("📄 Relevé de notes", clicked=self.open_releve_notes_2eme_tour)
+
+        # Appliquer le même style à tous les boutons du sous-menu
+        for btn in [
+            self.btn_deliberation_2eme_tour,
+            self.btn_liste_admis_2eme_tour,
+            self.btn_liste_ajournes_2eme_tour,
+            self.btn_releve_notes_2eme_tour
+        ]:
+            btn.setStyleSheet(
+                "background-color: #555; color: white; padding: 8px; border-radius: 5px; margin-left: 20px;"
+            )
+
+        # Ajouter les boutons au sous-menu
+        self.resultats_2eme_tour_submenu.addWidget(self.btn_deliberation_2eme_tour)
+        self.resultats_2eme_tour_submenu.addWidget(self.btn_liste_admis_2eme_tour)
+        self.resultats_2eme_tour_submenu.addWidget(self.btn_liste_ajournes_2eme_tour)
+        self.resultats_2eme_tour_submenu.addWidget(self.btn_releve_notes_2eme_tour)
+
+        # Convertir en widget et cacher par défaut
+        self.resultats_2eme_tour_submenu_widget = QWidget()
+        self.resultats_2eme_tour_submenu_widget.setLayout(self.resultats_2eme_tour_submenu)
+        self.resultats_2eme_tour_submenu_widget.setVisible(False)
+        layout.addWidget(self.resultats_2eme_tour_submenu_widget)
+
+        # 🔹 SÉPARATEUR VISUEL
+        layout.addWidget(self.create_separator())
+
+        # 🔹 PARAMÈTRES
+        self.btn_parametres = QPushButton("⚙️ Paramètres", clicked=self.toggle_theme)
+        self.btn_parametres.setStyleSheet("background-color: #444; color: white; padding: 10px; border-radius: 5px;")
+        layout.addWidget(self.btn_parametres)
+
+        layout.addStretch()  # Pour équilibrer l'espace
+
+        sidebar.setLayout(layout)
+        return sidebar
+
+    # separateur des element du sidebare et page d'acceulle
+
+    def create_separator(self):
+        """Créer une ligne séparatrice pour organiser visuellement le sidebar"""
+        line = QFrame()
+        line.setFrameShape(QFrame.HLine)  # Créer une ligne horizontale
+        line.setStyleSheet("background-color: #000000; height: 1px; margin: 0px;")  # Style noir et hauteur fine
+        return line
+
+    def create_dashboard_page(self):
+        """Crée la page du tableau de bord ; les chiffres viennent des tables de synthèse (statistiques.py)"""
+        dashboard_widget = QWidget()
+        layout = QVBoxLayout()
+
+        # Titre du tableau de bord
+        title = QLabel("Tableau de Bord - Statistiques des Résultats", alignment=Qt.AlignCenter)
+        title.setStyleSheet("font-size: 24px; font-weight: bold; color: #4CAF50; margin-bottom: 20px;")
+        layout.addWidget(title)
+
+        # Affichage des statistiques dans un layout horizontal pour les comparer
+        stats_layout = QHBoxLayout()
+        self.stats_labels = {}
+        for tour, marge in [(1, "margin-right"), (2, "margin-left")]:
+            label = QLabel()
+            label.setStyleSheet(f"""
+                font-size: 18px;
+                background-color: #f9f9f9;
+                border-radius: 10px;
+                padding: 20px;
+                {marge}: 20px;
+                border: 1px solid #ccc;
+                color: #333;  /* Texte plus sombre pour une meilleure lisibilité */
+                font-weight: bold;  /* Met en gras pour améliorer la visibilité */
+            """)
+            self.stats_labels[tour] = label
+            stats_layout.addWidget(label)
+
+        # Ajouter les statistiques au layout principal
+        layout.addLayout(stats_layout)
+
+        # Choix du tour et du critère de répartition
+        choix_layout = QHBoxLayout()
+        self.choix_tour_stats = QComboBox()
+        self.choix_tour_stats.addItem("Premier tour", 1)
+        self.choix_tour_stats.addItem("Deuxième tour", 2)
+        self.choix_critere_stats = QComboBox()
+        for critere, libelle in statistiques.CRITERES.items():
+            self.choix_critere_stats.addItem(f"Par {libelle.lower()}", critere)
+        self.choix_matiere_stats = QComboBox()
+        for combo in (self.choix_tour_stats, self.choix_critere_stats, self.choix_matiere_stats):
+            combo.currentIndexChanged.connect(lambda _: self.actualiser_tableau_de_bord())
+            choix_layout.addWidget(combo)
+        layout.addLayout(choix_layout)
+
+        details_layout = QHBoxLayout()
+
+        # Taux de réussite par établissement, sexe ou type de candidat
+        self.table_repartition = QTableWidget(0, 6)
+        self.table_repartition.setHorizontalHeaderLabels(
+            ["Groupe", "Candidats", "Admis", "Taux", "Moyenne", "Repêchables"])
+        self.table_repartition.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_repartition.horizontalHeader().setStyleSheet("color: black; font-weight: bold;")
+        details_layout.addWidget(self.table_repartition, 3)
+
+        # Distribution des notes de la matière choisie (une barre par tranche d'un point)
+        self.histogramme_label = QLabel()
+        self.histogramme_label.setStyleSheet("font-family: monospace; font-size: 13px;")
+        details_layout.addWidget(self.histogramme_label, 2)
+        layout.addLayout(details_layout)
+
+        dashboard_widget.setLayout(layout)
+
+        # Rafraîchissement dès qu'une écriture est validée (délibération, saisie, import...) ;
+        # la vérification ne lit qu'un PRAGMA, le recalcul ne lit que les tables de synthèse
+        self.marqueur_stats = None
+        self.minuteur_stats = QTimer(self, interval=2000, timeout=self.verifier_statistiques)
+        self.minuteur_stats.start()
+        self.actualiser_tableau_de_bord()
+        return dashboard_widget
+
+    def afficher_tableau_de_bord(self):
+        self.actualiser_tableau_de_bord()
+        self.main_content.setCurrentWidget(self.dashboard_page)
+
+    def verifier_statistiques(self):
+        """Rafraîchit le tableau de bord affiché si la base a changé depuis le dernier affichage"""
+        if self.main_content.currentWidget() is self.dashboard_page and statistiques.marqueur() != self.marqueur_stats:
+            self.actualiser_tableau_de_bord()
+
+    def actualiser_tableau_de_bord(self):
+        """Relit les statistiques (tables de synthèse uniquement) et met à jour le tableau de bord"""
+        try:
+            self.marqueur_stats = statistiques.marqueur()
+            for tour, label in self.stats_labels.items():
+                label.setText(self.format_stats(statistiques.bilan(tour), "Premier Tour" if tour == 1 else "Deuxième Tour"))
+
+            tour = self.choix_tour_stats.currentData()
+            lignes = statistiques.repartition(tour, self.choix_critere_stats.currentData())
+            self.table_repartition.setRowCount(len(lignes))
+            for row, (groupe, effectif, admis, taux, moyenne, repechables) in enumerate(lignes):
+                for col, valeur in enumerate([groupe, effectif, admis, f"{100 * taux:.1f} %", f"{moyenne:.2f}",
+                                              repechables]):
+                    self.table_repartition.setItem(row, col, QTableWidgetItem(str(valeur)))
+
+            # Matières du tour choisi (la sélection est gardée si la matière existe encore)
+            matieres = statistiques.moyennes_matieres(tour)
+            choisie = self.choix_matiere_stats.currentData()
+            self.choix_matiere_stats.blockSignals(True)
+            self.choix_matiere_stats.clear()
+            for matiere_id, nom, nombre, moyenne in matieres:
+                moyenne = f"{moyenne:.2f}" if moyenne is not None else "-"
+                self.choix_matiere_stats.addItem(f"{nom} (moyenne {moyenne}, {nombre} notes)", matiere_id)
+            position = self.choix_matiere_stats.findData(choisie)
+            self.choix_matiere_stats.setCurrentIndex(max(position, 0))
+            self.choix_matiere_stats.blockSignals(False)
+
+            matiere_id = self.choix_matiere_stats.currentData()
+            self.histogramme_label.setText(
+                self.format_histogramme(statistiques.histogramme(matiere_id, tour)) if matiere_id else "")
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des statistiques : {e}")
+
+    def format_stats(self, stats, tour_name):
+        """Formate les statistiques pour l'affichage"""
+        decisions = stats["decisions"]
+        moyenne = f"{stats['moyenne']:.2f}" if stats["moyenne"] is not None else "-"
+        taux = f"{100 * stats['taux_admission']:.1f} %" if stats["taux_admission"] is not None else "-"
+        return f"""
+        <b>{tour_name}</b><br>
+        <u>Total Candidats:</u> {stats['effectif']} (délibérés : {stats['deliberes']})<br>
+        <u>Admis d'office:</u> {decisions.get("Admis d'office", 0)}<br>
+        <u>Admissibles:</u> {decisions.get('Admissible', 0)}<br>
+        <u>Ajournés:</u> {decisions.get('Ajourné', 0)}<br>
+        <u>Repêchables:</u> {stats['repechables']}<br>
+        <u>Moyenne:</u> {moyenne} &nbsp; <u>Taux d'admission:</u> {taux}<br>
+        """
+
+    def format_histogramme(self, effectifs):
+        """Histogramme texte : une ligne par tranche d'un point, barre proportionnelle à l'effectif"""
+        plus_grand = max(effectifs) or 1
+        return "<br>".join(
+            f"{tranche:>2}-{tranche + 1:<2} {'█' * round(30 * effectif / plus_grand)} {effectif}"
+            for tranche, effectif in enumerate(effectifs)).replace(" ", "&nbsp;")
+
+    def toggle_theme(self):
+        """Alterner entre le mode clair et le mode sombre"""
+        if self.theme_sombre:
+            # Passer en mode clair
+            self.setStyleSheet("background-color: #F5F5F5; color: black;")
+            self.sidebar.setStyleSheet("background-color: #E0E0E0;")
+            self.header.setStyleSheet("background-color: #D0D0D0; border-bottom: 2px solid #B0B0B0;")
+            self.btn_parametres.setStyleSheet(
+                "background-color: #DDD; color: black; padding: 10px; border-radius: 5px;")
+        else:
+            # Passer en mode sombre
+            self.setStyleSheet("background-color: #1E1E1E; color: white;")
+            self.sidebar.setStyleSheet("background-color: #2C2C2C;")
+            self.header.setStyleSheet("background-color: #1E1E1E; border-bottom: 2px solid #3A3A3A;")
+            self.btn_parametres.setStyleSheet(
+                "background-color: #444; color: white; padding: 10px; border-radius: 5px;")
+
+        self.theme_sombre = not self.theme_sombre  # Inverser l'état du thème
+
+    # resultat 2em tour
+    def toggle_resultats_2eme_tour(self):
+        visible = self.resultats_2eme_tour_submenu_widget.isVisible()
+        self.resultats_2eme_tour_submenu_widget.setVisible(not visible)
+
+    def open_deliberation_2eme_tour(self):
+        """Lance la délibération du deuxième tour en arrière-plan puis affiche son bilan"""
+        self.deliberer_en_tache(2, "Deuxième Tour")
+
+    def open_liste_admis_2eme_tour(self):
+        """Affiche la liste des admis du deuxième tour (180 points et plus)"""
+        try:
+            self.afficher_page(("admis", 2), lambda: self.creer_page_resultats(
+                2, "admis", "Liste des admis du deuxième tour",
+                "⚠ Aucun candidat n'a obtenu 180 points ou plus au deuxième tour.",
+                "📑 Générer PDF des admis", avec_date=False))
+        except sqlite3.Error as e:
+            self.show_error_message(f"❌ Erreur SQLite lors de la récupération des admis du 2ᵉ tour : {e}")
+
+    def open_liste_ajournes_2eme_tour(self):
+        """Affiche la liste des ajournés du deuxième tour (moins de 153 points)"""
+        try:
+            self.afficher_page(("ajournes", 2), lambda: self.creer_page_resultats(
+                2, "ajournes", "Liste des ajournés du deuxième tour",
+                "⚠ Aucun candidat n'est ajourné avec moins de 153 points au deuxième tour.",
+                "📑 Générer PDF des ajournés"))
+        except sqlite3.Error as e:
+            self.show_error_message(f"❌ Erreur SQLite lors de la récupération des ajournés du 2ᵉ tour : {e}")
+
+    def open_releve_notes_2eme_tour(self):
+        """Affiche la page des relevés de notes et du procès-verbal du deuxième tour"""
+        self.afficher_page(("releves", 2), lambda: self.creer_page_releves(2))
+
+    # gestion de 2em tour
+    def toggle_notes_2em_tour_submenu(self):
+        """Affiche ou cache le sous-menu du 2e tour"""
+        self.notes_2em_tour_submenu_widget.setVisible(not self.notes_2em_tour_submenu_widget.isVisible())
+
+    def open_add_matiere_2em_tour_form(self):
+        """Affiche un formulaire pour ajouter une matière du deuxième tour"""
+        from PyQt5.QtWidgets import QFormLayout, QLineEdit, QSpinBox, QComboBox, QPushButton, QWidget
+
+        self.add_matiere_2em_form = QWidget()
+        form_layout = QFormLayout()
+
+        # Champs du formulaire
+        self.nom_matiere_2em_input = QLineEdit()
+        self.coefficient_2em_input = QSpinBox()
+        self.coefficient_2em_input.setRange(1, 10)  # Coefficient entre 1 et 10
+
+        self.facultative_2em_input = QComboBox()
+        self.facultative_2em_input.addItems(["Obligatoire", "Facultative"])
+
+        # Ajout des champs au formulaire
+        form_layout.addRow("Nom de la matière (2ᵉ Tour)", self.nom_matiere_2em_input)
+        form_layout.addRow("Coefficient", self.coefficient_2em_input)
+        form_layout.addRow("Facultative", self.facultative_2em_input)
+
+        # Bouton de sauvegarde
+        self.save_matiere_2em_button = QPushButton("Ajouter au Deuxième Tour")
+        self.save_matiere_2em_button.clicked.connect(self.save_matiere_2em_tour)
+
+        form_layout.addWidget(self.save_matiere_2em_button)
+
+        self.add_matiere_2em_form.setLayout(form_layout)
+        self.main_content.addWidget(self.add_matiere_2em_form)
+        self.main_content.setCurrentWidget(self.add_matiere_2em_form)
+
+    def save_matiere_2em_tour(self):
+        """Ajoute une matière du deuxième tour et initialise les notes des candidats dans la table note et le relevé de notes"""
+        # Vérifier que le champ nom n'est pas vide
+        if not self.nom_matiere_2em_input.text().strip():
+            QMessageBox.warning(self, "Champ vide", "Le nom de la matière est obligatoire.")
+            return
+
+        try:
+            # Matière du deuxième tour, notes des candidats initialisées en bloc
+            depot.ajouter_matiere(self.nom_matiere_2em_input.text(), self.coefficient_2em_input.value(), 2,
+                                  self.facultative_2em_input.currentText() == "Facultative")
+        except ValueError:
+            QMessageBox.warning(self, "Doublon", "Cette matière existe déjà pour le 2e tour.")
+            return
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'ajout de la matière : {e}")
+            return
+
+        QMessageBox.information(self, "Succès", "Matière ajoutée et relevé de notes initialisé avec succès.")
+
+        # Nettoyer les champs
+        self.nom_matiere_2em_input.clear()
+        self.coefficient_2em_input.setValue(1)
+        self.facultative_2em_input.setCurrentIndex(0)
+
+    def open_liste_matieres_2em_tour(self):
+        """Affiche la liste des matières du deuxième tour avec des boutons pour modifier et supprimer"""
+        self.liste_matieres_2em_tour_page = QWidget()
+        layout = QVBoxLayout()
+
+        # Création d'une table pour afficher les matières du deuxième tour
+        self.table_matieres_2em_tour = QTableWidget()
+        self.table_matieres_2em_tour.setColumnCount(4)
+        self.table_matieres_2em_tour.setHorizontalHeaderLabels(["Nom de la matière", "Coefficient", "Tour", "Actions"])
+
+        # Appliquer la couleur noire à l'en-tête horizontal
+        header = self.table_matieres_2em_tour.horizontalHeader()
+        header.setStyleSheet("color: black;")
+
+        # Remplir la table avec les matières du deuxième tour
+        matieres = depot.lister_matieres(tour=2)
+
+        self.table_matieres_2em_tour.setRowCount(len(matieres))
+
+        for row, (id, nom, coefficient, tour) in enumerate(matieres):
+            self.table_matieres_2em_tour.setItem(row, 0, QTableWidgetItem(nom))
+            self.table_matieres_2em_tour.setItem(row, 1, QTableWidgetItem(str(coefficient)))
+            self.table_matieres_2em_tour.setItem(row, 2, QTableWidgetItem("Deuxième tour"))
+
+            # Ajouter des boutons pour modifier et supprimer
+            btn_modifier = QPushButton("🖊️")
+            btn_modifier.clicked.connect(lambda checked, id=id: self.modify_matiere(id))
+            btn_supprimer = QPushButton("🗑️")
+            btn_supprimer.clicked.connect(lambda checked, id=id: self.delete_matiere(id))
+
+            btn_layout = QHBoxLayout()
+            btn_layout.addWidget(btn_modifier)
+            btn_layout.addWidget(btn_supprimer)
+
+            widget = QWidget()
+            widget.setLayout(btn_layout)
+
+            self.table_matieres_2em_tour.setCellWidget(row, 3, widget)
+
+        layout.addWidget(self.table_matieres_2em_tour)
+        self.liste_matieres_2em_tour_page.setLayout(layout)
+        self.main_content.addWidget(self.liste_matieres_2em_tour_page)
+        self.main_content.setCurrentWidget(self.liste_matieres_2em_tour_page)
+
+    def modify_matiere(self, id):
+        """Modifier une matière en utilisant son ID"""
+        try:
+            matiere = depot.infos_matiere(id)
+
+            if matiere:
+                nom, coefficient, facultative, tour = matiere
+
+                # Créer un formulaire pour modifier la matière
+                self.modify_matiere_form = QWidget()
+                form_layout = QFormLayout()
+
+                self.nom_matiere_input = QLineEdit(nom)
+                self.coefficient_input = QSpinBox()
+                self.coefficient_input.setValue(coefficient)
+
+                self.facultative_input = QComboBox()
+                self.facultative_input.addItems(["Obligatoire", "Facultative"])
+                self.facultative_input.setCurrentIndex(0 if facultative == 0 else 1)
+
+                # Ajouter les champs au formulaire
+                form_layout.addRow(f"Nom de la matière ({'1er Tour' if tour == 1 else '2ème Tour'})",
+                                   self.nom_matiere_input)
+                form_layout.addRow("Coefficient", self.coefficient_input)
+                form_layout.addRow("Facultative", self.facultative_input)
+
+                save_button = QPushButton("Sauvegarder")
+                save_button.clicked.connect(lambda: self.save_modified_matiere(id))
+
+                form_layout.addWidget(save_button)
+
+                self.modify_matiere_form.setLayout(form_layout)
+                self.main_content.addWidget(self.modify_matiere_form)
+                self.main_content.setCurrentWidget(self.modify_matiere_form)
+        except Exception as e:
+            print(f"Erreur lors de la modification de la matière : {e}")
+
+    def save_modified_matiere(self, id):
+        """Sauvegarder les modifications d'une matière"""
+        nom = self.nom_matiere_input.text()
+        coefficient = self.coefficient_input.value()
+        facultative = 1 if self.facultative_input.currentText() == "Facultative" else 0
+
+        try:
+            depot.modifier_matiere(id, nom, coefficient, facultative)
+            QMessageBox.information(self, "Succès", "Matière modifiée avec succès.")
+            self.open_liste_matieres_2em_tour()  # Recharger la liste des matières
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de la modification : {e}")
+
+    def delete_matiere(self, id):
+        """Supprimer une matière avec une boîte de dialogue de confirmation"""
+        reply = QMessageBox.question(self, 'Confirmer la suppression',
+                                     'Êtes-vous sûr de vouloir supprimer cette matière ?',
+                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+
+        if reply == QMessageBox.Yes:
+            try:
+                depot.supprimer_matiere(id)
+                self.open_liste_matieres_2em_tour()  # Recharger la liste des matières
+            except Exception as e:
+                print(f"Erreur lors de la suppression de la matière : {e}")
+
+    def open_add_note_2em_tour_form(self):
+        """Ouvre le formulaire pour ajouter une note pour un candidat (2e tour)."""
+        try:
+            self.form_window = QWidget()
+            self.form_window.setWindowTitle("Ajouter une Note - 2e Tour")
+            layout = QVBoxLayout()
+
+            # Sélection du candidat par anonymat
+            self.anonymat_combo = QComboBox()
+            self.load_candidats()  # Charge les candidats dans le comboBox
+            layout.addWidget(QLabel("Sélectionner un candidat (Anonymat)"))
+            layout.addWidget(self.anonymat_combo)
+
+            # Récupération des matières du deuxième tour
+            self.notes_inputs = {}
+            matieres = depot.matieres_du_tour(2)  # 🔹 Sélection uniquement des matières du 2e tour
+
+            # Ajouter un champ pour chaque matière avec un QDoubleSpinBox pour les notes
+            for matiere_id, matiere_nom in matieres:
+                note_label = QLabel(f"{matiere_nom}:")  # Afficher le nom de la matière
+                note_input = QDoubleSpinBox()
+                note_input.setRange(0, 20)  # Plage des notes de 0 à 20
+                note_input.setDecimals(2)  # Permet des décimales
+                note_input.setSingleStep(0.1)  # Incrément de 0.1
+
+                layout.addWidget(note_label)
+                layout.addWidget(note_input)  # Ajoute le champ de saisie
+                self.notes_inputs[matiere_id] = note_input  # Associe l'input à la matière via son ID
+
+            # Bouton de soumission
+            btn_enregistrer = QPushButton("✅ Enregistrer", clicked=self.enregistrer_note_2e_tour)
+            layout.addWidget(btn_enregistrer)
+
+            self.form_window.setLayout(layout)
+
+            # Afficher le formulaire dans le main_content
+            self.main_content.addWidget(self.form_window)
+            self.main_content.setCurrentWidget(self.form_window)
+
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur de base de données lors du chargement des matières : {e}")
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Une erreur est survenue : {e}")
+
+    def enregistrer_note_2e_tour(self):
+        """Enregistre les notes du candidat sélectionné (2e tour) et met à jour le relevé de notes."""
+        anonymat = self.anonymat_combo.currentText()
+
+        try:
+            # Récupérer l'ID du candidat via son anonymat
+            candidat_id = depot.candidat_par_anonymat(anonymat)
+            if candidat_id is None:
+                QMessageBox.critical(self, "Erreur", "Candidat introuvable !")
+                return
+
+            notes = {}
+            for matiere_id, note_input in self.notes_inputs.items():
+                note = note_input.value()  # ✅ Utiliser value() pour récupérer un float
+
+                # Vérifier si la note est bien entre 0 et 20
+                if note < 0 or note > 20:
+                    QMessageBox.warning(self, "Valeur incorrecte",
+                                        f"La note {note} pour la matière {matiere_id} est invalide.")
+                    continue
+                notes[matiere_id] = note
+
+            # Toutes les notes du candidat sont écrites dans une seule transaction
+            depot.enregistrer_notes(candidat_id, notes, tour=2)
+            QMessageBox.information(self, "Succès", "Notes du 2e tour enregistrées et relevé de notes mis à jour avec succès !")
+            self.form_window.close()
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'enregistrement : {e}")
+
+    def open_liste_notes_2em_tour(self):
+        """Affiche la liste des notes du 2e tour"""
+        self.afficher_grille_notes(2, self.modifier_note2)
+
+    def modifier_note2(self, candidat_id):
+        """Ouvre un formulaire pour modifier les notes des matières du 2e tour d'un candidat."""
+        try:
+            self.form_modif_note = QWidget()
+            self.form_modif_note.setWindowTitle("Modifier les Notes - 2e Tour")
+            layout = QVBoxLayout()
+
+            # Récupérer uniquement les matières du 2e tour et les notes actuelles du candidat
+            matieres_notes = depot.notes_du_candidat(candidat_id, 2)
+
+            self.notes_inputs = {}
+
+            # Ajouter un champ pour chaque matière du 2e tour
+            for matiere_id, matiere_nom, note in matieres_notes:
+                note_label = QLabel(f"{matiere_nom}:")
+                note_input = QDoubleSpinBox()
+                note_input.setRange(0, 20)
+                note_input.setDecimals(2)
+                note_input.setSingleStep(0.1)
+                note_input.setValue(note if note is not None else 0)
+
+                layout.addWidget(note_label)
+                layout.addWidget(note_input)
+                self.notes_inputs[matiere_id] = note_input
+
+            # Bouton de sauvegarde
+            btn_sauvegarder = QPushButton("✅ Sauvegarder")
+            btn_sauvegarder.clicked.connect(lambda: self.sauvegarder_modifications_note(candidat_id, tour=2))
+
+            layout.addWidget(btn_sauvegarder)
+            self.form_modif_note.setLayout(layout)
+
+            # Afficher la fenêtre de modification
+            self.main_content.addWidget(self.form_modif_note)
+            self.main_content.setCurrentWidget(self.form_modif_note)
+
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'ouverture du formulaire : {e}")
+
+    # resulta 1er tour
+
+    def toggle_resultats_submenu(self):
+        """Afficher ou masquer le sous-menu des résultats du premier tour"""
+        is_visible = self.resultats_submenu_widget.isVisible()
+        self.resultats_submenu_widget.setVisible(not is_visible)
+
+    def open_deliberation(self):
+        """Lance la délibération du premier tour en arrière-plan puis affiche son bilan"""
+        self.deliberer_en_tache(1, "Premier Tour")
+
+    def deliberer_en_tache(self, tour, libelle):
+        def afficher(nombre):
+            self.deliberation_page = QLabel(f"⚖️ Délibération du {libelle} terminée ({nombre} candidat(s) recalculé(s))",
+                                            alignment=Qt.AlignCenter)
+            self.deliberation_page.setStyleSheet("font-size: 24px; font-weight: bold; color: #FFA500;")
+            self.main_content.addWidget(self.deliberation_page)
+            self.main_content.setCurrentWidget(self.deliberation_page)
+
+        # Seuls les candidats dont les notes ont changé sont recalculés (connexion propre à la tâche)
+        self.lancer_tache(f"⚖️ Délibération du {libelle.lower()}",
+                          lambda tache: deliberation.deliberer(get_connexion(), tour=tour, incremental=True,
+                                                               progression=tache.avancer),
+                          afficher)
+
+    # ======================= PAGES DE LISTE ======================== #
+
+    def afficher_page(self, cle, fabrique, signature=None):
+        """Affiche une page de liste créée une seule fois puis réutilisée (ses données sont relues).
+
+        Si `signature` change (par exemple les matières d'une grille), la page est reconstruite.
+        """
+        page = self.pages.get(cle)
+        if page is not None and page.signature != signature:
+            self.main_content.removeWidget(page)
+            page.deleteLater()
+            page = None
+
+        if page is None:
+            page = fabrique()
+            page.signature = signature
+            self.pages[cle] = page
+            self.main_content.addWidget(page)
+        elif page.modele is not None:
+            page.modele.recharger()
+
+        self.main_content.setCurrentWidget(page)
+        return page
+
+    def creer_page_liste(self, titre, modele, actions=(), boutons=(), message_vide=None):
+        """Crée une page : titre, recherche, table paginée (modèle SQL) et boutons"""
+        page = QWidget()
+        page.modele = modele
+        layout = QVBoxLayout(page)
+
+        titre_label = QLabel(titre, alignment=Qt.AlignCenter)
+        titre_label.setStyleSheet("font-size: 24px; font-weight: bold; color: #FFA500;")
+        layout.addWidget(titre_label)
+
+        # Recherche traduite en filtre SQL
+        recherche = QLineEdit()
+        recherche.setPlaceholderText("🔍 Rechercher...")
+        recherche.textChanged.connect(modele.filtrer)
+        layout.addWidget(recherche)
+
+        # Message affiché quand la liste est vide
+        vide = QLabel(message_vide or "", alignment=Qt.AlignCenter)
+        vide.setStyleSheet("font-size: 18px; color: #FF0000;")
+        vide.setVisible(False)
+        if message_vide:
+            def maj_vide(*_):
+                vide.setVisible(modele.rowCount() == 0 and not modele.filtre)
+
+            modele.modelReset.connect(maj_vide)
+            modele.rowsInserted.connect(maj_vide)
+
+        vue = QTableView()
+        vue.setModel(modele)
+        vue.setStyleSheet("""
+            QTableView {
+                font-size: 16px;
+                border: 1px solid #ccc;
+            }
+            QTableView::item {
+                border: 1px solid #ccc;
+                padding: 10px;
+            }
+            QTableView::item:selected {
+                background-color: #4CAF50;
+                color: white;
+            }
+        """)
+        vue.horizontalHeader().setStyleSheet("color: black; font-weight: bold;")
+        vue.horizontalHeader().setStretchLastSection(True)
+        vue.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        vue.setSelectionBehavior(QAbstractItemView.SelectRows)
+        vue.setMinimumSize(800, 400)
+
+        # Tri par clic sur l'en-tête, exécuté en SQL par le modèle (charge aussi la première page)
+        colonne, ordre = modele.tri
+        vue.horizontalHeader().setSortIndicator(modele.colonnes.index(colonne), ordre)
+        vue.setSortingEnabled(True)
+
+        # Boutons d'action dessinés dans la dernière colonne
+        if actions:
+            vue.setItemDelegateForColumn(modele.columnCount() - 1, DelegueActions(actions, vue))
+        layout.addWidget(vue)
+
+        layout.addWidget(vide)
+
+        if boutons:
+            button_layout = QHBoxLayout()
+            for libelle, couleur, fonction in boutons:
+                bouton = QPushButton(libelle, clicked=fonction)
+                bouton.setStyleSheet(f"background-color: {couleur}; color: white; padding: 10px; border-radius: 5px;")
+                bouton.setFixedWidth(250)
+                button_layout.addWidget(bouton, alignment=Qt.AlignCenter)
+            layout.addLayout(button_layout)
+
+        page.vue = vue
+        return page
+
+    def creer_page_resultats(self, tour, categorie, titre, message_vide, libelle_pdf, avec_date=True, avec_releve=False):
+        """Crée la page d'une liste de résultats (admis, admissibles, ajournés) d'un tour"""
+        colonnes = ["numero_table", "nom", "prenom"] + (["date_naissance"] if avec_date else []) + ["total_points"]
+        entetes = (["Numéro Table", "Nom", "Prénom"] + (["Date de Naissance"] if avec_date else [])
+                   + ["Total Points"] + (["Relevé"] if avec_releve else []))
+        _, ordre = depot.CATEGORIES_RESULTATS[categorie]
+        tri = ("total_points", Qt.DescendingOrder if ordre.endswith("DESC") else Qt.AscendingOrder)
+
+        modele = ModeleSQL(depot.requete_resultats(tour, categorie), colonnes, entetes,
+                           colonnes_filtre=["numero_table", "nom", "prenom"], tri=tri)
+        return self.creer_page_liste(
+            titre, modele,
+            actions=[("📄", self.voir_releve_notes)] if avec_releve else (),
+            boutons=[(libelle_pdf, "#4CAF50", lambda: self.generer_pdf_liste(tour, categorie)),
+                     ("🖨️ Imprimer la liste", "#2196F3", lambda: self.print_table(modele))],
+            message_vide=message_vide)
+
+    def print_table(self, modele):
+        """Imprime toutes les lignes d'une liste (tri et filtre courants)"""
+        # Requête figée au moment du clic ; le HTML est construit en arrière-plan depuis la base
+        sql, params = modele.requete_page(-1, 0)
+        entetes = modele.entetes[:len(modele.colonnes)]
+
+        def construire(tache):
+            lignes = (ligne[1:] for ligne in get_connexion().execute(sql, params))
+            return rapports.tableau_html(entetes, lignes, progression=tache.avancer)
+
+        self.lancer_tache("🖨️ Préparation de l'impression", construire, self.imprimer_html)
+
+    def imprimer_html(self, contenu):
+        try:
+            # Créer un document texte pour l'impression
+            document = QTextDocument()
+            document.setHtml(contenu)
+
+            # Configurer l'impression
+            printer = QPrinter()
+            print_dialog = QPrintDialog(printer)
+            if print_dialog.exec() == QPrintDialog.Accepted:
+                document.print_(printer)  # Imprimer le document
+                self.show_info_message("✅ Impression terminée avec succès.")
+        except Exception as e:
+            self.show_error_message(f"❌ Erreur lors de l'impression : {e}")
+
+    # ======================= RAPPORTS PDF ======================== #
+
+    def generer_pdf_liste(self, tour, categorie):
+        """Génère le PDF d'une liste de résultats (lignes lues en flux depuis la base)"""
+        titre, _, _ = rapports.LISTES[(tour, categorie)]
+        self.lancer_tache(f"📑 {titre}",
+                          lambda tache: rapports.generer_liste(tour, categorie, progression=tache.avancer),
+                          lambda chemin: self.show_info_message(f"✅ PDF généré avec succès : {chemin}"))
+
+    def enregistrer_releve_pdf(self, candidat_id, prenom, nom, tour=1):
+        """Enregistre le relevé de notes d'un candidat en PDF"""
+        filename, _ = QFileDialog.getSaveFileName(None, "Enregistrer le PDF", f"Releve_{prenom}_{nom}.pdf",
+                                                  "PDF Files (*.pdf)")
+        if filename:
+            self.lancer_tache(f"📄 Relevé de {prenom} {nom}",
+                              lambda tache: rapports.generer_releve(candidat_id, filename, tour),
+                              lambda _: self.show_info_message(f"📄 PDF enregistré : {filename}"))
+
+    def creer_page_releves(self, tour):
+        """Crée la page des documents d'un tour : relevés de notes en lot et procès-verbal"""
+        page = QWidget()
+        page.modele = None
+        layout = QVBoxLayout(page)
+
+        libelle_tour = "premier tour" if tour == 1 else "deuxième tour"
+        titre = QLabel(f"📄 Relevés de notes du {libelle_tour}", alignment=Qt.AlignCenter)
+        titre.setStyleSheet("font-size: 24px; font-weight: bold; color: #1E90FF;")
+        layout.addWidget(titre)
+
+        for libelle, couleur, fonction in [
+            ("📚 Tous les relevés (un seul PDF)", "#4CAF50", lambda: self.generer_releves_pdf(tour, False)),
+            ("🗂️ Un PDF par candidat", "#2196F3", lambda: self.generer_releves_pdf(tour, True)),
+            ("📜 PV de délibération", "#FF9800", lambda: self.generer_pv_pdf(tour)),
+        ]:
+            bouton = QPushButton(libelle, clicked=fonction)
+            bouton.setStyleSheet(f"background-color: {couleur}; color: white; padding: 10px; border-radius: 5px;")
+            bouton.setFixedWidth(300)
+            layout.addWidget(bouton, alignment=Qt.AlignCenter)
+
+        layout.addStretch()
+        return page
+
+    def generer_releves_pdf(self, tour, un_fichier_par_candidat):
+        """Génère les relevés de tous les candidats en arrière-plan"""
+        if un_fichier_par_candidat:
+            destination = QFileDialog.getExistingDirectory(self, "Dossier des relevés")
+        else:
+            destination, _ = QFileDialog.getSaveFileName(self, "Enregistrer les relevés", f"releves_tour_{tour}.pdf",
+                                                         "PDF Files (*.pdf)")
+        if not destination:
+            return
+
+        self.lancer_tache(f"📚 Relevés de notes du tour {tour}",
+                          lambda tache: rapports.generer_releves(destination, tour, un_fichier_par_candidat,
+                                                                 progression=tache.avancer),
+                          lambda nombre: self.show_info_message(f"✅ {nombre} relevé(s) généré(s) : {destination}"))
+
+    def generer_pv_pdf(self, tour):
+        """Génère le procès-verbal de délibération d'un tour"""
+        chemin, _ = QFileDialog.getSaveFileName(self, "Enregistrer le PV", f"pv_deliberation_tour_{tour}.pdf",
+                                                "PDF Files (*.pdf)")
+        if chemin:
+            self.lancer_tache(f"📜 PV de délibération du tour {tour}",
+                              lambda tache: rapports.generer_pv(tour, chemin, self.jury_info, tache.avancer),
+                              lambda _: self.show_info_message(f"✅ PV généré avec succès : {chemin}"))
+
+    # ======================= TÂCHES DE FOND ======================== #
+
+    def creer_panneau_taches(self):
+        """Panneau ancré (en bas) listant les tâches de fond"""
+        self.panneau_taches = QDockWidget("⏳ Tâches", self)
+        self.panneau_taches.setWidget(PanneauTaches(self.taches, self.panneau_taches))
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.panneau_taches)
+        self.panneau_taches.hide()
+
+    def toggle_panneau_taches(self):
+        self.panneau_taches.setVisible(not self.panneau_taches.isVisible())
+
+    def lancer_tache(self, titre, fonction, terminee=None):
+        """Soumet `fonction(tache)` au pool sans bloquer l'interface ; les erreurs sont affichées ici"""
+        self.panneau_taches.show()
+        return self.taches.soumettre(
+            titre, fonction, terminee,
+            lambda message: self.show_error_message(f"❌ {titre} : {message}"))
+
+    def closeEvent(self, event):
+        # Les tâches en cours sont annulées (requête SQLite interrompue, transaction annulée) ;
+        # on attend leur fin, mais pas au-delà de DELAI_FERMETURE
+        self.taches.annuler_tout()
+        if not self.taches.attendre(DELAI_FERMETURE):
+            print("Fermeture : des tâches de fond ne se sont pas arrêtées à temps")
+        super().closeEvent(event)
+
+    def show_error_message(self, message):
+        """Affiche un message d'erreur"""
+        error_label = QLabel(message, alignment=Qt.AlignCenter)
+        error_label.setStyleSheet("font-size: 18px; font-weight: bold; color: red;")
+        self.main_content.addWidget(error_label)
+        self.main_content.setCurrentWidget(error_label)
+
+    def open_liste_admis(self):
+        """Affiche la liste des admis (180 points et plus)"""
+        try:
+            self.afficher_page(("admis", 1), lambda: self.creer_page_resultats(
+                1, "admis", "Liste des admis",
+                "⚠ Aucun candidat n'a obtenu 180 points ou plus.",
+                "📑 Générer PDF des admis", avec_date=False, avec_releve=True))
+        except sqlite3.Error as e:
+            self.show_error_message(f"❌ Erreur SQLite lors de la récupération des admis : {e}")
+
+    def voir_releve_notes(self, candidat_id):
+        """Affiche le relevé de notes d'un candidat dans une boîte de dialogue avec options PDF et impression."""
+
+        try:
+            # Infos du candidat et notes des deux tours (mêmes lignes que le relevé PDF)
+            lignes = depot.iterer_releves(candidat_id, candidat_id).fetchall()
+            if not lignes:
+                self.show_error_message("⚠ Candidat introuvable.")
+                return
+
+            numero_table, nom, prenom, total_points, moyenne = lignes[0][1:6]
+            notes = [ligne[6:] for ligne in lignes if ligne[6] is not None]
+
+        except sqlite3.Error as e:
+            self.show_error_message(f"❌ Erreur SQLite : {e}")
+            return
+
+
+        # Création d'une boîte de dialogue
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"📜 Relevé de Notes - {prenom} {nom}")
+        dialog.setFixedSize(600, 500)
+
+        layout = QVBoxLayout()
+
+        # Ajouter un titre avec texte blanc
+        title = QLabel(f"📜 Relevé de Notes de {prenom} {nom} (Table : {numero_table})")
+        title.setStyleSheet("font-size: 18px; font-weight: bold; color: white; text-align: center;")
+        layout.addWidget(title)
+
+        # Tableau des notes
+        table = QTableWidget()
+        table.setRowCount(len(notes))
+        table.setColumnCount(3)  # Une colonne de moins pour la note
+        table.setHorizontalHeaderLabels(["Matière", "Note", "Coeff"])
+
+        for row, (matiere, note1, note2, coefficient) in enumerate(notes):
+            # Fusionner les notes en une seule colonne (note du 1er ou du 2e tour, selon la disponibilité)
+            note_affichee = note1 if note1 is not None else note2
+            table.setItem(row, 0, QTableWidgetItem(matiere))
+            table.setItem(row, 1, QTableWidgetItem(str(note_affichee) if note_affichee else "-"))
+            table.setItem(row, 2, QTableWidgetItem(str(coefficient)))
+
+        table.setStyleSheet(
+            "font-size: 14px; border: 1px solid #ccc; background-color: #f9f9f9; color: black;")  # Texte en noir
+        layout.addWidget(table)
+
+        # Total Points & Moyenne
+        total_label = QLabel(f"🎯 Total Points : {total_points}   📊 Moyenne : {moyenne}")
+        total_label.setStyleSheet("font-size: 16px; font-weight: bold; color: white;")  # Texte en noir
+        layout.addWidget(total_label)
+
+        # Boutons (Générer PDF, Imprimer, Fermer)
+        btn_layout = QHBoxLayout()
+
+        btn_pdf = QPushButton("📄 Générer PDF")
+        btn_pdf.setStyleSheet("background-color: #2196F3; color: white; padding: 10px; border-radius: 5px;")
+        btn_pdf.clicked.connect(lambda: self.enregistrer_releve_pdf(candidat_id, prenom, nom))
+
+        btn_print = QPushButton("🖨️ Imprimer")
+        btn_print.setStyleSheet("background-color: #4CAF50; color: white; padding: 10px; border-radius: 5px;")
+        btn_print.clicked.connect(lambda: self.imprimer_releve(dialog))
+
+        btn_close = QPushButton("❌ Fermer")
+        btn_close.setStyleSheet("background-color: #FF5722; color: white; padding: 10px; border-radius: 5px;")
+        btn_close.clicked.connect(dialog.close)
+
+        btn_layout.addWidget(btn_pdf)
+        btn_layout.addWidget(btn_print)
+        btn_layout.addWidget(btn_close)
+
+        layout.addLayout(btn_layout)
+        dialog.setLayout(layout)
+        dialog.exec_()
+
+    def imprimer_releve(self, dialog):
+        """Imprime le relevé de notes affiché."""
+        printer = QPrinter()
+        print_dialog = QPrintDialog(printer, dialog)
+
+        if print_dialog.exec_() == QPrintDialog.Accepted:
+            dialog.render(printer)
+
+    def show_info_message(self, message):
+        """Affiche un message d'information"""
+        info_dialog = QDialog(self)
+        info_dialog.setWindowTitle("Information")
+        info_dialog.setFixedSize(300, 150)
+
+        label = QLabel(message, info_dialog)
+        label.setAlignment(Qt.AlignCenter)
+        label.setStyleSheet("font-size: 16px; color: green;")
+
+        layout = QVBoxLayout(info_dialog)
+        layout.addWidget(label)
+
+        button = QPushButton("OK", info_dialog)
+        button.setStyleSheet("background-color: #4CAF50; color: white; padding: 8px; border-radius: 5px;")
+        button.clicked.connect(info_dialog.accept)
+
+        layout.addWidget(button)
+
+        info_dialog.exec_()
+
+    def open_liste_admissibles(self):
+        """Affiche la liste des candidats admissibles au 2e tour (153 - 179,9 points)"""
+        try:
+            self.afficher_page(("admissibles", 1), lambda: self.creer_page_resultats(
+                1, "admissibles", "Liste des admissibles",
+                "⚠ Aucun candidat n'est admissible avec des points entre 153 et 179,9.",
+                "📑 Générer PDF des admissibles", avec_releve=True))
+        except sqlite3.Error as e:
+            self.show_error_message(f"❌ Erreur SQLite lors de la récupération des admissibles : {e}")
+
+    def open_liste_ajournes(self):
+        """Affiche la liste des ajournés (moins de 153 points)"""
+        try:
+            self.afficher_page(("ajournes", 1), lambda: self.creer_page_resultats(
+                1, "ajournes", "Liste des ajournés",
+                "⚠ Aucun candidat n'est ajourné avec moins de 153 points.",
+                "📑 Générer PDF des ajournés", avec_releve=True))
+        except sqlite3.Error as e:
+            self.show_error_message(f"❌ Erreur SQLite lors de la récupération des ajournés : {e}")
+
+    def open_releve_notes(self):
+        """Affiche la page des relevés de notes et du procès-verbal du premier tour"""
+        self.afficher_page(("releves", 1), lambda: self.creer_page_releves(1))
+
+    # gestion des note
+
+    def open_add_note_form(self):
+        """Ouvre le formulaire pour ajouter une note pour un candidat (1er tour uniquement)."""
+        try:
+            self.form_window = QWidget()
+            self.form_window.setWindowTitle("Ajouter une Note")
+            layout = QVBoxLayout()
+
+            # Sélection du candidat par anonymat
+            self.anonymat_combo = QComboBox()
+            self.load_candidats()  # Charge les candidats dans le comboBox
+            layout.addWidget(QLabel("Sélectionner un candidat (Anonymat)"))
+            layout.addWidget(self.anonymat_combo)
+
+            # Récupération des matières du premier tour
+            self.notes_inputs = {}
+            matieres = depot.matieres_du_tour(1)  # 🔹 Sélection uniquement des matières du 1er tour
+
+            # Ajouter un champ pour chaque matière avec un QDoubleSpinBox pour les notes
+            for matiere_id, matiere_nom in matieres:
+                note_label = QLabel(f"{matiere_nom}:")  # Afficher le nom de la matière
+                note_input = QDoubleSpinBox()
+                note_input.setRange(0, 20)  # Plage des notes de 0 à 20
+                note_input.setDecimals(2)  # Permet des décimales
+                note_input.setSingleStep(0.1)  # Incrément de 0.1
+
+                layout.addWidget(note_label)
+                layout.addWidget(note_input)  # Ajoute le champ de saisie
+                self.notes_inputs[matiere_id] = note_input  # Associe l'input à la matière via son ID
+
+            # Bouton de soumission
+            btn_enregistrer = QPushButton("✅ Enregistrer", clicked=self.enregistrer_note)
+            layout.addWidget(btn_enregistrer)
+
+            self.form_window.setLayout(layout)
+
+            # Afficher le formulaire dans le main_content
+            self.main_content.addWidget(self.form_window)
+            self.main_content.setCurrentWidget(self.form_window)
+
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur de base de données lors du chargement des matières : {e}")
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Une erreur est survenue : {e}")
+
+    def enregistrer_note(self):
+        """Enregistre les notes du candidat sélectionné (1er tour uniquement) et met à jour le relevé de notes."""
+        anonymat = self.anonymat_combo.currentText()
+
+        try:
+            # Récupérer l'ID du candidat via son anonymat
+            candidat_id = depot.candidat_par_anonymat(anonymat)
+            if candidat_id is None:
+                QMessageBox.critical(self, "Erreur", "Candidat introuvable !")
+                return
+
+            notes = {}
+            for matiere_id, note_input in self.notes_inputs.items():
+                note = note_input.value()  # ✅ Utiliser value() pour récupérer un float
+
+                # Vérifier si la note est bien entre 0 et 20
+                if note < 0 or note > 20:
+                    QMessageBox.warning(self, "Valeur incorrecte",
+                                        f"La note {note} pour la matière {matiere_id} est invalide.")
+                    continue
+                notes[matiere_id] = note
+
+            # Toutes les notes du candidat sont écrites dans une seule transaction
+            depot.enregistrer_notes(candidat_id, notes, tour=1)
+            QMessageBox.information(self, "Succès", "Notes enregistrées avec succès !")
+            self.form_window.close()
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'enregistrement : {e}")
+
+    def load_candidats(self):
+        """Charge la liste des candidats anonymes dans la comboBox"""
+        self.anonymat_combo.addItems([str(anonymat) for anonymat in depot.lister_anonymats()])
+
+    def open_liste_notes(self):
+        """Affiche la liste des notes avec les anonymats en ligne et les matières en colonne avec le bouton Modifier."""
+        self.afficher_grille_notes(1, self.modifier_note)
+
+    def afficher_grille_notes(self, tour, modifier):
+        """Affiche la grille des notes d'un tour (recréée seulement si les matières ont changé)"""
+        try:
+            matieres = depot.matieres_du_tour(tour)
+            if not matieres:
+                QMessageBox.warning(self, "Aucune donnée",
+                                    "Aucun candidat ou matière disponible pour afficher les notes.")
+                return
+
+            titre = "Liste des Notes - 2e Tour" if tour == 2 else "Liste des Notes"
+            self.afficher_page(("notes", tour), lambda: self.creer_page_liste(
+                titre, ModeleGrilleNotes(tour, matieres), actions=[("🖊️ Modifier", modifier)],
+                message_vide="⚠ Aucun candidat disponible pour afficher les notes."),
+                signature=tuple(matieres))
+
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors du chargement des notes : {e}")
+
+    def modifier_note(self, candidat_id):
+        """Ouvre un formulaire pour modifier les notes d'un candidat."""
+        try:
+            self.form_modif_note = QWidget()
+            self.form_modif_note.setWindowTitle("Modifier les Notes")
+            layout = QVBoxLayout()
+
+            # Récupérer les matières et notes actuelles du candidat
+            matieres_notes = depot.notes_du_candidat(candidat_id, 1)
+
+            self.notes_inputs = {}
+
+            for matiere_id, matiere_nom, note in matieres_notes:
+                note_label = QLabel(f"{matiere_nom}:")
+                note_input = QDoubleSpinBox()
+                note_input.setRange(0, 20)
+                note_input.setDecimals(2)
+                note_input.setSingleStep(0.1)
+                note_input.setValue(note if note is not None else 0)
+
+                layout.addWidget(note_label)
+                layout.addWidget(note_input)
+                self.notes_inputs[matiere_id] = note_input
+
+            # Bouton de sauvegarde
+            btn_sauvegarder = QPushButton("✅ Sauvegarder")
+            btn_sauvegarder.clicked.connect(lambda: self.sauvegarder_modifications_note(candidat_id))
+
+            layout.addWidget(btn_sauvegarder)
+            self.form_modif_note.setLayout(layout)
+
+            # Afficher la fenêtre de modification
+            self.main_content.addWidget(self.form_modif_note)
+            self.main_content.setCurrentWidget(self.form_modif_note)
+
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'ouverture du formulaire : {e}")
+
+    def sauvegarder_modifications_note(self, candidat_id, tour=1):
+        """Sauvegarde les modifications des notes d'un candidat."""
+        try:
+            notes = {}
+            for matiere_id, note_input in self.notes_inputs.items():
+                note = note_input.value()
+
+                if note < 0 or note > 20:
+                    QMessageBox.warning(self, "Erreur", f"La note {note} est invalide.")
+                    continue
+                notes[matiere_id] = note
+
+            depot.enregistrer_notes(candidat_id, notes, tour=tour)
+            QMessageBox.information(self, "Succès", "Notes mises à jour !")
+            if tour == 2:
+                self.open_liste_notes_2em_tour()
+            else:
+                self.open_liste_notes()
+
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de la modification : {e}")
+
+    # crude mathier
+    def open_liste_matieres(self):
+        """Affiche la liste des matières avec des boutons pour modifier et supprimer"""
+        from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QPushButton, QHBoxLayout, QWidget
+
+        self.liste_matieres_page = QWidget()
+        layout = QVBoxLayout()
+
+        # Création d'une table pour afficher les matières
+        self.table_matieres = QTableWidget()
+        self.table_matieres.setColumnCount(4)
+        self.table_matieres.setHorizontalHeaderLabels(["Nom ", "Coefficient", "Tour", "Actions"])
+
+        # Appliquer des styles à l'en-tête avec texte noir
+        self.table_matieres.horizontalHeader().setStyleSheet("""
+
+            color: black;  /* Texte en noir */
+            font-weight: bold;  /* Mettre en gras */
+
+        """)
+
+        # Remplir la table avec les matières existantes
+        matieres = depot.lister_matieres()
+
+        self.table_matieres.setRowCount(len(matieres))
+
+        for row, (id, nom, coefficient, tour) in enumerate(matieres):
+            self.table_matieres.setItem(row, 0, QTableWidgetItem(nom))
+            self.table_matieres.setItem(row, 1, QTableWidgetItem(str(coefficient)))
+            self.table_matieres.setItem(row, 2, QTableWidgetItem("Premier tour" if tour == 1 else "Deuxième tour"))
+
+            # Ajouter des boutons pour modifier et supprimer
+            btn_modifier = QPushButton("🖊️")
+            btn_modifier.clicked.connect(lambda checked, id=id: self.modify_matiere(id))
+            btn_supprimer = QPushButton("🗑️")
+            btn_supprimer.clicked.connect(lambda checked, id=id: self.delete_matiere(id))
+
+            btn_layout = QHBoxLayout()
+            btn_layout.addWidget(btn_modifier)
+            btn_layout.addWidget(btn_supprimer)
+
+            widget = QWidget()
+            widget.setLayout(btn_layout)
+
+            self.table_matieres.setCellWidget(row, 3, widget)
+
+        layout.addWidget(self.table_matieres)
+        self.liste_matieres_page.setLayout(layout)
+        self.main_content.addWidget(self.liste_matieres_page)
+        self.main_content.setCurrentWidget(self.liste_matieres_page)
+
+    def modify_matiere(self, id):
+        """Modifier une matière en utilisant son ID (1er tour uniquement)"""
+        try:
+            matiere = depot.infos_matiere(id)
+
+            if matiere:
+                nom, coefficient, facultative, _ = matiere
+
+                # Créer un formulaire pour modifier la matière
+                self.modify_matiere_form = QWidget()
+                form_layout = QFormLayout()
+
+                self.nom_matiere_input = QLineEdit(nom)
+                self.coefficient_input = QSpinBox()
+                self.coefficient_input.setValue(coefficient)
+
+                self.facultative_input = QComboBox()
+                self.facultative_input.addItems(["Obligatoire", "Facultative"])
+                self.facultative_input.setCurrentIndex(0 if facultative == 0 else 1)
+
+                # Ajouter les champs au formulaire
+                form_layout.addRow("Nom de la matière (1er Tour)", self.nom_matiere_input)  # 🔹 Indication 1er tour
+                form_layout.addRow("Coefficient", self.coefficient_input)
+                form_layout.addRow("Facultative", self.facultative_input)
+
+                save_button = QPushButton("Sauvegarder")
+                save_button.clicked.connect(lambda: self.save_modified_matiere(id))
+
+                form_layout.addWidget(save_button)
+
+                self.modify_matiere_form.setLayout(form_layout)
+                self.main_content.addWidget(self.modify_matiere_form)
+                self.main_content.setCurrentWidget(self.modify_matiere_form)
+        except Exception as e:
+            print(f"Erreur lors de la modification de la matière : {e}")
+
+    def save_modified_matiere(self, id):
+        """Sauvegarder les modifications d'une matière du premier tour"""
+        nom = self.nom_matiere_input.text()
+        coefficient = self.coefficient_input.value()
+        facultative = 1 if self.facultative_input.currentText() == "Facultative" else 0
+
+        try:
+            depot.modifier_matiere(id, nom, coefficient, facultative)
+            QMessageBox.information(self, "Succès", "Matière modifiée avec succès.")
+            self.open_liste_matieres()  # Recharger la liste des matières
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de la modification : {e}")
+
+    def delete_matiere(self, id):
+        """Supprimer une matière avec une boîte de dialogue de confirmation"""
+        # Créer une boîte de dialogue de confirmation
+        reply = QMessageBox.question(self, 'Confirmer la suppression',
+                                     'Êtes-vous sûr de vouloir supprimer cette matière ?',
+                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+
+        if reply == QMessageBox.Yes:
+            try:
+                depot.supprimer_matiere(id)
+
+                # Mettre à jour la liste des matières
+                self.open_liste_matieres()  # Recharge la liste des matières
+
+                print("Matière supprimée avec succès.")
+            except Exception as e:
+                print(f"Erreur lors de la suppression de la matière : {e}")
+
+    # souvegarede des mathier
+    def open_add_matiere_form(self):
+        """Affiche un formulaire pour ajouter une matière du premier tour"""
+        from PyQt5.QtWidgets import QFormLayout, QLineEdit, QSpinBox, QComboBox, QPushButton, QWidget
+
+        self.add_matiere_form = QWidget()
+        form_layout = QFormLayout()
+
+        # Champs du formulaire
+        self.nom_matiere_input = QLineEdit()
+        self.coefficient_input = QSpinBox()
+        self.coefficient_input.setRange(1, 10)  # Coefficient entre 1 et 10
+
+        self.facultative_input = QComboBox()
+        self.facultative_input.addItems(["Obligatoire", "Facultative"])
+
+        # Ajout des champs au formulaire
+        form_layout.addRow("Nom de la matière (1er Tour)", self.nom_matiere_input)  # 🔹 Indication du 1er tour
+        form_layout.addRow("Coefficient", self.coefficient_input)
+        form_layout.addRow("Facultative", self.facultative_input)
+
+        # Bouton de sauvegarde
+        self.save_matiere_button = QPushButton("Ajouter au Premier Tour")
+        self.save_matiere_button.clicked.connect(self.save_matiere)
+
+        form_layout.addWidget(self.save_matiere_button)
+
+        self.add_matiere_form.setLayout(form_layout)
+        self.main_content.addWidget(self.add_matiere_form)
+        self.main_content.setCurrentWidget(self.add_matiere_form)
+
+    def save_matiere(self):
+        """Ajoute une matière du premier tour et initialise les notes des candidats dans la table note"""
+        # Vérifier que le champ nom n'est pas vide
+        if not self.nom_matiere_input.text().strip():
+            QMessageBox.warning(self, "Champ vide", "Le nom de la matière est obligatoire.")
+            return
+
+        try:
+            # Matière du premier tour, notes des candidats initialisées en bloc
+            depot.ajouter_matiere(self.nom_matiere_input.text(), self.coefficient_input.value(), 1,
+                                  self.facultative_input.currentText() == "Facultative")
+        except ValueError:
+            QMessageBox.warning(self, "Doublon", "Cette matière existe déjà pour le 1er tour.")
+            return
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'ajout de la matière : {e}")
+            return
+
+        QMessageBox.information(self, "Succès", "Matière ajoutée et notes initialisées avec succès.")
+
+        # Nettoyer les champs
+        self.nom_matiere_input.clear()
+        self.coefficient_input.setValue(1)
+        self.facultative_input.setCurrentIndex(0)
+
+    def toggle_notes_submenu(self):
+        """Afficher ou masquer le sous-menu des notes et matières"""
+        is_visible = self.notes_submenu_widget.isVisible()
+        self.notes_submenu_widget.setVisible(not is_visible)
+
+    def toggle_repechage_submenu(self):
+        """Afficher ou masquer le sous-menu de gestion des repêchages"""
+        self.repechage_submenu_widget.setVisible(not self.repechage_submenu_widget.isVisible())
+
+    # generation des anonyme
+    def generer_anonymat(self):
+        """Génère un numéro d'anonymat unique pour tous les candidats sans anonymat"""
+        def afficher(nombre):
+            if nombre:
+                QMessageBox.information(self, "Succès",
+                                        f"{nombre} numéro(s) d'anonymat généré(s) et mis à jour avec succès !")
+            else:
+                QMessageBox.information(self, "Information", "Tous les candidats ont déjà un numéro d'anonymat.")
+
+        # Attribution en une seule passe et une seule transaction, hors du thread de l'interface
+        self.lancer_tache("🔢 Génération des anonymats",
+                          lambda tache: anonymisation.attribuer_anonymats(get_connexion()), afficher)
+
+    # liste des candiat
+    def open_liste_candidats(self):
+        """Affiche la liste des candidats dans un tableau avec des icônes de modification, suppression et voir info"""
+        try:
+            colonnes = ["numero_table", "prenom", "nom", "date_naissance", "lieu_naissance", "sexe", "type_candidat",
+                        "etablissement", "nationalite", "etat_sportif", "anonymat"]
+            entetes = ["Numéro Table", "Prénom", "Nom", "Date Naissance", "Lieu Naissance", "Sexe", "Type Candidat",
+                       "Établissement", "Nationalité", "État Sportif", "Anonymat", "Actions"]
+            self.afficher_page("candidats", lambda: self.creer_page_liste(
+                "Liste des candidats",
+                ModeleSQL(depot.REQUETE_CANDIDATS, colonnes, entetes,
+                          colonnes_filtre=["numero_table", "prenom", "nom", "etablissement", "anonymat"]),
+                actions=[("✏️", self.modifier_candidat), ("❌", self.supprimer_candidat),
+                         ("👁️", self.voir_info_candidat)],
+                message_vide="Aucun candidat trouvé dans la base de données."))
+
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de la récupération des candidats : {e}")
+
+    def exporter_candidats_pdf(self):
+        """Génère en arrière-plan le PDF de la liste des candidats (liste d'émargement)"""
+        def afficher(nombre):
+            if nombre:
+                QMessageBox.information(self, "Succès", f"✅ {nombre} candidat(s) exporté(s) dans liste_candidats.pdf")
+            else:
+                QMessageBox.warning(self, "Erreur", "⚠ Aucun candidat à exporter en PDF.")
+
+        self.lancer_tache("📑 Liste des candidats",
+                          lambda tache: rapports.generer_liste_candidats(progression=tache.avancer), afficher)
+
+    def exporter_centre(self):
+        """Exporte en arrière-plan le paquet du centre à envoyer pour la consolidation nationale"""
+        depuis = consolidation.derniere_exportation()
+        if depuis:
+            reponse = QMessageBox.question(
+                self, "Exporter le centre",
+                "Exporter seulement les candidats modifiés depuis le dernier envoi ?\n"
+                "(Non : paquet complet, à utiliser si un envoi précédent a été perdu)",
+                QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel, QMessageBox.Yes)
+            if reponse == QMessageBox.Cancel:
+                return
+            if reponse == QMessageBox.No:
+                depuis = 0
+
+        chemin, _ = QFileDialog.getSaveFileName(self, "Enregistrer le paquet du centre", "paquet_centre.db",
+                                                "Base SQLite (*.db)")
+        if not chemin:
+            return
+        self.lancer_tache("📦 Export du centre", lambda tache: consolidation.exporter_centre(chemin, depuis),
+                          lambda version: QMessageBox.information(
+                              self, "Succès", f"✅ Paquet du centre enregistré dans {chemin}"))
+
+    def voir_info_candidat(self, id):
+        """Afficher les informations détaillées du candidat dans une boîte de dialogue"""
+        try:
+            candidat = depot.infos_candidat(id)
+
+            if candidat:
+                # Créer une fenêtre de dialogue pour afficher les informations
+                info_dialog = QDialog(self)
+                info_dialog.setWindowTitle(f"Informations du Candidat {candidat[1]}")
+
+                # Créer un layout pour afficher les informations
+                layout = QVBoxLayout()
+
+                info_labels = [
+                    f"Prénom: {candidat[0]}",
+                    f"Nom: {candidat[1]}",
+                    f"Date de Naissance: {candidat[2]}",
+                    f"Lieu de Naissance: {candidat[3]}",
+                    f"Sexe: {candidat[4]}",
+                    f"Type de Candidat: {candidat[5]}",
+                    f"Établissement: {candidat[6]}",
+                    f"Nationalité: {candidat[7]}",
+                    f"État Sportif: {candidat[8]}",
+                    f"Anonymat: {candidat[9]}"
+                ]
+
+                for label in info_labels:
+                    layout.addWidget(QLabel(label))
+
+                # Ajouter un bouton de fermeture
+                btn_close = QPushButton("Fermer")
+                btn_close.clicked.connect(info_dialog.close)
+                layout.addWidget(btn_close)
+
+                info_dialog.setLayout(layout)
+                info_dialog.exec_()
+
+            else:
+                QMessageBox.warning(self, "Erreur", "Aucun candidat trouvé avec cet ID.")
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'affichage des informations du candidat : {e}")
+
+    def open_liste_releves(self):
+        """Affiche la liste des relevés scolaires des candidats"""
+        try:
+            # Informations des candidats avec leurs relevés scolaires
+            releves = depot.lister_releves_scolaires()
+
+            if releves:
+                self.liste_releves_table = QTableWidget()
+                self.liste_releves_table.setRowCount(len(releves))
+                self.liste_releves_table.setColumnCount(10)
+
+                # Définition des en-têtes de colonnes
+                self.liste_releves_table.setHorizontalHeaderLabels([
+                    "Prénom", "Nom", "Date de Naissance", "Lieu de Naissance",
+                    "Moyenne 6e", "Moyenne 5e", "Moyenne 4e", "Moyenne 3e",
+                    "Moyenne Générale", "Nombre de fois"
+                ])
+
+                # Appliquer des styles à l'en-tête
+                self.liste_releves_table.horizontalHeader().setStyleSheet("""
+
+                             color: black;
+                            font-weight: bold;  /* Mettre en gras */
+
+                        """)
+
+                # Remplir le tableau avec les données
+                for row, releve in enumerate(releves):
+                    for col, data in enumerate(releve):
+                        self.liste_releves_table.setItem(row, col, QTableWidgetItem(str(data)))
+
+                # Création du titre de la page
+                self.liste_releves_title = QLabel("Liste des relevés scolaires", alignment=Qt.AlignCenter)
+                self.liste_releves_title.setStyleSheet("font-size: 24px; font-weight: bold; color: #FFA500;")
+
+                # Ajouter le tableau dans la mise en page
+                layout = QVBoxLayout()
+                layout.addWidget(self.liste_releves_title)
+                layout.addWidget(self.liste_releves_table)
+
+                # Créer un widget contenant le layout
+                self.liste_releves_widget = QWidget()
+                self.liste_releves_widget.setLayout(layout)
+
+                # Afficher la page
+                self.main_content.addWidget(self.liste_releves_widget)
+                self.main_content.setCurrentWidget(self.liste_releves_widget)
+
+            else:
+                QMessageBox.information(self, "Information", "Aucun relevé trouvé dans la base de données.")
+
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de la récupération des relevés : {e}")
+
+    # modification et supression d'un candidat
+    def modifier_candidat(self, candidat_id):
+        """Affiche un formulaire pour modifier les informations d'un candidat"""
+        try:
+            # Récupérer les informations du candidat à modifier
+            candidat = depot.infos_candidat(candidat_id)
+
+            if candidat:
+                # Créer un formulaire de modification avec les informations existantes
+                self.formulaire_modification = QWidget()
+                layout = QVBoxLayout()
+
+                self.prenom_input = QLineEdit(candidat[0])  # Prénom
+                self.nom_input = QLineEdit(candidat[1])  # Nom
+                self.date_naissance_input = QLineEdit(candidat[2])  # Date de naissance
+                self.lieu_naissance_input = QLineEdit(candidat[3])  # Lieu de naissance
+                self.sexe_input = QLineEdit(candidat[4])  # Sexe
+                self.type_candidat_input = QLineEdit(candidat[5])  # Type de candidat
+                self.etablissement_input = QLineEdit(candidat[6])  # Établissement
+                self.nationalite_input = QLineEdit(candidat[7])  # Nationalité
+                self.etat_sportif_input = QLineEdit(candidat[8])  # État sportif
+                self.anonymat_input = QLineEdit(str(candidat[9]))  # Anonymat
+
+                # Ajouter les champs au formulaire
+                layout.addWidget(QLabel("Nom:"))
+                layout.addWidget(self.nom_input)
+                layout.addWidget(QLabel("Prénom:"))
+                layout.addWidget(self.prenom_input)
+                layout.addWidget(QLabel("Date de naissance:"))
+                layout.addWidget(self.date_naissance_input)
+                layout.addWidget(QLabel("Lieu de naissance:"))
+                layout.addWidget(self.lieu_naissance_input)
+                layout.addWidget(QLabel("Sexe:"))
+                layout.addWidget(self.sexe_input)
+                layout.addWidget(QLabel("Type de candidat:"))
+                layout.addWidget(self.type_candidat_input)
+                layout.addWidget(QLabel("Établissement:"))
+                layout.addWidget(self.etablissement_input)
+                layout.addWidget(QLabel("Nationalité:"))
+                layout.addWidget(self.nationalite_input)
+                layout.addWidget(QLabel("État sportif:"))
+                layout.addWidget(self.etat_sportif_input)
+                layout.addWidget(QLabel("Anonymat:"))
+                layout.addWidget(self.anonymat_input)
+
+                # Ajouter un bouton pour soumettre les modifications
+                self.btn_sauvegarder = QPushButton("Sauvegarder les modifications")
+                self.btn_sauvegarder.clicked.connect(lambda: self.sauvegarder_modifications(candidat_id))
+
+                layout.addWidget(self.btn_sauvegarder)
+
+                # Mettre en place le layout et afficher le formulaire
+                self.formulaire_modification.setLayout(layout)
+                self.main_content.addWidget(self.formulaire_modification)
+                self.main_content.setCurrentWidget(self.formulaire_modification)
+
+            else:
+                QMessageBox.warning(self, "Erreur", "Candidat non trouvé.")
+
+
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de la récupération des données : {e}")
+
+    def sauvegarder_modifications(self, candidat_id):
+        """Sauvegarde les modifications du candidat dans la base de données"""
+        try:
+            # Récupérer les nouvelles données
+            nom = self.nom_input.text()
+            prenom = self.prenom_input.text()
+            date_naissance = self.date_naissance_input.text()
+            lieu_naissance = self.lieu_naissance_input.text()
+            sexe = self.sexe_input.text()
+            type_candidat = self.type_candidat_input.text()
+            etablissement = self.etablissement_input.text()
+            nationalite = self.nationalite_input.text()
+            etat_sportif = self.etat_sportif_input.text()
+            anonymat = self.anonymat_input.text()
+
+            # Mettre à jour les informations du candidat (une transaction)
+            depot.modifier_candidat(candidat_id, prenom, nom, date_naissance, lieu_naissance, sexe, type_candidat,
+                                    etablissement, nationalite, etat_sportif, anonymat)
+
+            QMessageBox.information(self, "Succès", "Les informations du candidat ont été mises à jour.")
+
+            # Retourner à la liste des candidats après modification
+            self.open_liste_candidats()
+
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de la sauvegarde des modifications : {e}")
+
+    def supprimer_candidat(self, candidat_id):
+        """Supprime un candidat de la base de données après confirmation"""
+        # Demander une confirmation avant la suppression
+        reply = QMessageBox.question(self, 'Confirmation de suppression',
+                                     'Êtes-vous sûr de vouloir supprimer ce candidat ?',
+                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+
+        if reply == QMessageBox.Yes:
+            try:
+                # Supprimer le candidat de la base de données
+                depot.supprimer_candidat(candidat_id)
+
+                # Rafraîchir la liste des candidats
+                self.open_liste_candidats()
+
+                QMessageBox.information(self, "Succès", "Candidat supprimé avec succès.")
+
+            except Exception as e:
+                QMessageBox.critical(self, "Erreur", f"Erreur lors de la suppression du candidat : {e}")
+        else:
+            # Si l'utilisateur annule, ne rien faire
+            print("Suppression annulée.")
+
+    def toggle_candidats_submenu(self):
+        """Afficher ou cacher le sous-menu de gestion des candidats"""
+        visible = self.candidats_submenu_widget.isVisible()
+        self.candidats_submenu_widget.setVisible(not visible)
+
+    # l'ajout et souvegarde dest candidat
+
+    def open_add_candidat_form(self):
+        """Ouvre un formulaire pour ajouter un candidat avec relevé scolaire"""
+        from PyQt5.QtWidgets import QFormLayout, QLineEdit, QDateEdit, QComboBox, QDoubleSpinBox, QSpinBox
+
+        self.add_candidat_form = QWidget()
+        form_layout = QFormLayout()
+
+        # Champs du candidat
+        self.num_table_input = QSpinBox()  # Utilisation de QSpinBox au lieu de QLineEdit
+        self.num_table_input.setRange(1, 300)  # Plage de 1 à 100 pour le numéro de table
+        self.prenom_input = QLineEdit()
+        self.nom_input = QLineEdit()
+        self.date_naissance_input = QDateEdit()
+        self.lieu_naissance_input = QLineEdit()
+        self.sexe_input = QComboBox()
+        self.sexe_input.addItems(["Masculin", "Féminin"])
+        self.type_candidat_input = QComboBox()
+        self.type_candidat_input.addItems(["Candidat libre", "Candidat normal"])
+        self.etablissement_input = QLineEdit()
+        self.nationalite_input = QLineEdit()
+        self.etat_sportif_input = QComboBox()
+        self.etat_sportif_input.addItems(["Oui", "Non"])
+
+        # Champs du relevé scolaire
+        self.moyenne_6e_input = QDoubleSpinBox()
+        self.moyenne_5e_input = QDoubleSpinBox()
+        self.moyenne_4e_input = QDoubleSpinBox()
+        self.moyenne_3e_input = QDoubleSpinBox()
+        self.nombre_de_fois_input = QLineEdit()
+
+        for spinbox in [self.moyenne_6e_input, self.moyenne_5e_input, self.moyenne_4e_input, self.moyenne_3e_input]:
+            spinbox.setRange(0, 20)
+            spinbox.setDecimals(2)
+
+        # Ajout des champs au formulaire
+        form_layout.addRow("Numéro de Table", self.num_table_input)
+        form_layout.addRow("Prénom(s)", self.prenom_input)
+        form_layout.addRow("Nom", self.nom_input)
+        form_layout.addRow("Date de Naissance", self.date_naissance_input)
+        form_layout.addRow("Lieu de Naissance", self.lieu_naissance_input)
+        form_layout.addRow("Sexe", self.sexe_input)
+        form_layout.addRow("Type de Candidat", self.type_candidat_input)
+        form_layout.addRow("Établissement", self.etablissement_input)
+        form_layout.addRow("Nationalité", self.nationalite_input)
+        form_layout.addRow("État Sportif", self.etat_sportif_input)
+
+        # Ajout des champs du relevé scolaire
+        form_layout.addRow("Moyenne 6e", self.moyenne_6e_input)
+        form_layout.addRow("Moyenne 5e", self.moyenne_5e_input)
+        form_layout.addRow("Moyenne 4e", self.moyenne_4e_input)
+        form_layout.addRow("Moyenne 3e", self.moyenne_3e_input)
+        form_layout.addRow("Nombre de fois redoublé", self.nombre_de_fois_input)
+
+        # Bouton de sauvegarde
+        self.save_button = QPushButton("Sauvegarder")
+        self.save_button.clicked.connect(self.save_candidat)
+        form_layout.addWidget(self.save_button)
+
+        self.add_candidat_form.setLayout(form_layout)
+        self.main_content.addWidget(self.add_candidat_form)
+        self.main_content.setCurrentWidget(self.add_candidat_form)
+
+    def save_candidat(self):
+        """Sauvegarde un candidat avec son relevé scolaire et initialise ses données associées"""
+        try:
+            # Vérification des champs obligatoires
+            if not self.num_table_input.text() or not self.prenom_input.text() or not self.nom_input.text() or not self.date_naissance_input.date() or not self.lieu_naissance_input.text():
+                QMessageBox.critical(self, "Erreur", "Les champs obligatoires doivent être remplis.")
+                return
+
+            # Validation du sexe (doit être soit 'M' ou 'F')
+            sexe = self.sexe_input.currentText()
+            if sexe == "Masculin":
+                sexe = 'M'
+            elif sexe == "Féminin":
+                sexe = 'F'
+
+            if sexe not in ['M', 'F']:
+                QMessageBox.critical(self, "Erreur", "Le sexe doit être 'M' ou 'F'.")
+                return
+
+            # Calcul automatique de la moyenne générale
+            moy_6e = self.moyenne_6e_input.value()
+            moy_5e = self.moyenne_5e_input.value()
+            moy_4e = self.moyenne_4e_input.value()
+            moy_3e = self.moyenne_3e_input.value()
+            moyenne_generale = (moy_6e + moy_5e + moy_4e + moy_3e) / 4  # Calcul de la moyenne
+
+            # Candidat, relevé scolaire, résultats et relevés de notes vides en une transaction
+            depot.ajouter_candidat(
+                [self.num_table_input.text(),
+                 self.prenom_input.text(),
+                 self.nom_input.text(),
+                 self.date_naissance_input.date().toString("yyyy-MM-dd"),
+                 self.lieu_naissance_input.text(),
+                 sexe,  # Utilisation du sexe validé
+                 self.type_candidat_input.currentText(),
+                 self.etablissement_input.text(),
+                 self.nationalite_input.text(),
+                 self.etat_sportif_input.currentText()],
+                (moy_6e, moy_5e, moy_4e, moy_3e, moyenne_generale, self.nombre_de_fois_input.text()))
+
+            QMessageBox.information(self, "Succès", "Candidat ajouté avec succès avec toutes ses données associées !")
+
+            # Retourner à la liste des candidats après ajout
+            self.open_liste_candidats()
+
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'ajout du candidat : {e}")
+
+    # import CSV
+    def importer_candidats_csv(self):
+        """Importe un registre de candidats depuis un fichier CSV"""
+        self.importer_csv("Importer des candidats", importation.importer_candidats, "candidat(s)")
+
+    def importer_notes_csv(self, tour):
+        """Importe une feuille de notes (anonymat + une colonne par matière) depuis un fichier CSV"""
+        titre = "Importer des notes du 2e tour" if tour == 2 else "Importer des notes"
+        self.importer_csv(titre, partial(importation.importer_notes, tour=tour), "ligne(s) de notes")
+
+    def importer_csv(self, titre, importer, libelle):
+        """Choisit un fichier CSV, l'importe en arrière-plan et affiche le rapport"""
+        chemin, _ = QFileDialog.getOpenFileName(self, titre, "", "Fichiers CSV (*.csv);;Tous les fichiers (*)")
+        if not chemin:
+            return
+
+        def importer_fichier(tache):
+            total = importation.compter_lignes(chemin)
+            return importer(chemin, progression=lambda traitees: tache.avancer(traitees, total))
+
+        def rapport(resultat):
+            importees, erreurs = resultat
+            message = f"✅ {importees} {libelle} importé(s)."
+            if erreurs:
+                # Les premières erreurs suffisent pour corriger le fichier
+                details = "\n".join(f"Ligne {numero} : {erreur}" for numero, erreur in erreurs[:20])
+                suite = f"\n... et {len(erreurs) - 20} autre(s)" if len(erreurs) > 20 else ""
+                QMessageBox.warning(self, "Import terminé avec des erreurs",
+                                    f"{message}\n⚠ {len(erreurs)} ligne(s) rejetée(s) :\n{details}{suite}")
+            else:
+                self.show_info_message(message)
+
+        self.lancer_tache(f"📥 {titre}", importer_fichier, rapport)
+
+    # information du jury
+    def get_jury_info(self, email_membre):
+        """Récupérer les informations du jury et du membre"""
+        try:
+            infos = depot.infos_jury(email_membre)
+            if not infos:
+                return "Jury inconnu", "Membre inconnu"
+
+            nom, prenom, localite, centre_examen = infos
+            return f"Jury {localite} - {centre_examen}", f"{nom} {prenom}"
+        except Exception as e:
+            return "Jury inconnu", "Membre inconnu"
+
+    def toggle_sidebar(self):
+        """Afficher ou cacher la barre latérale"""
+        self.sidebar.setFixedWidth(250 if self.sidebar.width() == 0 else 0)
+
+
+if __name__ == "__main__":
+    app = QApplication([])
+    window = BFEMApp(email_membre="test@example.com")
+    window.show()
+    app.exec_()
@@ -0,0 +1,207 @@
+import cProfile
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+import depot
+import generateur
+import noyau
+from connexion import get_connexion
+
+# Tailles mesurées par défaut (nombre de candidats)
+TAILLES = [1000, 10000, 100000]
+
+# Fichier où chaque exécution ajoute ses mesures (une ligne JSON par étape)
+FICHIER_RESULTATS = "benchmarks.jsonl"
+
+# Écart relatif au-delà duquel une étape est signalée comme régression
+SEUIL_REGRESSION = 0.20
+# ... et écart absolu minimal (les étapes de quelques millisecondes sont trop bruitées)
+ECART_MINIMUM = 0.05
+
+
+# ======================= ÉTAPES ======================== #
+
+def _modifier_notes(proportion=0.01):
+    """Change une note d'une partie des candidats (préparation de la délibération incrémentale)"""
+    matiere_id = depot.matieres_du_tour(1)[0][0]
+    nombre = max(1, int(depot.compter_candidats() * proportion))
+    candidats = [candidat_id for (candidat_id,) in
+                 get_connexion().execute("SELECT id FROM candidat ORDER BY random() LIMIT ?", (nombre,))]
+    for candidat_id in candidats:
+        depot.enregistrer_notes(candidat_id, {matiere_id: 15}, 1)
+    return nombre
+
+
+def _charger_listes():
+    """Ouvre les listes comme l'interface : première page, tri, filtre, puis la grille des notes"""
+    from PyQt5.QtCore import Qt
+    from modeles import ModeleGrilleNotes, ModeleSQL
+
+    colonnes = ["numero_table", "prenom", "nom", "date_naissance", "lieu_naissance", "sexe", "type_candidat",
+                "etablissement", "nationalite", "etat_sportif", "anonymat"]
+    candidats = ModeleSQL(depot.REQUETE_CANDIDATS, colonnes, colonnes,
+                          colonnes_filtre=["numero_table", "prenom", "nom", "etablissement", "anonymat"])
+    candidats.recharger()
+    candidats.sort(colonnes.index("nom"), Qt.DescendingOrder)
+    candidats.filtrer("Diop")
+
+    admis = ModeleSQL(depot.requete_resultats(1, "admis"), ["numero_table", "nom", "prenom", "total_points"],
+                      ["Numéro Table", "Nom", "Prénom", "Total Points"], tri=("total_points", Qt.DescendingOrder))
+    admis.recharger()
+
+    for tour in (1, 2):
+        grille = ModeleGrilleNotes(tour, depot.matieres_du_tour(tour))
+        grille.recharger()
+        grille.fetchMore()
+    return candidats.rowCount() + admis.rowCount() + grille.rowCount()
+
+
+def _application_qt():
+    """QApplication hors écran pour les modèles de liste ; None si PyQt5 n'est pas installé"""
+    try:
+        from PyQt5.QtWidgets import QApplication
+    except ImportError:
+        return None
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return QApplication.instance() or QApplication([])
+
+
+def etapes(dossier, releves=False, avec_qt=True):
+    """Étapes mesurées sur une base déjà générée : [(nom, fonction)] dans l'ordre d'exécution"""
+    liste = [
+        ("anonymat", noyau.attribuer_anonymats),
+        ("deliberation_tour1", lambda: noyau.deliberer(1)),
+        ("deliberation_tour2", lambda: noyau.deliberer(2)),
+        ("modification_notes_1pc", _modifier_notes),
+        ("deliberation_incrementale", lambda: noyau.deliberer(1, incremental=True)),
+        ("statistiques", lambda: noyau.bilan(1)),
+    ]
+    if avec_qt:
+        liste.append(("chargement_listes", _charger_listes))
+    liste += [
+        ("pdf_liste_admis", lambda: noyau.exporter_liste(1, "admis", os.path.join(dossier, "admis.pdf"))),
+        ("pdf_pv", lambda: noyau.exporter_pv(1, os.path.join(dossier, "pv.pdf"))),
+        ("pdf_candidats", lambda: noyau.exporter_candidats(os.path.join(dossier, "candidats.pdf"))),
+    ]
+    if releves:
+        liste.append(("pdf_releves", lambda: noyau.exporter_releves(os.path.join(dossier, "releves.pdf"))))
+    return liste
+
+
+# ======================= MESURE ======================== #
+
+def _mesurer(nom, fonction, profil=None, taille=None):
+    """Exécute une étape et retourne sa durée en secondes ; écrit un profil cProfile si demandé"""
+    profileur = cProfile.Profile() if profil else None
+    debut = time.perf_counter()
+    if profileur:
+        profileur.enable()
+    try:
+        fonction()
+    finally:
+        if profileur:
+            profileur.disable()
+    duree = time.perf_counter() - debut
+
+    if profileur:
+        os.makedirs(profil, exist_ok=True)
+        profileur.dump_stats(os.path.join(profil, f"{taille}_{nom}.prof"))
+    return duree
+
+
+def version_courante():
+    """Révision git courante (abrégée), ou 'inconnue' hors d'un dépôt"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "inconnue"
+
+
+def mesurer_taille(taille, dossier, profil=None, releves=False, graine=0, afficher=print):
+    """Génère une base neuve de `taille` candidats dans `dossier` et mesure chaque étape ; retourne {étape: s}"""
+    chemin = os.path.join(dossier, f"bench_{taille}.db")
+    for suffixe in ("", "-wal", "-shm"):
+        if os.path.exists(chemin + suffixe):
+            os.remove(chemin + suffixe)
+    noyau.ouvrir_base(chemin)
+
+    durees = {"generation": _mesurer("generation", lambda: generateur.generer(taille, graine), profil, taille)}
+    afficher(f"  {taille:>7} generation{'':<20} {durees['generation']:8.3f} s")
+
+    avec_qt = _application_qt() is not None
+    if not avec_qt:
+        afficher("  (PyQt5 absent : chargement des listes non mesuré)")
+    for nom, fonction in etapes(dossier, releves, avec_qt):
+        durees[nom] = _mesurer(nom, fonction, profil, taille)
+        afficher(f"  {taille:>7} {nom:<30} {durees[nom]:8.3f} s")
+
+    noyau.fermer_connexion()
+    return durees
+
+
+# ======================= HISTORIQUE ======================== #
+
+def lire_historique(fichier=FICHIER_RESULTATS):
+    """Mesures précédentes (liste de dicts), dans l'ordre où elles ont été écrites"""
+    if not os.path.exists(fichier):
+        return []
+    with open(fichier, encoding="utf-8") as entree:
+        return [json.loads(ligne) for ligne in entree if ligne.strip()]
+
+
+def enregistrer(mesures, fichier=FICHIER_RESULTATS):
+    with open(fichier, "a", encoding="utf-8") as sortie:
+        for mesure in mesures:
+            sortie.write(json.dumps(mesure, ensure_ascii=False) + "\n")
+
+
+def comparer(mesures, historique, seuil=SEUIL_REGRESSION):
+    """Écarts d'au moins `seuil` avec la dernière mesure d'une autre version : [(taille, étape, avant, après, écart)]"""
+    precedentes = {}
+    for mesure in historique:
+        if mesure["version"] != mesures[0]["version"]:
+            precedentes[(mesure["taille"], mesure["etape"])] = mesure
+
+    ecarts = []
+    for mesure in mesures:
+        avant = precedentes.get((mesure["taille"], mesure["etape"]))
+        if avant and avant["secondes"] > 0:
+            ecart = mesure["secondes"] / avant["secondes"] - 1
+            if abs(ecart) >= seuil and abs(mesure["secondes"] - avant["secondes"]) >= ECART_MINIMUM:
+                ecarts.append((mesure["taille"], mesure["etape"], avant, mesure["secondes"], ecart))
+    return ecarts
+
+
+def executer(tailles=None, dossier=None, profil=None, releves=False, version=None, fichier=FICHIER_RESULTATS,
+             graine=0, afficher=print):
+    """Mesure toutes les tailles, ajoute les résultats à `fichier` et signale les écarts avec la version
+    précédente ; retourne la liste des mesures"""
+    version = version or version_courante()
+    dossier = dossier or tempfile.mkdtemp(prefix="bfem_bench_")
+    os.makedirs(dossier, exist_ok=True)
+    horodatage = datetime.now().isoformat(timespec="seconds")
+    contexte = {"version": version, "date": horodatage, "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version, "machine": platform.machine()}
+
+    afficher(f"📊 Mesures de la version {version} (bases dans {dossier})")
+    mesures = []
+    for taille in tailles or TAILLES:
+        for etape, secondes in mesurer_taille(taille, dossier, profil, releves, graine, afficher).items():
+            mesures.append(dict(contexte, taille=taille, etape=etape, secondes=round(secondes, 4)))
+
+    ecarts = comparer(mesures, lire_historique(fichier))
+    enregistrer(mesures, fichier)
+    afficher(f"✅ {len(mesures)} mesure(s) ajoutée(s) à {fichier}")
+
+    for taille, etape, avant, apres, ecart in ecarts:
+        signe = "⚠️ plus lent" if ecart > 0 else "🚀 plus rapide"
+        afficher(f"  {signe} : {etape} ({taille}) {avant['secondes']:.3f} s ({avant['version']}) "
+                 f"→ {apres:.3f} s ({ecart:+.0%})")
+    return mesures
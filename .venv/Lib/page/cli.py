@@ -0,0 +1,187 @@
+import argparse
+import sqlite3
+import sys
+
+import benchmark
+import connexion
+import consolidation
+import generateur
+import noyau
+import statistiques
+
+# Ligne de commande du jury : les traitements de l'application sans interface graphique.
+# Exemple : python cli.py --base bfem.db deliberer --tour 1
+
+
+def _afficher_progression(faits, total=0):
+    suffixe = f"/{total}" if total else ""
+    print(f"\r  … {faits}{suffixe}", end="", file=sys.stderr, flush=True)
+
+
+def _afficher_erreurs(erreurs):
+    for numero, message in erreurs[:20]:
+        print(f"  ligne {numero} : {message}")
+    if len(erreurs) > 20:
+        print(f"  … et {len(erreurs) - 20} autre(s) erreur(s)")
+
+
+def generer(args):
+    nombre = generateur.generer(args.nombre, args.graine, args.prefixe, _afficher_progression)
+    print(f"\n✅ {nombre} candidat(s) fictif(s) ajouté(s)")
+
+
+def anonymat(args):
+    nombre = noyau.attribuer_anonymats(args.largeur)
+    print(f"✅ {nombre} numéro(s) d'anonymat attribué(s)")
+
+
+def deliberer(args):
+    nombre = noyau.deliberer(args.tour, args.incremental)
+    print(f"⚖️ Délibération du tour {args.tour} : {nombre} candidat(s) délibéré(s)")
+
+
+def importer_candidats(args):
+    importes, erreurs = noyau.importer_candidats(args.fichier, _afficher_progression)
+    print(f"\n✅ {importes} candidat(s) importé(s), {len(erreurs)} ligne(s) rejetée(s)")
+    _afficher_erreurs(erreurs)
+
+
+def importer_notes(args):
+    importes, erreurs = noyau.importer_notes(args.fichier, args.tour, _afficher_progression)
+    print(f"\n✅ {importes} ligne(s) de notes importée(s), {len(erreurs)} ligne(s) rejetée(s)")
+    _afficher_erreurs(erreurs)
+
+
+def exporter(args):
+    if args.document == "liste":
+        chemin = noyau.exporter_liste(args.tour, args.categorie, args.sortie, _afficher_progression)
+    elif args.document == "pv":
+        chemin = noyau.exporter_pv(args.tour, args.sortie, args.jury, _afficher_progression)
+    elif args.document == "candidats":
+        chemin = args.sortie or "liste_candidats.pdf"
+        noyau.exporter_candidats(chemin, _afficher_progression)
+    else:
+        chemin = args.sortie or ("releves" if args.par_candidat else f"releves_tour{args.tour}.pdf")
+        noyau.exporter_releves(chemin, args.tour, args.par_candidat, args.processus, _afficher_progression)
+    print(f"\n📄 Document généré : {chemin}")
+
+
+def stats(args):
+    bilan = noyau.bilan(args.tour)
+    # Moyenne et taux calculés sur les seuls délibérés : rien à afficher tant que personne ne l'est
+    moyenne = f"{bilan['moyenne']:.2f}" if bilan["moyenne"] is not None else "-"
+    taux = f"{bilan['taux_admission']:.1%}" if bilan["taux_admission"] is not None else "-"
+    print(f"📊 Tour {args.tour} : {bilan['effectif']} candidat(s) dont {bilan['deliberes']} délibéré(s), "
+          f"moyenne {moyenne}, taux d'admission {taux}")
+    for presentation, effectif in sorted(bilan["decisions"].items()):
+        print(f"  {presentation:<20} {effectif:>8}")
+    if args.critere:
+        print(f"\n  {statistiques.CRITERES[args.critere]:<30} {'Effectif':>8} {'Admis':>8} {'Taux':>7} {'Moyenne':>8}")
+        for valeur, effectif, admis, taux, moyenne, _ in noyau.repartition(args.tour, args.critere):
+            print(f"  {str(valeur):<30} {effectif:>8} {admis:>8} {taux:>7.1%} {moyenne:>8.2f}")
+
+
+def exporter_centre(args):
+    version = noyau.exporter_centre(args.sortie, args.complet, args.nouveau_code)
+    print(f"📦 Paquet du centre écrit dans {args.sortie} (journal jusqu'à la version {version})")
+
+
+def consolider(args):
+    bilans, erreurs = noyau.fusionner_centres(args.paquets, _afficher_progression)
+    print(f"\n✅ {len(bilans)} centre(s) fusionné(s) : {sum(bilan[2] for bilan in bilans)} candidat(s) transféré(s), "
+          f"{sum(bilan[3] for bilan in bilans)} supprimé(s), {sum(bilan[4] for bilan in bilans)} doublon(s)")
+    for chemin, message in erreurs:
+        print(f"  ❌ {chemin} : {message}")
+    for numero_table, centre, centre_retenu in consolidation.lister_doublons()[:20]:
+        print(f"  ⚠ numéro de table {numero_table} : {centre} (déjà utilisé par {centre_retenu})")
+
+
+def bench(args):
+    benchmark.executer(args.tailles, args.dossier, args.profil, args.releves, args.version, args.resultats,
+                       args.graine)
+
+
+def analyseur():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Gestion du BFEM en ligne de commande")
+    parser.add_argument("--base", default=connexion.CHEMIN_BASE, help="base SQLite du jury (défaut : %(default)s)")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+
+    commande = commandes.add_parser("generer", help="ajoute des candidats fictifs avec leurs notes")
+    commande.add_argument("nombre", type=int)
+    commande.add_argument("--graine", type=int, default=0)
+    commande.add_argument("--prefixe", default="G", help="préfixe des numéros de table")
+    commande.set_defaults(action=generer)
+
+    commande = commandes.add_parser("anonymat", help="attribue les numéros d'anonymat manquants")
+    commande.add_argument("--largeur", type=int, help="nombre de chiffres (automatique par défaut)")
+    commande.set_defaults(action=anonymat)
+
+    commande = commandes.add_parser("deliberer", help="délibère un tour")
+    commande.add_argument("--tour", type=int, choices=(1, 2), default=1)
+    commande.add_argument("--incremental", action="store_true", help="seulement les candidats modifiés")
+    commande.set_defaults(action=deliberer)
+
+    commande = commandes.add_parser("importer-candidats", help="importe un registre CSV de candidats")
+    commande.add_argument("fichier")
+    commande.set_defaults(action=importer_candidats)
+
+    commande = commandes.add_parser("importer-notes", help="importe une feuille de notes CSV")
+    commande.add_argument("fichier")
+    commande.add_argument("--tour", type=int, choices=(1, 2), default=1)
+    commande.set_defaults(action=importer_notes)
+
+    commande = commandes.add_parser("exporter", help="génère un document PDF")
+    commande.add_argument("document", choices=("liste", "pv", "candidats", "releves"))
+    commande.add_argument("--tour", type=int, choices=(1, 2), default=1)
+    commande.add_argument("--categorie", choices=("admis", "admissibles", "ajournes"), default="admis")
+    commande.add_argument("--sortie", help="fichier (ou dossier pour --par-candidat)")
+    commande.add_argument("--jury", default="", help="jury inscrit sur le procès-verbal")
+    commande.add_argument("--par-candidat", action="store_true", help="un fichier de relevé par candidat")
+    commande.add_argument("--processus", type=int, help="processus pour --par-candidat")
+    commande.set_defaults(action=exporter)
+
+    commande = commandes.add_parser("stats", help="affiche le bilan d'un tour")
+    commande.add_argument("--tour", type=int, choices=(1, 2), default=1)
+    commande.add_argument("--critere", choices=statistiques.CRITERES)
+    commande.set_defaults(action=stats)
+
+    commande = commandes.add_parser("exporter-centre", help="exporte le paquet du centre pour la base nationale")
+    commande.add_argument("sortie")
+    commande.add_argument("--complet", action="store_true", help="tous les candidats, pas seulement les modifiés")
+    commande.add_argument("--nouveau-code", action="store_true",
+                          help="la base est copiée de celle d'un autre centre : lui attribuer son propre code")
+    commande.set_defaults(action=exporter_centre)
+
+    commande = commandes.add_parser("consolider", help="fusionne des paquets de centres dans la base (nationale)")
+    commande.add_argument("paquets", nargs="+")
+    commande.set_defaults(action=consolider)
+
+    commande = commandes.add_parser("bench", help="mesure les performances sur des bases générées")
+    commande.add_argument("--tailles", type=int, nargs="+", default=benchmark.TAILLES)
+    commande.add_argument("--dossier", help="dossier des bases générées (temporaire par défaut)")
+    commande.add_argument("--profil", metavar="DOSSIER", help="écrit un profil cProfile (.prof) par étape")
+    commande.add_argument("--releves", action="store_true", help="mesure aussi les relevés de notes")
+    commande.add_argument("--version", help="libellé de version (révision git par défaut)")
+    commande.add_argument("--resultats", default=benchmark.FICHIER_RESULTATS, help="historique des mesures")
+    commande.add_argument("--graine", type=int, default=0)
+    commande.set_defaults(action=bench)
+    return parser
+
+
+def main(argv=None):
+    args = analyseur().parse_args(argv)
+    # Le benchmark crée ses propres bases
+    if args.commande != "bench":
+        noyau.ouvrir_base(args.base)
+    try:
+        args.action(args)
+    except (ValueError, OSError, sqlite3.Error) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        noyau.fermer_connexion()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+import pytest
+
+import anonymisation
+import connexion
+import generateur
+
+
+@pytest.fixture
+def base(tmp_path, monkeypatch):
+    """Connexion du thread de test sur une base neuve et migrée, dans un dossier temporaire"""
+    monkeypatch.setattr(connexion, "CHEMIN_BASE", str(tmp_path / "bfem.db"))
+    yield connexion.get_connexion()
+    connexion.fermer_connexion()
+
+
+@pytest.fixture
+def base_generee(base):
+    """200 candidats fictifs (voir generateur), anonymisés"""
+    generateur.generer(200, graine=1)
+    anonymisation.attribuer_anonymats(base)
+    return base
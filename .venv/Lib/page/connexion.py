@@ -0,0 +1,64 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import database
+
+# Chemin de la base utilisée par l'application
+CHEMIN_BASE = "bfem.db"
+
+# Nombre de requêtes préparées gardées en cache par connexion
+TAILLE_CACHE_REQUETES = 256
+
+# Une connexion par thread : sqlite3 interdit de partager une connexion entre threads
+_local = threading.local()
+_verrou_migration = threading.Lock()
+_bases_migrees = set()
+
+
+def ouvrir_connexion(chemin=None):
+    """Ouvre une nouvelle connexion configurée (WAL, cache de requêtes) et migre le schéma si besoin"""
+    chemin = chemin or CHEMIN_BASE
+    conn = sqlite3.connect(chemin, timeout=10, cached_statements=TAILLE_CACHE_REQUETES)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+    # La migration n'est vérifiée qu'une fois par base et par processus
+    with _verrou_migration:
+        if chemin not in _bases_migrees:
+            database.migrer(conn)
+            _bases_migrees.add(chemin)
+    return conn
+
+
+def get_connexion():
+    """Retourne la connexion du thread courant (ouverte au premier appel)"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = ouvrir_connexion()
+        _local.conn = conn
+    return conn
+
+
+def fermer_connexion():
+    """Ferme la connexion du thread courant, si elle existe"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+
+@contextmanager
+def transaction():
+    """Ouvre une transaction sur la connexion du thread : commit à la fin du bloc, rollback en cas d'erreur"""
+    conn = get_connexion()
+    cursor = conn.cursor()
+    try:
+        yield cursor
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
@@ -0,0 +1,415 @@
+import os
+import sqlite3
+
+import database
+import depot
+import journal
+import statistiques
+from connexion import get_connexion
+
+# Consolidation nationale : chaque centre d'examen exporte sa base (un « paquet »), puis les
+# paquets de tous les centres sont fusionnés dans une base nationale au même schéma.
+#
+# Côté centre, le journal des modifications (journal.py) donne la version de chaque candidat.
+# La base nationale retient pour chaque centre la dernière version fusionnée : un nouvel envoi
+# ne transfère que les candidats modifiés depuis.
+#
+# Un centre est reconnu par le code tiré au premier export de sa base. Une base copiée d'un centre
+# qui a déjà exporté (au lieu d'un modèle vierge) doit recevoir un nouveau code avec
+# nouveau_code_centre(), sinon la base nationale confondrait les deux centres.
+
+# Tables de la base nationale (créées à la première fusion)
+_TABLES_NATIONALES = [
+    """
+    CREATE TABLE IF NOT EXISTS centre (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        code TEXT UNIQUE NOT NULL,
+        ia TEXT,
+        ief TEXT,
+        localite TEXT,
+        centre_examen TEXT,
+        president_jury TEXT,
+        telephone TEXT,
+        version INTEGER NOT NULL DEFAULT 0, -- dernière version du journal du centre fusionnée
+        date_fusion TEXT
+    )
+    """,
+    # Correspondance entre un candidat national et son id dans la base de son centre
+    """
+    CREATE TABLE IF NOT EXISTS candidat_origine (
+        candidat_id INTEGER PRIMARY KEY,
+        centre_id INTEGER NOT NULL,
+        origine_id INTEGER NOT NULL,
+        UNIQUE (centre_id, origine_id)
+    )
+    """,
+    # Candidats non fusionnés : leur numéro de table est déjà porté par un candidat d'un autre centre
+    """
+    CREATE TABLE IF NOT EXISTS doublon_numero_table (
+        centre_id INTEGER NOT NULL,
+        origine_id INTEGER NOT NULL,
+        numero_table TEXT NOT NULL,
+        candidat_id INTEGER NOT NULL, -- candidat national qui porte déjà ce numéro
+        PRIMARY KEY (centre_id, origine_id)
+    ) WITHOUT ROWID
+    """,
+]
+
+# Données rattachées à un candidat (hors relevé scolaire, référencé depuis candidat)
+_DEPENDANCES = ["note", "releve_notes_1er_tour", "releve_notes_2e_tour", "resultat", "resultat_2e_tour"]
+
+# Tables écrites par la fusion : leurs triggers sont suspendus le temps d'une transaction
+_TABLES_ECRITES = ["candidat", "releve_scolaire"] + _DEPENDANCES
+
+# Paquets attachés et fusionnés par transaction (SQLite limite à 10 les bases attachées)
+PAQUETS_PAR_TRANSACTION = 8
+
+# Colonnes copiées telles quelles (les id, candidat_id et matiere_id sont renumérotés)
+_COLONNES = {
+    "candidat": ["numero_table", "prenom", "nom", "date_naissance", "lieu_naissance", "sexe", "type_candidat",
+                 "etablissement", "nationalite", "etat_sportif"],
+    "releve_scolaire": ["moyenne_6e", "moyenne_5e", "moyenne_4e", "moyenne_3e", "moyenne_generale",
+                        "nombre_de_fois"],
+    "note": ["note_premier_tour", "note_deuxieme_tour"],
+    "releve_notes_1er_tour": ["note", "points"],
+    "releve_notes_2e_tour": ["note", "points"],
+    "resultat": ["total_points", "moyenne", "repechable", "presentation"],
+    "resultat_2e_tour": ["total_points", "moyenne", "repechable", "presentation"],
+}
+
+
+# ======================= EXPORT D'UN CENTRE ======================== #
+
+def derniere_exportation():
+    """Version du journal jusqu'à laquelle le dernier paquet a été exporté (0 si jamais)"""
+    return get_connexion().execute("SELECT version_exportee FROM identite_centre").fetchone()[0] or 0
+
+
+def nouveau_code_centre():
+    """Tire un nouveau code pour la base courante (copie de la base d'un autre centre) ;
+    le journal repart de zéro côté national, le prochain paquet doit donc être complet"""
+    conn = get_connexion()
+    with conn:
+        conn.execute("UPDATE identite_centre SET code = lower(hex(randomblob(16))), version_exportee = 0")
+
+
+def exporter_centre(chemin, depuis=0):
+    """Écrit dans `chemin` le paquet du centre : une copie de la base réduite aux candidats modifiés
+    après la version `depuis` (0 = tous). Retourne la version du journal incluse dans le paquet.
+
+    Le paquet ne contient ni triggers ni comptes des membres du jury (mots de passe).
+    """
+    conn = get_connexion()
+    with conn:
+        conn.execute("UPDATE identite_centre SET code = lower(hex(randomblob(16))) WHERE code IS NULL")
+    if os.path.exists(chemin):
+        os.remove(chemin)
+
+    # Instantané cohérent de la base, même si l'application écrit pendant l'export
+    conn.execute("VACUUM INTO ?", (chemin,))
+
+    paquet = sqlite3.connect(chemin)
+    try:
+        cursor = paquet.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        for (nom,) in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall():
+            cursor.execute(f"DROP TRIGGER {nom}")
+        cursor.execute("DELETE FROM membre_jury")
+
+        version = journal.version(paquet)
+        if depuis:
+            # Les candidats inchangés et leurs données ne voyagent pas
+            cursor.execute("DELETE FROM journal_candidat WHERE version <= ?", (depuis,))
+            inchanges = "SELECT id FROM candidat WHERE id NOT IN (SELECT candidat_id FROM journal_candidat)"
+            cursor.execute(f"DELETE FROM releve_scolaire WHERE id IN (SELECT releve_scolaire_id FROM candidat "
+                           f"WHERE id IN ({inchanges}))")
+            for table in _DEPENDANCES:
+                cursor.execute(f"DELETE FROM {table} WHERE candidat_id IN ({inchanges})")
+            cursor.execute(f"DELETE FROM candidat WHERE id IN ({inchanges})")
+
+        cursor.execute("CREATE TABLE paquet (depuis INTEGER NOT NULL, version INTEGER NOT NULL)")
+        cursor.execute("INSERT INTO paquet (depuis, version) VALUES (?, ?)", (depuis, version))
+        paquet.commit()
+        paquet.execute("VACUUM")
+    finally:
+        paquet.close()
+
+    with conn:
+        conn.execute("UPDATE identite_centre SET version_exportee = ?", (version,))
+    return version
+
+
+# ======================= FUSION (CÔTÉ NATIONAL) ======================== #
+
+def _preparer_base_nationale(cursor):
+    for instruction in _TABLES_NATIONALES:
+        cursor.execute(instruction)
+
+
+def _migrer_paquet(chemin):
+    """Met un paquet d'une version antérieure de l'application au schéma courant"""
+    if not os.path.exists(chemin):
+        raise FileNotFoundError(f"Paquet introuvable : {chemin}")
+    paquet = sqlite3.connect(chemin)
+    try:
+        if paquet.execute("PRAGMA user_version").fetchone()[0] < len(database.MIGRATIONS):
+            database.migrer(paquet)
+    finally:
+        paquet.close()
+
+
+def _colonnes(table, prefixe=""):
+    return ", ".join(prefixe + colonne for colonne in _COLONNES[table])
+
+
+def _fusionner_centre(cursor, schema):
+    """Fusionne le paquet attaché sous le nom `schema` (dans la transaction en cours, triggers de la
+    base nationale suspendus : les statistiques sont ajustées en bloc).
+
+    Retourne (centre_examen, candidats transférés, candidats supprimés, doublons).
+    """
+    # Centre : identifié par le code de sa base, décrit par son (premier) jury
+    if cursor.execute(f"SELECT code FROM {schema}.identite_centre").fetchone()[0] is None:
+        raise ValueError("Paquet sans code de centre (base jamais exportée) : exporter à nouveau le centre")
+    cursor.execute(f"""
+        INSERT INTO centre (code) SELECT code FROM {schema}.identite_centre
+        WHERE NOT EXISTS (SELECT 1 FROM centre WHERE code = (SELECT code FROM {schema}.identite_centre))
+    """)
+    cursor.execute(f"""
+        SELECT c.id, c.version, j.ia, j.ief, j.localite, j.centre_examen, j.president_jury, j.telephone
+        FROM centre c
+        LEFT JOIN (SELECT * FROM {schema}.jury ORDER BY id LIMIT 1) j ON 1
+        WHERE c.code = (SELECT code FROM {schema}.identite_centre)
+    """)
+    centre_id, version_connue, *jury = cursor.fetchone()
+    cursor.execute("UPDATE centre SET ia = ?, ief = ?, localite = ?, centre_examen = ?, president_jury = ?, "
+                   "telephone = ? WHERE id = ?", (*jury, centre_id))
+
+    depuis, version = 0, None
+    cursor.execute(f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = 'paquet'")
+    if cursor.fetchone():
+        depuis, version = cursor.execute(f"SELECT depuis, version FROM {schema}.paquet").fetchone()
+    if depuis > version_connue:
+        raise ValueError(f"Paquet incrémental depuis la version {depuis}, mais seule la version {version_connue} "
+                         f"a été fusionnée : un paquet intermédiaire manque (exporter un paquet complet)")
+    if version is None:
+        version = journal.version(cursor, schema)
+
+    # Matières : rapprochées par leur nom (unique), créées si le centre en a de nouvelles
+    cursor.execute(f"""
+        INSERT INTO matiere (nom, coefficient, tour, facultative, active)
+        SELECT nom, coefficient, tour, facultative, active FROM {schema}.matiere
+        WHERE nom NOT IN (SELECT nom FROM matiere)
+    """)
+    cursor.execute("DROP TABLE IF EXISTS temp.fusion_matiere")
+    cursor.execute(f"""
+        CREATE TEMP TABLE fusion_matiere AS
+        SELECT p.id AS origine_id, m.id AS matiere_id FROM {schema}.matiere p JOIN main.matiere m ON m.nom = p.nom
+    """)
+
+    # Candidats à reprendre : modifiés depuis le dernier envoi, ou en doublon lors d'un envoi précédent
+    cursor.execute("DROP TABLE IF EXISTS temp.fusion")
+    cursor.execute("""
+        CREATE TEMP TABLE fusion (
+            origine_id INTEGER PRIMARY KEY,
+            ancien_id INTEGER,        -- id national actuel (NULL pour un nouveau candidat)
+            candidat_id INTEGER,      -- id national après fusion
+            releve_origine INTEGER,
+            releve_id INTEGER,
+            numero_table TEXT,        -- NULL : le candidat a été supprimé au centre
+            transfere INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute(f"""
+        INSERT INTO temp.fusion (origine_id, ancien_id, releve_origine, numero_table)
+        SELECT j.candidat_id, o.candidat_id, c.releve_scolaire_id, c.numero_table
+        FROM {schema}.journal_candidat j
+        LEFT JOIN {schema}.candidat c ON c.id = j.candidat_id
+        LEFT JOIN main.candidat_origine o ON o.centre_id = :centre AND o.origine_id = j.candidat_id
+        WHERE j.version > :version
+           OR j.candidat_id IN (SELECT origine_id FROM main.doublon_numero_table WHERE centre_id = :centre)
+    """, {"centre": centre_id, "version": version_connue})
+
+    # 1. L'ancienne version nationale de ces candidats est retirée, avec sa part des statistiques
+    anciens = "SELECT ancien_id FROM temp.fusion WHERE ancien_id IS NOT NULL"
+    statistiques.ajuster(cursor, anciens, -1)
+    for table in _DEPENDANCES:
+        cursor.execute(f"DELETE FROM main.{table} WHERE candidat_id IN ({anciens})")
+    cursor.execute(f"DELETE FROM main.releve_scolaire WHERE id IN "
+                   f"(SELECT releve_scolaire_id FROM main.candidat WHERE id IN ({anciens}))")
+    cursor.execute(f"DELETE FROM main.candidat WHERE id IN ({anciens})")
+    cursor.execute(f"DELETE FROM main.candidat_origine WHERE candidat_id IN ({anciens})")
+    cursor.execute("DELETE FROM main.doublon_numero_table WHERE centre_id = ? "
+                   "AND origine_id IN (SELECT origine_id FROM temp.fusion)", (centre_id,))
+    supprimes = cursor.execute("SELECT COUNT(*) FROM temp.fusion WHERE numero_table IS NULL "
+                               "AND ancien_id IS NOT NULL").fetchone()[0]
+
+    # 2. Doublons : numéro de table déjà porté par un candidat d'un autre centre
+    cursor.execute("""
+        INSERT INTO main.doublon_numero_table (centre_id, origine_id, numero_table, candidat_id)
+        SELECT ?, f.origine_id, f.numero_table, n.id
+        FROM temp.fusion f JOIN main.candidat n ON n.numero_table = f.numero_table
+    """, (centre_id,))
+    doublons = cursor.rowcount
+    cursor.execute("""
+        UPDATE temp.fusion SET transfere = 1
+        WHERE numero_table IS NOT NULL
+          AND origine_id NOT IN (SELECT origine_id FROM main.doublon_numero_table WHERE centre_id = ?)
+    """, (centre_id,))
+    transferes = cursor.rowcount
+
+    # 3. Relevés scolaires : insérés dans l'ordre des candidats, leurs id sont donc consécutifs
+    premier_releve = depot.prochain_id(cursor, "releve_scolaire")
+    avec_releve = f"""
+        FROM temp.fusion f JOIN {schema}.releve_scolaire r ON r.id = f.releve_origine
+        WHERE f.transfere
+    """
+    cursor.execute(f"INSERT INTO main.releve_scolaire ({_colonnes('releve_scolaire')}) "
+                   f"SELECT {_colonnes('releve_scolaire', 'r.')} {avec_releve} ORDER BY f.origine_id")
+    nombre_releves = cursor.rowcount
+    if depot.prochain_id(cursor, "releve_scolaire") != premier_releve + max(nombre_releves, 0):
+        raise sqlite3.IntegrityError("Identifiants de relevés non consécutifs")
+    cursor.execute(f"""
+        UPDATE temp.fusion SET releve_id = ? - 1 + rangs.rang
+        FROM (SELECT f.origine_id, ROW_NUMBER() OVER (ORDER BY f.origine_id) AS rang {avec_releve}) AS rangs
+        WHERE fusion.origine_id = rangs.origine_id
+    """, (premier_releve,))
+
+    # 4. Candidats : un candidat déjà connu garde son id national, les nouveaux en reçoivent un.
+    #    Les anonymats, tirés indépendamment par chaque centre, ne sont pas repris.
+    cursor.execute(f"""
+        INSERT INTO main.candidat (id, {_colonnes('candidat')}, anonymat, releve_scolaire_id)
+        SELECT f.ancien_id, {_colonnes('candidat', 'c.')}, 0, f.releve_id
+        FROM temp.fusion f JOIN {schema}.candidat c ON c.id = f.origine_id
+        WHERE f.transfere
+        ORDER BY f.origine_id
+    """)
+    cursor.execute("""
+        UPDATE temp.fusion SET candidat_id = n.id
+        FROM main.candidat n WHERE n.numero_table = fusion.numero_table AND fusion.transfere
+    """)
+    cursor.execute("""
+        INSERT INTO main.candidat_origine (candidat_id, centre_id, origine_id)
+        SELECT candidat_id, ?, origine_id FROM temp.fusion WHERE transfere
+    """, (centre_id,))
+
+    # 5. Notes, relevés de notes et résultats, avec les id nationaux du candidat et de la matière
+    for table in _DEPENDANCES:
+        if table.startswith("resultat"):
+            cursor.execute(f"""
+                INSERT INTO main.{table} ({_colonnes(table)}, candidat_id)
+                SELECT {_colonnes(table, 'd.')}, f.candidat_id
+                FROM temp.fusion f JOIN {schema}.{table} d ON d.candidat_id = f.origine_id
+                WHERE f.transfere
+            """)
+        else:
+            cursor.execute(f"""
+                INSERT INTO main.{table} ({_colonnes(table)}, matiere_id, candidat_id)
+                SELECT {_colonnes(table, 'd.')}, m.matiere_id, f.candidat_id
+                FROM temp.fusion f
+                JOIN {schema}.{table} d ON d.candidat_id = f.origine_id
+                JOIN temp.fusion_matiere m ON m.origine_id = d.matiere_id
+                WHERE f.transfere
+            """)
+
+    # Les résultats viennent de la délibération du centre : rien à recalculer au niveau national,
+    # les statistiques reçoivent seulement la part des candidats transférés
+    statistiques.ajuster(cursor, "SELECT candidat_id FROM temp.fusion WHERE transfere", 1)
+
+    cursor.execute("UPDATE centre SET version = MAX(version, ?), date_fusion = datetime('now', 'localtime') "
+                   "WHERE id = ?", (version, centre_id))
+    return jury[3] or "", transferes, supprimes, doublons
+
+
+def _suspendre_triggers(cursor):
+    """Supprime (dans la transaction en cours) les triggers des tables écrites par la fusion ;
+    retourne leur SQL pour les recréer"""
+    tables = ", ".join(f"'{table}'" for table in _TABLES_ECRITES)
+    triggers = cursor.execute(f"SELECT name, sql FROM main.sqlite_master "
+                              f"WHERE type = 'trigger' AND tbl_name IN ({tables})").fetchall()
+    for nom, _ in triggers:
+        cursor.execute(f"DROP TRIGGER main.{nom}")
+    return [sql for _, sql in triggers]
+
+
+def fusionner(chemins, progression=None):
+    """Fusionne des paquets de centres dans la base courante (la base nationale).
+
+    Les paquets sont attachés par groupes de PAQUETS_PAR_TRANSACTION, fusionnés en une transaction
+    (un point de sauvegarde par paquet : un paquet invalide est signalé sans interrompre les autres).
+    Les triggers ligne à ligne (statistiques, suivi de la délibération, journal) sont suspendus
+    pendant la transaction. Retourne (bilans, erreurs) avec bilans = [(chemin, centre, transférés,
+    supprimés, doublons)] et erreurs = [(chemin, message)].
+    """
+    conn = get_connexion()
+    cursor = conn.cursor()
+    _preparer_base_nationale(cursor)
+    conn.commit()
+
+    bilans = []
+    erreurs = []
+    for debut in range(0, len(chemins), PAQUETS_PAR_TRANSACTION):
+        attaches = []
+        for chemin in chemins[debut:debut + PAQUETS_PAR_TRANSACTION]:
+            schema = f"paquet{len(attaches)}"
+            try:
+                _migrer_paquet(chemin)
+                cursor.execute(f"ATTACH DATABASE ? AS {schema}", (chemin,))
+                attaches.append((chemin, schema))
+            except (OSError, sqlite3.Error) as e:
+                erreurs.append((chemin, str(e)))
+
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            triggers = _suspendre_triggers(cursor)
+            for chemin, schema in attaches:
+                cursor.execute("SAVEPOINT paquet")
+                try:
+                    bilans.append((chemin, *_fusionner_centre(cursor, schema)))
+                except (sqlite3.Error, ValueError) as e:
+                    cursor.execute("ROLLBACK TO paquet")
+                    erreurs.append((chemin, str(e)))
+                cursor.execute("RELEASE paquet")
+            for instruction in triggers:
+                cursor.execute(instruction)
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        finally:
+            # DETACH est refusé tant qu'une transaction est ouverte
+            for _, schema in attaches:
+                cursor.execute(f"DETACH DATABASE {schema}")
+
+        if progression:
+            progression(min(debut + PAQUETS_PAR_TRANSACTION, len(chemins)), len(chemins))
+
+    cursor.execute("DROP TABLE IF EXISTS temp.fusion")
+    cursor.execute("DROP TABLE IF EXISTS temp.fusion_matiere")
+    return bilans, erreurs
+
+
+# ======================= CONSULTATION ======================== #
+
+def lister_centres():
+    """Centres fusionnés : (centre_examen, localite, candidats, doublons, version, date de fusion)"""
+    return get_connexion().execute("""
+        SELECT c.centre_examen, c.localite,
+               (SELECT COUNT(*) FROM candidat_origine o WHERE o.centre_id = c.id),
+               (SELECT COUNT(*) FROM doublon_numero_table d WHERE d.centre_id = c.id),
+               c.version, c.date_fusion
+        FROM centre c
+        ORDER BY c.centre_examen
+    """).fetchall()
+
+
+def lister_doublons():
+    """Doublons de numéro de table : (numero_table, centre du candidat écarté, centre du candidat retenu)"""
+    return get_connexion().execute("""
+        SELECT d.numero_table, c.centre_examen, COALESCE(r.centre_examen, '')
+        FROM doublon_numero_table d
+        JOIN centre c ON c.id = d.centre_id
+        LEFT JOIN candidat_origine o ON o.candidat_id = d.candidat_id
+        LEFT JOIN centre r ON r.id = o.centre_id
+        ORDER BY d.numero_table
+    """).fetchall()
@@ -0,0 +1,270 @@
+import sqlite3
+
+import journal
+import statistiques
+from deliberation import installer_suivi
+
+
+def creer_tables(cursor):
+    """Crée les tables de la base BFEM si elles n'existent pas encore"""
+    # ======================= TABLES EXISTANTES ======================== #
+
+    # Table candidat
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS candidat (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        numero_table TEXT UNIQUE NOT NULL,
+        prenom TEXT NOT NULL,
+        nom TEXT NOT NULL,
+        date_naissance TEXT NOT NULL,
+        lieu_naissance TEXT NOT NULL,
+        sexe TEXT CHECK (sexe IN ('M', 'F')) NOT NULL,
+        type_candidat TEXT NOT NULL,
+        etablissement TEXT NOT NULL,
+        nationalite TEXT NOT NULL,
+        etat_sportif TEXT NOT NULL,
+        anonymat INTEGER DEFAULT 0,
+        note_id INTEGER,
+        releve_scolaire_id INTEGER,
+        FOREIGN KEY (note_id) REFERENCES note(id) ON DELETE SET NULL,
+        FOREIGN KEY (releve_scolaire_id) REFERENCES releve_scolaire(id) ON DELETE SET NULL
+    )
+    """)
+
+    # Table matiere
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS matiere (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nom TEXT UNIQUE NOT NULL,
+        coefficient INTEGER NOT NULL CHECK (coefficient > 0),
+        tour INTEGER CHECK (tour IN (1, 2)) NOT NULL, -- 1 = Premier tour, 2 = Deuxième tour
+        facultative INTEGER DEFAULT 0 CHECK (facultative IN (0, 1)), -- 0 = Obligatoire, 1 = Facultative
+        active INTEGER DEFAULT 1 CHECK (active IN (0, 1))
+    );
+    """)
+
+    # Table note
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS note (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        note_premier_tour REAL CHECK (note_premier_tour BETWEEN 0 AND 20),
+        note_deuxieme_tour REAL CHECK (note_deuxieme_tour BETWEEN 0 AND 20),
+        matiere_id INTEGER NOT NULL,
+        candidat_id INTEGER NOT NULL,
+        FOREIGN KEY (matiere_id) REFERENCES matiere(id) ON DELETE CASCADE,
+        FOREIGN KEY (candidat_id) REFERENCES candidat(id) ON DELETE CASCADE
+    )
+    """)
+
+    # Table relevé scolaire
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS releve_scolaire (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        moyenne_6e REAL CHECK (moyenne_6e BETWEEN 0 AND 20),
+        moyenne_5e REAL CHECK (moyenne_5e BETWEEN 0 AND 20),
+        moyenne_4e REAL CHECK (moyenne_4e BETWEEN 0 AND 20),
+        moyenne_3e REAL CHECK (moyenne_3e BETWEEN 0 AND 20),
+        moyenne_generale REAL CHECK (moyenne_generale BETWEEN 0 AND 20),
+        nombre_de_fois INTEGER CHECK (nombre_de_fois >= 0)
+    )
+    """)
+
+    # Table résultat (1er tour)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS resultat (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        total_points REAL CHECK (total_points >= 0),
+        moyenne REAL CHECK (moyenne BETWEEN 0 AND 20),
+        repechable INTEGER DEFAULT 0 CHECK (repechable IN (0, 1)),
+        presentation TEXT,
+        candidat_id INTEGER NOT NULL,
+        FOREIGN KEY (candidat_id) REFERENCES candidat(id) ON DELETE CASCADE
+    )
+    """)
+
+    # Table jury
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS jury (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ia TEXT NOT NULL,
+        ief TEXT NOT NULL,
+        localite TEXT NOT NULL,
+        centre_examen TEXT NOT NULL,
+        president_jury TEXT NOT NULL,
+        telephone TEXT NOT NULL
+    )
+    """)
+
+    # Table membre_jury
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS membre_jury (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nom TEXT NOT NULL,
+        prenom TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        mot_de_passe TEXT NOT NULL,
+        jury_id INTEGER NOT NULL,
+        FOREIGN KEY (jury_id) REFERENCES jury(id) ON DELETE CASCADE
+    )
+    """)
+
+    # ======================= NOUVELLES TABLES ======================== #
+
+    # Table résultat (2ᵉ tour)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS resultat_2e_tour (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        total_points REAL CHECK (total_points >= 0),
+        moyenne REAL CHECK (moyenne BETWEEN 0 AND 20),
+        repechable INTEGER DEFAULT 0 CHECK (repechable IN (0, 1)),
+        presentation TEXT,
+        candidat_id INTEGER NOT NULL,
+        FOREIGN KEY (candidat_id) REFERENCES candidat(id) ON DELETE CASCADE
+    )
+    """)
+
+    # Table relevé de notes 1er tour
+    cursor.execute("""
+CREATE TABLE IF NOT EXISTS releve_notes_1er_tour (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    candidat_id INTEGER NOT NULL,
+    matiere_id INTEGER NOT NULL,
+    note REAL CHECK (note BETWEEN 0 AND 20),
+    points REAL CHECK (points >= 0),
+    FOREIGN KEY (candidat_id) REFERENCES candidat(id) ON DELETE CASCADE,
+    FOREIGN KEY (matiere_id) REFERENCES matiere(id) ON DELETE CASCADE,
+    UNIQUE(candidat_id, matiere_id)  -- 🔹 Ajout de la contrainte UNIQUE
+);
+
+    """)
+
+    # Table relevé de notes 2e tour
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS releve_notes_2e_tour (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        candidat_id INTEGER NOT NULL,
+        matiere_id INTEGER NOT NULL,
+        note REAL CHECK (note BETWEEN 0 AND 20),
+        points REAL CHECK (points >= 0),  -- Suppression de GENERATED ALWAYS AS
+        FOREIGN KEY (candidat_id) REFERENCES candidat(id) ON DELETE CASCADE,
+        FOREIGN KEY (matiere_id) REFERENCES matiere(id) ON DELETE CASCADE
+        UNIQUE(candidat_id, matiere_id)  -- 🔹 Ajout de la contrainte UNIQUE
+    )
+    """)
+
+
+def _migration_index(cursor):
+    """Version 2 : index sur les colonnes filtrées par les écrans et unicité des lignes par candidat"""
+    # Doublons éventuels hérités des anciennes versions : on garde la ligne la plus récente
+    cursor.execute("""
+        DELETE FROM note WHERE id NOT IN (SELECT MAX(id) FROM note GROUP BY candidat_id, matiere_id)
+    """)
+    cursor.execute("""
+        DELETE FROM resultat WHERE id NOT IN (SELECT MAX(id) FROM resultat GROUP BY candidat_id)
+    """)
+    cursor.execute("""
+        DELETE FROM resultat_2e_tour WHERE id NOT IN (SELECT MAX(id) FROM resultat_2e_tour GROUP BY candidat_id)
+    """)
+
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_note_candidat_matiere ON note (candidat_id, matiere_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_note_matiere ON note (matiere_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_candidat_anonymat ON candidat (anonymat)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matiere_tour ON matiere (tour)")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_resultat_candidat ON resultat (candidat_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_resultat_presentation ON resultat (presentation)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_resultat_points ON resultat (total_points)")
+    cursor.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_resultat_2e_tour_candidat ON resultat_2e_tour (candidat_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_resultat_2e_tour_presentation ON resultat_2e_tour (presentation)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_resultat_2e_tour_points ON resultat_2e_tour (total_points)")
+
+
+def _migration_anonymat_unique(cursor):
+    """Version 3 : unicité des numéros d'anonymat attribués (0 ou NULL = pas encore attribué)"""
+    # Les doublons existants sont remis à 0 pour être réattribués par le générateur
+    cursor.execute("""
+        UPDATE candidat SET anonymat = 0
+        WHERE anonymat IS NOT NULL AND anonymat <> 0
+          AND id NOT IN (SELECT MIN(id) FROM candidat WHERE anonymat IS NOT NULL AND anonymat <> 0
+                         GROUP BY anonymat)
+    """)
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_candidat_anonymat_unique ON candidat (anonymat)
+        WHERE anonymat IS NOT NULL AND anonymat <> 0
+    """)
+
+
+def _migration_triggers_suivi(cursor):
+    """Version 4 : supprime les anciens triggers de suivi, recréés par installer_suivi (compatibles UPSERT)"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'suivi\\_%' ESCAPE '\\'")
+    for (nom,) in cursor.fetchall():
+        cursor.execute(f"DROP TRIGGER IF EXISTS {nom}")
+
+
+def _migration_statistiques(cursor):
+    """Version 5 : tables de synthèse des statistiques, tenues à jour par triggers"""
+    statistiques.installer(cursor)
+
+
+def _migration_journal(cursor):
+    """Version 6 : identité du centre et journal des candidats modifiés (consolidation nationale)"""
+    journal.installer(cursor)
+
+
+def _migration_index_membre_jury(cursor):
+    """Version 7 : retire l'index (email, mot_de_passe) posé par la version 2.
+
+    email est déjà UNIQUE, et l'index gardait une seconde copie des mots de passe.
+    """
+    cursor.execute("DROP INDEX IF EXISTS idx_membre_jury_email")
+
+
+# Migrations successives : la version courante est stockée dans PRAGMA user_version
+MIGRATIONS = [
+    creer_tables,
+    _migration_index,
+    _migration_anonymat_unique,
+    _migration_triggers_suivi,
+    _migration_statistiques,
+    _migration_journal,
+    _migration_index_membre_jury,
+]
+
+
+def migrer(conn):
+    """Met à jour le schéma d'une base existante jusqu'à la dernière version connue"""
+    cursor = conn.cursor()
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
+
+    for numero, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        try:
+            # sqlite3 n'ouvre pas de transaction avant un CREATE ou un DROP : sans BEGIN explicite,
+            # une migration interrompue laisserait la moitié de ses changements
+            cursor.execute("BEGIN IMMEDIATE")
+            migration(cursor)
+            # PRAGMA n'accepte pas de paramètre lié
+            cursor.execute(f"PRAGMA user_version = {numero}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+    # Suivi des notes modifiées pour la délibération incrémentale
+    installer_suivi(conn)
+    return len(MIGRATIONS)
+
+
+if __name__ == "__main__":
+    # Connexion à la base de données SQLite
+    conn = sqlite3.connect("bfem.db")
+
+    try:
+        version = migrer(conn)
+        print(f"✅ Base de données à jour (schéma version {version}) ! 🚀")
+
+    except sqlite3.Error as e:
+        print(f"❌ Erreur lors de la création des tables : {e}")
+
+    finally:
+        # Fermeture de la connexion
+        conn.close()
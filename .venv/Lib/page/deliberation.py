@@ -0,0 +1,251 @@
+# Seuils de délibération (en points)
+SEUIL_ADMIS = 180
+SEUIL_ADMISSIBLE = 153
+
+# Fourchettes de repêchage (RM7, RM8) et moyenne de repêchage (RM9)
+REPECHAGE_ADMIS = (171, 180)
+REPECHAGE_ADMISSIBLE = (144, 153)
+MOYENNE_REPECHAGE = 12
+
+# Matières soumises aux règles RM2 (EPS) et RM3 (épreuve facultative)
+MATIERE_EPS = "EPS"
+MATIERE_FACULTATIVE = "Facultatif"
+
+# Agrégat commun aux deux tours : points pondérés + bonus/malus EPS + bonus facultatif
+_AGREGAT = """
+    COALESCE(SUM({note} * m.coefficient), 0)
+    + COALESCE(SUM(CASE WHEN m.nom = :eps THEN {note} - 10 END), 0)
+    + COALESCE(SUM(CASE WHEN m.nom = :facultatif AND {note} > 10 THEN {note} - 10 END), 0),
+    COALESCE(SUM(m.coefficient), 0)
+"""
+
+# Description des deux tours : d'où viennent les notes et où vont les résultats
+TOURS = {
+    1: {
+        "resultat": "resultat",
+        "requete": """
+            SELECT c.id, """ + _AGREGAT.format(note="r.note") + """
+            FROM candidat c
+            LEFT JOIN releve_notes_1er_tour r ON r.candidat_id = c.id
+            LEFT JOIN matiere m ON m.id = r.matiere_id
+            {filtre}
+            GROUP BY c.id
+        """,
+        "filtre": "WHERE c.id IN (SELECT candidat_id FROM deliberation_en_attente WHERE tour = 1)",
+    },
+    2: {
+        "resultat": "resultat_2e_tour",
+        "requete": """
+            SELECT n.candidat_id, """ + _AGREGAT.format(note="n.note_deuxieme_tour") + """
+            FROM note n
+            JOIN matiere m ON n.matiere_id = m.id
+            WHERE m.tour = 2 {filtre}
+            GROUP BY n.candidat_id
+        """,
+        "filtre": "AND n.candidat_id IN (SELECT candidat_id FROM deliberation_en_attente WHERE tour = 2)",
+    },
+}
+
+# Suivi des candidats dont les notes ont changé depuis la dernière délibération.
+# Les triggers testent NOT EXISTS au lieu d'un INSERT OR IGNORE : déclenchés par un UPSERT
+# (INSERT ... ON CONFLICT DO UPDATE), ils héritent de sa politique de conflit et l'IGNORE serait perdu.
+_SUIVI = [
+    """
+    CREATE TABLE IF NOT EXISTS deliberation_en_attente (
+        candidat_id INTEGER NOT NULL,
+        tour INTEGER NOT NULL CHECK (tour IN (1, 2)),
+        PRIMARY KEY (candidat_id, tour)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS suivi_releve_1er_tour_insert AFTER INSERT ON releve_notes_1er_tour
+    BEGIN
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT NEW.candidat_id, 1
+        WHERE NOT EXISTS (SELECT 1 FROM deliberation_en_attente
+                          WHERE candidat_id = NEW.candidat_id AND tour = 1);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS suivi_releve_1er_tour_update AFTER UPDATE ON releve_notes_1er_tour
+    BEGIN
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT NEW.candidat_id, 1
+        WHERE NOT EXISTS (SELECT 1 FROM deliberation_en_attente
+                          WHERE candidat_id = NEW.candidat_id AND tour = 1);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS suivi_releve_1er_tour_delete AFTER DELETE ON releve_notes_1er_tour
+    BEGIN
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT OLD.candidat_id, 1
+        WHERE NOT EXISTS (SELECT 1 FROM deliberation_en_attente
+                          WHERE candidat_id = OLD.candidat_id AND tour = 1);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS suivi_releve_2e_tour_insert AFTER INSERT ON releve_notes_2e_tour
+    BEGIN
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT NEW.candidat_id, 2
+        WHERE NOT EXISTS (SELECT 1 FROM deliberation_en_attente
+                          WHERE candidat_id = NEW.candidat_id AND tour = 2);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS suivi_releve_2e_tour_update AFTER UPDATE ON releve_notes_2e_tour
+    BEGIN
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT NEW.candidat_id, 2
+        WHERE NOT EXISTS (SELECT 1 FROM deliberation_en_attente
+                          WHERE candidat_id = NEW.candidat_id AND tour = 2);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS suivi_releve_2e_tour_delete AFTER DELETE ON releve_notes_2e_tour
+    BEGIN
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT OLD.candidat_id, 2
+        WHERE NOT EXISTS (SELECT 1 FROM deliberation_en_attente
+                          WHERE candidat_id = OLD.candidat_id AND tour = 2);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS suivi_note_insert AFTER INSERT ON note
+    BEGIN
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT NEW.candidat_id, 1
+        WHERE NOT EXISTS (SELECT 1 FROM deliberation_en_attente
+                          WHERE candidat_id = NEW.candidat_id AND tour = 1);
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT NEW.candidat_id, 2
+        WHERE NOT EXISTS (SELECT 1 FROM deliberation_en_attente
+                          WHERE candidat_id = NEW.candidat_id AND tour = 2);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS suivi_note_update AFTER UPDATE ON note
+    BEGIN
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT NEW.candidat_id, 1
+        WHERE NOT EXISTS (SELECT 1 FROM deliberation_en_attente
+                          WHERE candidat_id = NEW.candidat_id AND tour = 1);
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT NEW.candidat_id, 2
+        WHERE NOT EXISTS (SELECT 1 FROM deliberation_en_attente
+                          WHERE candidat_id = NEW.candidat_id AND tour = 2);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS suivi_note_delete AFTER DELETE ON note
+    BEGIN
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT OLD.candidat_id, 1
+        WHERE NOT EXISTS (SELECT 1 FROM deliberation_en_attente
+                          WHERE candidat_id = OLD.candidat_id AND tour = 1);
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT OLD.candidat_id, 2
+        WHERE NOT EXISTS (SELECT 1 FROM deliberation_en_attente
+                          WHERE candidat_id = OLD.candidat_id AND tour = 2);
+    END
+    """,
+    # Un changement de coefficient ou de matière touche tous les candidats
+    """
+    CREATE TRIGGER IF NOT EXISTS suivi_matiere_update AFTER UPDATE OF nom, coefficient, tour ON matiere
+    BEGIN
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT id, 1 FROM candidat
+        WHERE id NOT IN (SELECT candidat_id FROM deliberation_en_attente WHERE tour = 1);
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT id, 2 FROM candidat
+        WHERE id NOT IN (SELECT candidat_id FROM deliberation_en_attente WHERE tour = 2);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS suivi_matiere_delete AFTER DELETE ON matiere
+    BEGIN
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT id, 1 FROM candidat
+        WHERE id NOT IN (SELECT candidat_id FROM deliberation_en_attente WHERE tour = 1);
+        INSERT INTO deliberation_en_attente (candidat_id, tour) SELECT id, 2 FROM candidat
+        WHERE id NOT IN (SELECT candidat_id FROM deliberation_en_attente WHERE tour = 2);
+    END
+    """,
+]
+
+
+def installer_suivi(conn):
+    """Crée la table de suivi et ses triggers (sans effet s'ils existent déjà)"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'deliberation_en_attente'")
+    premiere_installation = cursor.fetchone() is None
+
+    for instruction in _SUIVI:
+        cursor.execute(instruction)
+
+    # Base existante : on ne sait pas ce qui a changé, tout le monde sera délibéré une fois
+    if premiere_installation:
+        cursor.execute("INSERT OR IGNORE INTO deliberation_en_attente (candidat_id, tour) SELECT id, 1 FROM candidat")
+        cursor.execute("INSERT OR IGNORE INTO deliberation_en_attente (candidat_id, tour) SELECT id, 2 FROM candidat")
+    conn.commit()
+
+
+def calculer_resultat(total_points, total_coefficients):
+    """Applique les seuils et les règles de repêchage : retourne (moyenne, repechable, presentation)"""
+    moyenne = total_points / total_coefficients if total_coefficients > 0 else 0
+    moyenne = max(0, min(moyenne, 20))
+
+    if total_points >= SEUIL_ADMIS:
+        presentation = "Admis d'office"
+    elif total_points >= SEUIL_ADMISSIBLE:
+        presentation = 'Admissible'
+    else:
+        presentation = 'Ajourné'
+
+    # Règles de repêchage RM7, RM8, RM9
+    repechable = 0
+    if REPECHAGE_ADMIS[0] <= total_points < REPECHAGE_ADMIS[1]:
+        repechable = 1
+    elif REPECHAGE_ADMISSIBLE[0] <= total_points < REPECHAGE_ADMISSIBLE[1]:
+        repechable = 1
+    if moyenne >= MOYENNE_REPECHAGE:
+        repechable = 1
+
+    return moyenne, repechable, presentation
+
+
+def deliberer(conn, tour=1, incremental=False, progression=None):
+    """Délibère un tour en une seule passe d'agrégation et une seule transaction d'écriture.
+
+    En mode incrémental, seuls les candidats dont les notes ont changé depuis la dernière
+    délibération sont recalculés. progression(étape, 3) est appelée entre les étapes (calcul,
+    décisions, écriture) ; une exception qu'elle lève annule tout. Retourne le nombre de
+    candidats délibérés.
+    """
+    if tour not in TOURS:
+        raise ValueError(f"Tour inconnu : {tour}")
+    config = TOURS[tour]
+
+    installer_suivi(conn)
+    cursor = conn.cursor()
+
+    try:
+        # Verrou pris avant la lecture : aucune note ne peut changer entre le calcul et l'écriture
+        cursor.execute("BEGIN IMMEDIATE")
+
+        # Une seule requête agrégée pour tous les candidats concernés
+        requete = config["requete"].format(filtre=config["filtre"] if incremental else "")
+        cursor.execute(requete, {"eps": MATIERE_EPS, "facultatif": MATIERE_FACULTATIVE})
+        lignes = cursor.fetchall()
+        if progression:
+            progression(1, 3)
+
+        resultats = []
+        for candidat_id, total_points, total_coefficients in lignes:
+            moyenne, repechable, presentation = calculer_resultat(total_points, total_coefficients)
+            resultats.append((total_points, moyenne, repechable, presentation, candidat_id))
+        if progression:
+            progression(2, 3)
+
+        # Écriture groupée dans la même transaction
+        cursor.executemany(f"""
+            UPDATE {config["resultat"]}
+            SET total_points = ?, moyenne = ?, repechable = ?, presentation = ?
+            WHERE candidat_id = ?
+        """, resultats)
+
+        cursor.execute("DELETE FROM deliberation_en_attente WHERE tour = ?", (tour,))
+        if progression:
+            progression(3, 3)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return len(resultats)
@@ -0,0 +1,368 @@
+import deliberation
+from connexion import get_connexion, transaction
+
+# Tables des relevés et colonnes de la table note selon le tour
+RELEVES = {1: "releve_notes_1er_tour", 2: "releve_notes_2e_tour"}
+COLONNES_NOTE = {1: "note_premier_tour", 2: "note_deuxieme_tour"}
+RESULTATS = {1: "resultat", 2: "resultat_2e_tour"}
+
+# Filtre et ordre des listes de résultats (mêmes seuils que la délibération)
+CATEGORIES_RESULTATS = {
+    "admis": (f"r.total_points >= {deliberation.SEUIL_ADMIS}", "r.total_points DESC"),
+    "admissibles": (f"r.total_points >= {deliberation.SEUIL_ADMISSIBLE} "
+                    f"AND r.total_points < {deliberation.SEUIL_ADMIS}", "r.total_points DESC"),
+    "ajournes": (f"r.total_points < {deliberation.SEUIL_ADMISSIBLE}", "r.total_points ASC"),
+}
+
+
+# ======================= JURY ET MEMBRES ======================== #
+
+def trouver_membre(email, mot_de_passe):
+    """Retourne (id, nom, prenom, email) du membre du jury, ou None"""
+    return get_connexion().execute(
+        "SELECT id, nom, prenom, email FROM membre_jury WHERE email = ? AND mot_de_passe = ?",
+        (email, mot_de_passe)).fetchone()
+
+
+def email_existe(email):
+    """Indique si un membre du jury utilise déjà cet email"""
+    return get_connexion().execute("SELECT 1 FROM membre_jury WHERE email = ?", (email,)).fetchone() is not None
+
+
+def ajouter_membre(nom, prenom, email, mot_de_passe, jury_id):
+    """Inscrit un membre du jury"""
+    with transaction() as cursor:
+        cursor.execute("""
+            INSERT INTO membre_jury (nom, prenom, email, mot_de_passe, jury_id)
+            VALUES (?, ?, ?, ?, ?)
+        """, (nom, prenom, email, mot_de_passe, jury_id))
+
+
+def ajouter_jury(ia, ief, localite, centre_examen, president_jury, telephone):
+    """Ajoute un jury"""
+    with transaction() as cursor:
+        cursor.execute("""
+            INSERT INTO jury (ia, ief, localite, centre_examen, president_jury, telephone)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (ia, ief, localite, centre_examen, president_jury, telephone))
+
+
+def infos_jury(email_membre):
+    """Retourne (nom, prenom, localite, centre_examen) du membre et de son jury, ou None"""
+    return get_connexion().execute("""
+        SELECT m.nom, m.prenom, j.localite, j.centre_examen
+        FROM membre_jury m
+        JOIN jury j ON j.id = m.jury_id
+        WHERE m.email = ?
+    """, (email_membre,)).fetchone()
+
+
+# ======================= CANDIDATS ======================== #
+
+# Colonnes affichées dans la liste des candidats (l'id en premier)
+REQUETE_CANDIDATS = """
+    SELECT id, numero_table, prenom, nom, date_naissance, lieu_naissance, sexe, type_candidat,
+           etablissement, nationalite, etat_sportif, anonymat
+    FROM candidat
+"""
+
+
+def lister_candidats():
+    """Retourne tous les candidats avec les colonnes affichées dans la liste"""
+    return get_connexion().execute(REQUETE_CANDIDATS).fetchall()
+
+
+def lister_anonymats():
+    """Retourne les numéros d'anonymat triés"""
+    return [anonymat for (anonymat,) in
+            get_connexion().execute("SELECT anonymat FROM candidat ORDER BY anonymat")]
+
+
+def candidat_par_anonymat(anonymat):
+    """Retourne l'ID du candidat portant ce numéro d'anonymat, ou None"""
+    ligne = get_connexion().execute("SELECT id FROM candidat WHERE anonymat = ?", (anonymat,)).fetchone()
+    return ligne[0] if ligne else None
+
+
+def infos_candidat(candidat_id):
+    """Retourne (prenom, nom, date_naissance, lieu_naissance, sexe, type_candidat, etablissement,
+    nationalite, etat_sportif, anonymat) du candidat, ou None"""
+    return get_connexion().execute("""
+        SELECT prenom, nom, date_naissance, lieu_naissance, sexe, type_candidat, etablissement,
+               nationalite, etat_sportif, anonymat
+        FROM candidat
+        WHERE id = ?
+    """, (candidat_id,)).fetchone()
+
+
+def modifier_candidat(candidat_id, prenom, nom, date_naissance, lieu_naissance, sexe, type_candidat,
+                      etablissement, nationalite, etat_sportif, anonymat):
+    """Met à jour les informations d'un candidat"""
+    with transaction() as cursor:
+        cursor.execute("""
+            UPDATE candidat
+            SET prenom = ?, nom = ?, date_naissance = ?, lieu_naissance = ?, sexe = ?, type_candidat = ?,
+                etablissement = ?, nationalite = ?, etat_sportif = ?, anonymat = ?
+            WHERE id = ?
+        """, (prenom, nom, date_naissance, lieu_naissance, sexe, type_candidat, etablissement,
+              nationalite, etat_sportif, anonymat, candidat_id))
+
+
+def supprimer_candidat(candidat_id):
+    """Supprime un candidat"""
+    with transaction() as cursor:
+        cursor.execute("DELETE FROM candidat WHERE id = ?", (candidat_id,))
+
+
+def lister_releves_scolaires():
+    """Retourne (prenom, nom, date_naissance, lieu_naissance, moyennes 6e à 3e, moyenne_generale,
+    nombre_de_fois) de chaque candidat"""
+    return get_connexion().execute("""
+        SELECT c.prenom, c.nom, c.date_naissance, c.lieu_naissance,
+               r.moyenne_6e, r.moyenne_5e, r.moyenne_4e, r.moyenne_3e, r.moyenne_generale, r.nombre_de_fois
+        FROM candidat c
+        JOIN releve_scolaire r ON r.id = c.releve_scolaire_id
+        ORDER BY c.id
+    """).fetchall()
+
+
+def iterer_candidats_export():
+    """Parcourt les candidats triés par nom pour la liste d'émargement"""
+    return get_connexion().execute("""
+        SELECT numero_table, nom, prenom, date_naissance, lieu_naissance, sexe,
+               type_candidat, etablissement, nationalite
+        FROM candidat
+        ORDER BY nom
+    """)
+
+
+def ajouter_candidat(candidat, releve):
+    """Inscrit un candidat (valeurs dans l'ordre de importation.COLONNES_CANDIDAT) avec son relevé scolaire
+    (moyennes 6e à 3e, moyenne générale, nombre de fois) ; retourne l'ID du candidat"""
+    with transaction() as cursor:
+        cursor.execute("""
+            INSERT INTO releve_scolaire (moyenne_6e, moyenne_5e, moyenne_4e, moyenne_3e, moyenne_generale, nombre_de_fois)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, releve)
+        cursor.execute("""
+            INSERT INTO candidat (numero_table, prenom, nom, date_naissance, lieu_naissance, sexe,
+                                  type_candidat, etablissement, nationalite, etat_sportif, anonymat, releve_scolaire_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?)
+        """, list(candidat) + [cursor.lastrowid])
+        candidat_id = cursor.lastrowid
+
+        # Résultats des deux tours et relevés de notes vides pour chaque matière
+        initialiser_candidats(cursor, candidat_id)
+    return candidat_id
+
+
+def prochain_id(cursor, table):
+    """Premier id qu'attribuera AUTOINCREMENT (valable dans une transaction d'écriture)"""
+    cursor.execute(f"""
+        SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = ?), 0),
+                   COALESCE((SELECT MAX(id) FROM {table}), 0)) + 1
+    """, (table,))
+    return cursor.fetchone()[0]
+
+
+def initialiser_candidats(cursor, premier_id):
+    """Crée en bloc les résultats et relevés vides des candidats dont l'id est >= premier_id"""
+    for table in RESULTATS.values():
+        cursor.execute(f"""
+            INSERT INTO {table} (candidat_id, total_points, moyenne, presentation)
+            SELECT id, 0, 0, 'Non délibéré' FROM candidat WHERE id >= ?
+        """, (premier_id,))
+
+    # Une ligne par candidat et par matière dans les relevés des deux tours
+    for table in RELEVES.values():
+        cursor.execute(f"""
+            INSERT INTO {table} (candidat_id, matiere_id, note, points)
+            SELECT c.id, m.id, 0, 0 FROM candidat c CROSS JOIN matiere m WHERE c.id >= ?
+        """, (premier_id,))
+
+
+# ======================= MATIÈRES ET NOTES ======================== #
+
+def matieres_du_tour(tour):
+    """Retourne les matières (id, nom) d'un tour"""
+    return get_connexion().execute("SELECT id, nom FROM matiere WHERE tour = ? ORDER BY id", (tour,)).fetchall()
+
+
+def lister_matieres(tour=None):
+    """Retourne les matières (id, nom, coefficient, tour), de tous les tours ou d'un seul"""
+    if tour is None:
+        return get_connexion().execute("SELECT id, nom, coefficient, tour FROM matiere ORDER BY id").fetchall()
+    return get_connexion().execute("SELECT id, nom, coefficient, tour FROM matiere WHERE tour = ? ORDER BY id",
+                                   (tour,)).fetchall()
+
+
+def infos_matiere(matiere_id):
+    """Retourne (nom, coefficient, facultative, tour) de la matière, ou None"""
+    return get_connexion().execute("SELECT nom, coefficient, facultative, tour FROM matiere WHERE id = ?",
+                                   (matiere_id,)).fetchone()
+
+
+def modifier_matiere(matiere_id, nom, coefficient, facultative):
+    """Modifie le nom, le coefficient et le caractère facultatif d'une matière (les triggers de suivi
+    marquent les candidats à redélibérer)"""
+    with transaction() as cursor:
+        cursor.execute("UPDATE matiere SET nom = ?, coefficient = ?, facultative = ? WHERE id = ?",
+                       (nom, coefficient, 1 if facultative else 0, matiere_id))
+
+
+def supprimer_matiere(matiere_id):
+    """Supprime une matière"""
+    with transaction() as cursor:
+        cursor.execute("DELETE FROM matiere WHERE id = ?", (matiere_id,))
+
+
+def ajouter_matiere(nom, coefficient, tour, facultative=False):
+    """Ajoute une matière et initialise les notes de tous les candidats ; retourne son ID.
+
+    Lève ValueError si une matière porte déjà ce nom (les noms sont uniques, tous tours confondus).
+    """
+    with transaction() as cursor:
+        cursor.execute("SELECT tour FROM matiere WHERE nom = ?", (nom,))
+        existante = cursor.fetchone()
+        if existante:
+            raise ValueError(f"La matière « {nom} » existe déjà (tour {existante[0]}).")
+
+        cursor.execute("INSERT INTO matiere (nom, coefficient, tour, facultative) VALUES (?, ?, ?, ?)",
+                       (nom, coefficient, tour, 1 if facultative else 0))
+        matiere_id = cursor.lastrowid
+        initialiser_matiere(cursor, matiere_id, tour)
+    return matiere_id
+
+
+def initialiser_matiere(cursor, matiere_id, tour):
+    """Crée en bloc les lignes de notes vides d'une nouvelle matière pour tous les candidats"""
+    cursor.execute("""
+        INSERT OR IGNORE INTO note (note_premier_tour, note_deuxieme_tour, matiere_id, candidat_id)
+        SELECT NULL, NULL, ?, id FROM candidat
+    """, (matiere_id,))
+
+    # Au 2e tour, le relevé est initialisé en même temps (note NULL, points à 0)
+    if tour == 2:
+        cursor.execute("""
+            INSERT OR IGNORE INTO releve_notes_2e_tour (candidat_id, matiere_id, note, points)
+            SELECT id, ?, NULL, 0 FROM candidat
+        """, (matiere_id,))
+
+
+def notes_du_candidat(candidat_id, tour):
+    """Retourne (matiere_id, nom, note) pour chaque matière du tour"""
+    return get_connexion().execute(f"""
+        SELECT m.id, m.nom, n.{COLONNES_NOTE[tour]}
+        FROM matiere m
+        LEFT JOIN note n ON m.id = n.matiere_id AND n.candidat_id = ?
+        WHERE m.tour = ?
+    """, (candidat_id, tour)).fetchall()
+
+
+def ecrire_notes(cursor, notes, tour, coefficients):
+    """Écrit des notes [(candidat_id, matiere_id, note)] dans la table note et dans le relevé du tour.
+
+    Les lignes absentes sont créées : un candidat ajouté après la matière n'a pas encore de ligne note.
+    """
+    colonne = COLONNES_NOTE[tour]
+    cursor.executemany(f"""
+        INSERT INTO note ({colonne}, matiere_id, candidat_id) VALUES (?, ?, ?)
+        ON CONFLICT (candidat_id, matiere_id) DO UPDATE SET {colonne} = excluded.{colonne}
+    """, [(note, matiere_id, candidat_id) for candidat_id, matiere_id, note in notes])
+
+    cursor.executemany(f"""
+        INSERT INTO {RELEVES[tour]} (candidat_id, matiere_id, note, points)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (candidat_id, matiere_id) DO UPDATE SET note = excluded.note, points = excluded.points
+    """, [(candidat_id, matiere_id, note, note * coefficients[matiere_id])
+          for candidat_id, matiere_id, note in notes])
+
+
+def coefficients_du_tour(tour):
+    """Retourne {matiere_id: coefficient} pour les matières d'un tour"""
+    return dict(get_connexion().execute("SELECT id, coefficient FROM matiere WHERE tour = ?", (tour,)))
+
+
+def enregistrer_notes(candidat_id, notes, tour):
+    """Enregistre les notes {matiere_id: note} d'un candidat dans la table note et dans le relevé du tour"""
+    coefficients = coefficients_du_tour(tour)
+
+    inconnues = [matiere_id for matiere_id in notes if matiere_id not in coefficients]
+    if inconnues:
+        raise ValueError(f"Matière introuvable : {inconnues[0]}")
+
+    with transaction() as cursor:
+        ecrire_notes(cursor, [(candidat_id, matiere_id, note) for matiere_id, note in notes.items()],
+                     tour, coefficients)
+
+
+# ======================= RÉSULTATS ======================== #
+
+def requete_resultats(tour, categorie):
+    """Retourne le SELECT (sans tri) d'une catégorie de résultats"""
+    filtre, _ = CATEGORIES_RESULTATS[categorie]
+    return f"""
+        SELECT c.id, c.numero_table, c.nom, c.prenom, c.date_naissance, r.total_points
+        FROM {RESULTATS[tour]} r
+        JOIN candidat c ON r.candidat_id = c.id
+        WHERE {filtre}
+    """
+
+
+def iterer_resultats(tour, categorie):
+    """Parcourt (candidat_id, numero_table, nom, prenom, date_naissance, total_points) d'une catégorie"""
+    _, ordre = CATEGORIES_RESULTATS[categorie]
+    return get_connexion().execute(requete_resultats(tour, categorie) + f" ORDER BY {ordre}")
+
+
+def lister_resultats(tour, categorie):
+    """Retourne (candidat_id, numero_table, nom, prenom, date_naissance, total_points) d'une catégorie"""
+    return iterer_resultats(tour, categorie).fetchall()
+
+
+def bilan_deliberation(tour):
+    """Retourne ({presentation: effectif}, nombre de repêchables) des résultats d'un tour"""
+    conn = get_connexion()
+    effectifs = dict(conn.execute(f"SELECT presentation, COUNT(*) FROM {RESULTATS[tour]} GROUP BY presentation"))
+    repechables = conn.execute(f"SELECT COUNT(*) FROM {RESULTATS[tour]} WHERE repechable = 1").fetchone()[0]
+    return effectifs, repechables
+
+
+def iterer_deliberation(tour):
+    """Parcourt (numero_table, nom, prenom, total_points, moyenne, presentation, repechable) par mérite"""
+    return get_connexion().execute(f"""
+        SELECT c.numero_table, c.nom, c.prenom, r.total_points, r.moyenne, r.presentation, r.repechable
+        FROM {RESULTATS[tour]} r
+        JOIN candidat c ON r.candidat_id = c.id
+        ORDER BY r.total_points DESC, c.numero_table
+    """)
+
+
+# ======================= RELEVÉS DE NOTES ======================== #
+
+def compter_candidats():
+    """Nombre de candidats inscrits"""
+    return get_connexion().execute("SELECT COUNT(*) FROM candidat").fetchone()[0]
+
+
+def tranches_candidats(taille):
+    """Découpe les id des candidats en intervalles (premier_id, dernier_id) d'au plus `taille` candidats"""
+    ids = [candidat_id for (candidat_id,) in get_connexion().execute("SELECT id FROM candidat ORDER BY id")]
+    return [(ids[i], ids[min(i + taille, len(ids)) - 1]) for i in range(0, len(ids), taille)]
+
+
+def iterer_releves(premier_id, dernier_id, tour=1):
+    """Parcourt les lignes des relevés de notes, triées par candidat puis par matière :
+    (candidat_id, numero_table, nom, prenom, total_points, moyenne, matiere, note_1er_tour, note_2e_tour, coefficient)
+    Le total et la moyenne sont ceux du tour demandé.
+    """
+    return get_connexion().execute(f"""
+        SELECT c.id, c.numero_table, c.nom, c.prenom, r.total_points, r.moyenne,
+               m.nom, n.note_premier_tour, n.note_deuxieme_tour, m.coefficient
+        FROM candidat c
+        JOIN {RESULTATS[tour]} r ON r.candidat_id = c.id
+        LEFT JOIN note n ON n.candidat_id = c.id
+        LEFT JOIN matiere m ON m.id = n.matiere_id
+        WHERE c.id BETWEEN ? AND ?
+        ORDER BY c.id, m.nom
+    """, (premier_id, dernier_id))
@@ -0,0 +1,107 @@
+import random
+import sqlite3
+from datetime import date, timedelta
+
+import depot
+import importation
+from connexion import get_connexion, transaction
+from deliberation import MATIERE_EPS, MATIERE_FACULTATIVE
+
+# Matières créées si elles n'existent pas : (nom, coefficient, tour, facultative).
+# Les noms sont uniques dans la table matiere, d'où le suffixe des matières du 2e tour.
+MATIERES = [
+    ("Composition française", 2, 1, False),
+    ("Dictée", 1, 1, False),
+    ("Étude de texte", 1, 1, False),
+    ("Instruction civique", 1, 1, False),
+    ("Histoire-Géographie", 2, 1, False),
+    ("Mathématiques", 4, 1, False),
+    ("Sciences physiques", 2, 1, False),
+    ("SVT", 2, 1, False),
+    ("Anglais écrit", 2, 1, False),
+    ("Anglais oral", 1, 1, False),
+    (MATIERE_EPS, 1, 1, False),
+    (MATIERE_FACULTATIVE, 1, 1, True),
+    ("Français (2e tour)", 3, 2, False),
+    ("Mathématiques (2e tour)", 3, 2, False),
+    ("Sciences physiques (2e tour)", 2, 2, False),
+]
+
+PRENOMS = ["Awa", "Fatou", "Aminata", "Mariama", "Khady", "Ndeye", "Aissatou", "Coumba", "Binta", "Rokhaya",
+           "Moussa", "Mamadou", "Ibrahima", "Cheikh", "Ousmane", "Abdoulaye", "Modou", "Babacar", "Lamine", "Pape"]
+NOMS = ["Diop", "Ndiaye", "Fall", "Sow", "Ba", "Diallo", "Faye", "Gueye", "Sarr", "Mbaye",
+        "Cisse", "Sy", "Kane", "Thiam", "Niang", "Seck", "Diouf", "Camara", "Toure", "Mbengue"]
+LOCALITES = ["Dakar", "Thiès", "Saint-Louis", "Kaolack", "Ziguinchor", "Touba", "Rufisque", "Mbour", "Louga", "Kolda"]
+ETABLISSEMENTS = [f"CEM {localite}" for localite in LOCALITES] + ["Lycée Blaise Diagne", "Lycée Lamine Guèye"]
+
+# Nombre de candidats écrits par transaction
+TAILLE_LOT = 5000
+
+
+def _note(aleatoire, niveau):
+    """Note au demi-point autour du niveau du candidat"""
+    return min(20.0, max(0.0, round(aleatoire.gauss(niveau, 2.5) * 2) / 2))
+
+
+def _candidat(aleatoire, numero_table):
+    """Retourne (valeurs du candidat, valeurs du relevé scolaire, niveau)"""
+    # Niveau borné : un candidat sans aucun point aurait un total négatif à cause du malus EPS
+    niveau = min(18, max(3, aleatoire.gauss(10.5, 3)))
+    sexe = aleatoire.choice("MF")
+    prenom = aleatoire.choice(PRENOMS[10:] if sexe == "M" else PRENOMS[:10])
+    naissance = date(2008, 1, 1) + timedelta(days=aleatoire.randrange(4 * 365))
+    candidat = [numero_table, prenom, aleatoire.choice(NOMS), naissance.isoformat(), aleatoire.choice(LOCALITES),
+                sexe, "Candidat libre" if aleatoire.random() < 0.1 else "Candidat normal",
+                aleatoire.choice(ETABLISSEMENTS), "Sénégalaise", "Oui" if aleatoire.random() < 0.9 else "Non"]
+
+    moyennes = [_note(aleatoire, niveau) for _ in range(4)]
+    releve = moyennes + [sum(moyennes) / 4, 1 if aleatoire.random() < 0.85 else 2]
+    return candidat, releve, niveau
+
+
+def creer_matieres():
+    """Crée les matières de MATIERES absentes de la base ; retourne {tour: {matiere_id: coefficient}}"""
+    existantes = {nom for (nom,) in get_connexion().execute("SELECT nom FROM matiere")}
+    for nom, coefficient, tour, facultative in MATIERES:
+        if nom not in existantes:
+            depot.ajouter_matiere(nom, coefficient, tour, facultative)
+    return {tour: depot.coefficients_du_tour(tour) for tour in (1, 2)}
+
+
+def _ecrire_lot(cursor, lot, coefficients, aleatoire):
+    """Insère un lot de candidats comme l'import CSV, puis leurs notes des deux tours"""
+    # Verrou pris avant de lire le prochain id : les candidats du lot reçoivent les suivants
+    cursor.execute("BEGIN IMMEDIATE")
+    premier_candidat = depot.prochain_id(cursor, "candidat")
+    rejetes = importation.ecrire_candidats(cursor, [(position, (candidat, releve))
+                                                    for position, (candidat, releve, _) in enumerate(lot)])
+    if rejetes:
+        raise sqlite3.IntegrityError(rejetes[0][1])
+    if depot.prochain_id(cursor, "candidat") != premier_candidat + len(lot):
+        raise sqlite3.IntegrityError("Identifiants de candidats non consécutifs")
+
+    for tour, coefficients_tour in coefficients.items():
+        notes = [(premier_candidat + position, matiere_id, _note(aleatoire, niveau))
+                 for position, (_, _, niveau) in enumerate(lot) for matiere_id in coefficients_tour]
+        depot.ecrire_notes(cursor, notes, tour, coefficients_tour)
+
+
+def generer(nombre, graine=0, prefixe="G", progression=None):
+    """Ajoute `nombre` candidats fictifs avec relevé scolaire et notes des deux tours.
+
+    Les données sont reproductibles pour une même graine. Les numéros de table sont
+    `prefixe` suivi d'un numéro à 7 chiffres, à partir du nombre de candidats déjà inscrits.
+    Retourne le nombre de candidats ajoutés.
+    """
+    aleatoire = random.Random(graine)
+    coefficients = creer_matieres()
+    debut = depot.compter_candidats()
+
+    for premier in range(0, nombre, TAILLE_LOT):
+        lot = [_candidat(aleatoire, f"{prefixe}{debut + position + 1:07d}")
+               for position in range(premier, min(premier + TAILLE_LOT, nombre))]
+        with transaction() as cursor:
+            _ecrire_lot(cursor, lot, coefficients, aleatoire)
+        if progression:
+            progression(premier + len(lot), nombre)
+    return nombre
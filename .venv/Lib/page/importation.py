@@ -0,0 +1,258 @@
+import csv
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+import depot
+from connexion import get_connexion
+
+# Nombre de lignes écrites par transaction
+TAILLE_LOT = 500
+
+# Colonnes attendues dans un registre de candidats (en-tête du CSV)
+COLONNES_CANDIDAT = ["numero_table", "prenom", "nom", "date_naissance", "lieu_naissance", "sexe",
+                     "type_candidat", "etablissement", "nationalite", "etat_sportif"]
+COLONNES_RELEVE = ["moyenne_6e", "moyenne_5e", "moyenne_4e", "moyenne_3e", "nombre_de_fois"]
+
+# Champs obligatoires (les mêmes que dans le formulaire d'ajout)
+OBLIGATOIRES = ["numero_table", "prenom", "nom", "date_naissance", "lieu_naissance"]
+
+SEXES = {"m": "M", "masculin": "M", "f": "F", "féminin": "F", "feminin": "F"}
+FORMATS_DATE = ["%Y-%m-%d", "%d/%m/%Y"]
+
+
+# ======================= LECTURE ======================== #
+
+@contextmanager
+def ouvrir_csv(chemin):
+    """Ouvre un CSV (séparateur ';', ',' ou tabulation détecté) et retourne un DictReader"""
+    with open(chemin, newline="", encoding="utf-8-sig") as fichier:
+        try:
+            dialecte = csv.Sniffer().sniff(fichier.read(4096), delimiters=";,\t")
+        except csv.Error:
+            dialecte = csv.excel
+        fichier.seek(0)
+
+        lecteur = csv.DictReader(fichier, dialect=dialecte)
+        lecteur.fieldnames = [entete.strip() for entete in lecteur.fieldnames or []]
+        yield lecteur
+
+
+def compter_lignes(chemin):
+    """Compte les lignes de données d'un fichier (pour la barre de progression)"""
+    with open(chemin, "rb") as fichier:
+        lignes = sum(bloc.count(b"\n") for bloc in iter(lambda: fichier.read(1 << 20), b""))
+    return max(lignes - 1, 0)
+
+
+def _texte(ligne, colonne):
+    return (ligne.get(colonne) or "").strip()
+
+
+def _reel(texte, colonne, minimum=0, maximum=20):
+    """Convertit une valeur numérique (virgule décimale acceptée) et vérifie ses bornes"""
+    try:
+        valeur = float(texte.replace(",", "."))
+    except ValueError:
+        raise ValueError(f"{colonne} : '{texte}' n'est pas un nombre")
+    if not minimum <= valeur <= maximum:
+        raise ValueError(f"{colonne} : {texte} hors de l'intervalle [{minimum}, {maximum}]")
+    return valeur
+
+
+def _verifier_entetes(lecteur, colonnes):
+    manquantes = [colonne for colonne in colonnes if colonne not in lecteur.fieldnames]
+    if manquantes:
+        raise ValueError(f"Colonne(s) manquante(s) : {', '.join(manquantes)}")
+
+
+# ======================= ÉCRITURE PAR LOTS ======================== #
+
+def _importer(lecteur, valider, ecrire, progression=None):
+    """Valide les lignes au fil de la lecture et les écrit par lots de TAILLE_LOT.
+
+    Une ligne invalide est signalée sans interrompre l'import. Retourne (nombre importé, erreurs)
+    où erreurs est une liste de (numéro de ligne, message).
+    """
+    conn = get_connexion()
+    erreurs = []
+    importees = 0
+    traitees = 0
+    lot = []
+
+    for ligne in lecteur:
+        traitees += 1
+        try:
+            lot.append((lecteur.line_num, valider(ligne)))
+        except ValueError as e:
+            erreurs.append((lecteur.line_num, str(e)))
+
+        if len(lot) >= TAILLE_LOT:
+            importees += _ecrire_lot(conn, lot, ecrire, erreurs)
+            lot = []
+            if progression:
+                progression(traitees)
+
+    if lot:
+        importees += _ecrire_lot(conn, lot, ecrire, erreurs)
+    if progression:
+        progression(traitees)
+    return importees, sorted(erreurs)
+
+
+def _ecrire_lot(conn, lot, ecrire, erreurs):
+    """Écrit un lot en une transaction ; en cas d'échec, le rejoue ligne par ligne pour isoler les fautives"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        rejetees = ecrire(cursor, lot)
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        return _ecrire_ligne_par_ligne(conn, lot, ecrire, erreurs)
+
+    erreurs.extend(rejetees)
+    return len(lot) - len(rejetees)
+
+
+def _ecrire_ligne_par_ligne(conn, lot, ecrire, erreurs):
+    cursor = conn.cursor()
+    importees = 0
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        for numero, valeurs in lot:
+            cursor.execute("SAVEPOINT ligne")
+            try:
+                rejetees = ecrire(cursor, [(numero, valeurs)])
+            except sqlite3.Error as e:
+                cursor.execute("ROLLBACK TO ligne")
+                rejetees = [(numero, str(e))]
+            cursor.execute("RELEASE ligne")
+
+            erreurs.extend(rejetees)
+            importees += 1 - len(rejetees)
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    return importees
+
+
+# ======================= CANDIDATS ======================== #
+
+def valider_candidat(ligne):
+    """Retourne (valeurs du candidat, valeurs du relevé scolaire) ou lève ValueError"""
+    valeurs = {colonne: _texte(ligne, colonne) for colonne in COLONNES_CANDIDAT}
+
+    vides = [colonne for colonne in OBLIGATOIRES if not valeurs[colonne]]
+    if vides:
+        raise ValueError(f"Champ(s) obligatoire(s) vide(s) : {', '.join(vides)}")
+
+    sexe = SEXES.get(valeurs["sexe"].lower())
+    if sexe is None:
+        raise ValueError(f"Le sexe doit être 'M' ou 'F' (reçu : '{valeurs['sexe']}')")
+    valeurs["sexe"] = sexe
+
+    for format_date in FORMATS_DATE:
+        try:
+            valeurs["date_naissance"] = datetime.strptime(valeurs["date_naissance"], format_date).strftime("%Y-%m-%d")
+            break
+        except ValueError:
+            continue
+    else:
+        raise ValueError(f"Date de naissance invalide : '{valeurs['date_naissance']}'")
+
+    # Relevé scolaire : moyennes facultatives, moyenne générale calculée si les quatre sont connues
+    moyennes = [_reel(_texte(ligne, colonne), colonne) if _texte(ligne, colonne) else None
+                for colonne in COLONNES_RELEVE[:4]]
+    moyenne_generale = sum(moyennes) / 4 if None not in moyennes else None
+
+    nombre_de_fois = _texte(ligne, "nombre_de_fois") or None
+    if nombre_de_fois is not None:
+        if not nombre_de_fois.isdigit():
+            raise ValueError(f"nombre_de_fois : '{nombre_de_fois}' n'est pas un entier positif")
+        nombre_de_fois = int(nombre_de_fois)
+
+    return [valeurs[colonne] for colonne in COLONNES_CANDIDAT], moyennes + [moyenne_generale, nombre_de_fois]
+
+
+def ecrire_candidats(cursor, lot):
+    """Insère un lot [(numéro, (candidat, relevé))] de candidats, leurs relevés scolaires et leurs lignes
+    d'attente, dans la transaction en cours ; retourne les [(numéro, message)] des numéros de table déjà pris"""
+    numeros = [candidat[0] for _, (candidat, _) in lot]
+    cursor.execute(f"SELECT numero_table FROM candidat WHERE numero_table IN ({', '.join('?' * len(numeros))})",
+                   numeros)
+    existants = {numero_table for (numero_table,) in cursor.fetchall()}
+
+    rejetees = [(numero, f"Numéro de table déjà utilisé : {candidat[0]}")
+                for numero, (candidat, _) in lot if candidat[0] in existants]
+    valides = [(candidat, releve) for _, (candidat, releve) in lot if candidat[0] not in existants]
+    if not valides:
+        return rejetees
+
+    # Les relevés reçoivent des id consécutifs : le candidat i pointe vers premier_releve + i
+    premier_releve = depot.prochain_id(cursor, "releve_scolaire")
+    cursor.executemany("""
+        INSERT INTO releve_scolaire (moyenne_6e, moyenne_5e, moyenne_4e, moyenne_3e, moyenne_generale, nombre_de_fois)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, [releve for _, releve in valides])
+    if depot.prochain_id(cursor, "releve_scolaire") != premier_releve + len(valides):
+        raise sqlite3.IntegrityError("Identifiants de relevés non consécutifs")
+
+    premier_candidat = depot.prochain_id(cursor, "candidat")
+    cursor.executemany("""
+        INSERT INTO candidat (numero_table, prenom, nom, date_naissance, lieu_naissance, sexe,
+                              type_candidat, etablissement, nationalite, etat_sportif, anonymat, releve_scolaire_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?)
+    """, [candidat + [premier_releve + i] for i, (candidat, _) in enumerate(valides)])
+
+    depot.initialiser_candidats(cursor, premier_candidat)
+    return rejetees
+
+
+def importer_candidats(chemin, progression=None):
+    """Importe un registre de candidats CSV ; retourne (nombre importé, erreurs par ligne)"""
+    with ouvrir_csv(chemin) as lecteur:
+        _verifier_entetes(lecteur, COLONNES_CANDIDAT)
+        return _importer(lecteur, valider_candidat, ecrire_candidats, progression)
+
+
+# ======================= NOTES ======================== #
+
+def importer_notes(chemin, tour, progression=None):
+    """Importe une feuille de notes CSV : une colonne anonymat puis une colonne par matière du tour.
+
+    Une cellule vide laisse la note existante inchangée. Retourne (nombre de lignes importées, erreurs).
+    """
+    matieres = {nom: matiere_id for matiere_id, nom in depot.matieres_du_tour(tour)}
+    coefficients = depot.coefficients_du_tour(tour)
+
+    with ouvrir_csv(chemin) as lecteur:
+        _verifier_entetes(lecteur, ["anonymat"])
+        inconnues = [entete for entete in lecteur.fieldnames if entete != "anonymat" and entete not in matieres]
+        if inconnues:
+            raise ValueError(f"Matière(s) inconnue(s) au tour {tour} : {', '.join(inconnues)}")
+        colonnes = [(entete, matieres[entete]) for entete in lecteur.fieldnames if entete != "anonymat"]
+
+        def valider(ligne):
+            anonymat = _texte(ligne, "anonymat")
+            if not anonymat.isdigit() or int(anonymat) == 0:
+                raise ValueError(f"Numéro d'anonymat invalide : '{anonymat}'")
+            notes = [(matiere_id, _reel(_texte(ligne, nom), nom))
+                     for nom, matiere_id in colonnes if _texte(ligne, nom)]
+            return int(anonymat), notes
+
+        def ecrire(cursor, lot):
+            anonymats = [anonymat for _, (anonymat, _) in lot]
+            cursor.execute(f"SELECT anonymat, id FROM candidat WHERE anonymat IN ({', '.join('?' * len(anonymats))})",
+                           anonymats)
+            candidats = dict(cursor.fetchall())
+
+            rejetees = [(numero, f"Aucun candidat avec l'anonymat {anonymat}")
+                        for numero, (anonymat, _) in lot if anonymat not in candidats]
+            depot.ecrire_notes(cursor, [(candidats[anonymat], matiere_id, note)
+                                        for _, (anonymat, notes) in lot if anonymat in candidats
+                                        for matiere_id, note in notes], tour, coefficients)
+            return rejetees
+
+        return _importer(lecteur, valider, ecrire, progression)
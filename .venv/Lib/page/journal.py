@@ -0,0 +1,105 @@
+# Journal des modifications d'une base de centre, pour la synchronisation avec la base nationale
+# (voir consolidation.py). Chaque candidat a une version : la valeur d'un compteur croissant au
+# moment de sa dernière modification (lui, son relevé scolaire, ses notes ou ses résultats).
+# Le journal est tenu par triggers, comme le suivi de la délibération et les statistiques.
+
+# Tables de résultats et colonnes dont un changement crée une nouvelle version
+RESULTATS = ["resultat", "resultat_2e_tour"]
+COLONNES_RESULTAT = ["total_points", "moyenne", "repechable", "presentation"]
+
+_TABLES = [
+    # Identifiant unique de la base (un centre) : tiré au premier export (consolidation.exporter_centre),
+    # pas ici, pour que les bases copiées d'un même modèle migré aient chacune le leur
+    "CREATE TABLE IF NOT EXISTS identite_centre (code TEXT, version_exportee INTEGER)",
+    """
+    INSERT INTO identite_centre (code, version_exportee)
+    SELECT NULL, 0 WHERE NOT EXISTS (SELECT 1 FROM identite_centre)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS journal_candidat (
+        candidat_id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL,
+        supprime INTEGER NOT NULL DEFAULT 0 CHECK (supprime IN (0, 1))
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_journal_candidat_version ON journal_candidat (version)",
+    # Candidats existants : version 1, le premier envoi les transfère tous
+    """
+    INSERT INTO journal_candidat (candidat_id, version, supprime)
+    SELECT id, 1, 0 FROM candidat WHERE id NOT IN (SELECT candidat_id FROM journal_candidat)
+    """,
+]
+
+
+def _marquer(candidat, source="", supprime=0):
+    """Corps de trigger : passe à une nouvelle version le candidat `candidat` (expression SQL,
+    évaluée sur les lignes de `source` si elle est donnée).
+
+    UPDATE puis INSERT ... WHERE NOT EXISTS, comme les triggers de statistiques : un INSERT OR IGNORE
+    ou un UPSERT hériterait de la politique de conflit de l'instruction qui déclenche le trigger.
+    Un seul candidat se compare directement à la clé (recherche par rowid, pas de parcours du journal).
+    """
+    version = "COALESCE((SELECT MAX(version) FROM journal_candidat), 0) + 1"
+    cible = f"IN (SELECT {candidat} {source})" if source else f"= {candidat}"
+    filtre = f"{source} AND" if source else "WHERE"
+    return f"""
+        UPDATE journal_candidat SET version = {version}, supprime = {supprime} WHERE candidat_id {cible};
+        INSERT INTO journal_candidat (candidat_id, version, supprime)
+        SELECT {candidat}, {version}, {supprime} {filtre}
+        NOT EXISTS (SELECT 1 FROM journal_candidat WHERE candidat_id = {candidat});
+    """
+
+
+def _triggers():
+    triggers = [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS journal_candidat_insert AFTER INSERT ON candidat
+        BEGIN {_marquer("NEW.id")}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS journal_candidat_update AFTER UPDATE ON candidat
+        BEGIN {_marquer("NEW.id")}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS journal_candidat_delete AFTER DELETE ON candidat
+        BEGIN {_marquer("OLD.id", supprime=1)}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS journal_releve_scolaire_update AFTER UPDATE ON releve_scolaire
+        BEGIN {_marquer("c.id", "FROM candidat c WHERE c.releve_scolaire_id = NEW.id")}
+        END
+        """,
+    ]
+
+    # Les relevés de notes sont écrits en même temps que les notes : la table note suffit
+    for evenement, ligne in (("insert", "NEW"), ("update", "NEW"), ("delete", "OLD")):
+        triggers.append(f"""
+        CREATE TRIGGER IF NOT EXISTS journal_note_{evenement} AFTER {evenement.upper()} ON note
+        BEGIN {_marquer(f"{ligne}.candidat_id")}
+        END
+        """)
+
+    # La délibération réécrit toutes les lignes : seuls les résultats qui changent comptent
+    changement = " OR ".join(f"OLD.{colonne} IS NOT NEW.{colonne}" for colonne in COLONNES_RESULTAT)
+    for table in RESULTATS:
+        triggers.append(f"""
+        CREATE TRIGGER IF NOT EXISTS journal_{table}_update AFTER UPDATE ON {table}
+        WHEN {changement}
+        BEGIN {_marquer("NEW.candidat_id")}
+        END
+        """)
+    return triggers
+
+
+def installer(cursor):
+    """Crée l'identité de la base, le journal (rempli avec les candidats existants) et ses triggers"""
+    for instruction in _TABLES + _triggers():
+        cursor.execute(instruction)
+
+
+def version(conn, schema="main"):
+    """Version la plus récente du journal d'une base (0 si aucun candidat)"""
+    return conn.execute(f"SELECT COALESCE(MAX(version), 0) FROM {schema}.journal_candidat").fetchone()[0]
@@ -0,0 +1,193 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QRect
+from PyQt5.QtGui import QColor, QPainter
+from PyQt5.QtWidgets import QStyledItemDelegate
+
+from connexion import get_connexion
+from depot import COLONNES_NOTE
+
+
+class ModeleSQL(QAbstractTableModel):
+    """Modèle de table alimenté par une requête SQL et chargé page par page.
+
+    `requete` est un SELECT sans ORDER BY ni LIMIT qui expose une colonne `id` (clé de la ligne) ;
+    `colonnes` donne le nom des colonnes affichées, dans l'ordre des en-têtes. Le tri et le
+    filtre sont traduits en SQL : seules les lignes visibles sont chargées.
+    """
+
+    TAILLE_PAGE = 200
+
+    def __init__(self, requete, colonnes, entetes, params=(), colonnes_filtre=(), tri=None, parent=None):
+        super().__init__(parent)
+        self.requete = requete
+        self.colonnes = list(colonnes)
+        self.entetes = list(entetes)
+        self.params = tuple(params)
+        self.colonnes_filtre = list(colonnes_filtre)
+        self.tri = tri or (self.colonnes[0], Qt.AscendingOrder)
+        self.filtre = ""
+        self._lignes = []
+        self._fin = False
+
+    # ----- Chargement ----- #
+
+    def _clause_filtre(self):
+        """Retourne (clause WHERE, paramètres) du filtre texte"""
+        if not self.filtre or not self.colonnes_filtre:
+            return "", ()
+        clause = " OR ".join(f"CAST({colonne} AS TEXT) LIKE ?" for colonne in self.colonnes_filtre)
+        return f"WHERE ({clause})", (f"%{self.filtre}%",) * len(self.colonnes_filtre)
+
+    def requete_page(self, limite, decalage):
+        """Retourne (sql, paramètres) d'une page de lignes"""
+        colonne, ordre = self.tri
+        sens = "DESC" if ordre == Qt.DescendingOrder else "ASC"
+        filtre, params_filtre = self._clause_filtre()
+        # L'id départage les ex aequo : sans ordre total, une ligne pourrait passer d'une page à l'autre
+        sql = f"""
+            SELECT id, {", ".join(self.colonnes)} FROM ({self.requete})
+            {filtre}
+            ORDER BY {colonne} {sens}, id
+            LIMIT ? OFFSET ?
+        """
+        return sql, self.params + params_filtre + (limite, decalage)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._fin
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._fin:
+            return
+        sql, params = self.requete_page(self.TAILLE_PAGE, len(self._lignes))
+        page = get_connexion().execute(sql, params).fetchall()
+        self._fin = len(page) < self.TAILLE_PAGE
+        if page:
+            debut = len(self._lignes)
+            self.beginInsertRows(QModelIndex(), debut, debut + len(page) - 1)
+            self._lignes.extend(page)
+            self.endInsertRows()
+
+    def recharger(self):
+        """Relit la première page (tri et filtre courants)"""
+        self.beginResetModel()
+        self._lignes = []
+        self._fin = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def filtrer(self, texte):
+        """Applique un filtre texte (LIKE) sur les colonnes filtrables"""
+        self.filtre = texte.strip()
+        self.recharger()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # Les colonnes d'actions (au-delà des colonnes SQL) ne sont pas triables
+        if column < len(self.colonnes):
+            self.tri = (self.colonnes[column], order)
+            self.recharger()
+
+    def toutes_les_lignes(self):
+        """Parcourt toutes les lignes (tri et filtre courants) sans les garder en mémoire"""
+        sql, params = self.requete_page(-1, 0)
+        yield from get_connexion().execute(sql, params)
+
+    def cle(self, row):
+        """Clé (id) de la ligne affichée à la position `row`"""
+        return self._lignes[row][0]
+
+    # ----- Interface Qt ----- #
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._lignes)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entetes)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and section < len(self.entetes):
+            return self.entetes[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole or index.column() >= len(self.colonnes):
+            return None
+        return formater_valeur(self._lignes[index.row()][index.column() + 1])
+
+
+class ModeleGrilleNotes(ModeleSQL):
+    """Grille des notes d'un tour : une ligne par candidat (anonymat), une colonne par matière.
+
+    La page de candidats est choisie d'abord, puis les notes de cette page sont pivotées
+    en une seule requête : le coût d'une page ne dépend pas du nombre total de candidats.
+    """
+
+    def __init__(self, tour, matieres, parent=None):
+        self.matieres = list(matieres)
+        colonne_note = COLONNES_NOTE[tour]
+        pivot = "".join(f", MAX(CASE WHEN n.matiere_id = ? THEN n.{colonne_note} END) AS m_{position}"
+                        for position in range(len(self.matieres)))
+        self._pivot = f"""
+            SELECT c.id, c.anonymat{pivot}
+            FROM {{candidats}} c
+            LEFT JOIN note n ON n.candidat_id = c.id
+            GROUP BY c.id
+        """
+        colonnes = ["anonymat"] + [f"m_{position}" for position in range(len(self.matieres))]
+        entetes = ["Anonymat"] + [nom for _, nom in self.matieres] + ["Actions"]
+        params = tuple(matiere_id for matiere_id, _ in self.matieres)
+        super().__init__(self._pivot.format(candidats="candidat"), colonnes, entetes, params=params,
+                         colonnes_filtre=["anonymat"], parent=parent)
+
+    def requete_page(self, limite, decalage):
+        colonne, ordre = self.tri
+        if colonne != "anonymat":
+            # Tri sur une matière : il faut pivoter toutes les lignes
+            return super().requete_page(limite, decalage)
+
+        sens = "DESC" if ordre == Qt.DescendingOrder else "ASC"
+        filtre, params_filtre = self._clause_filtre()
+        candidats = f"(SELECT id, anonymat FROM candidat {filtre} ORDER BY anonymat {sens}, id LIMIT ? OFFSET ?)"
+        sql = self._pivot.format(candidats=candidats) + f" ORDER BY c.anonymat {sens}, c.id"
+        # Les matières du pivot (liste SELECT) précèdent la sous-requête dans le texte SQL
+        return sql, self.params + params_filtre + (limite, decalage)
+
+
+class DelegueActions(QStyledItemDelegate):
+    """Dessine des boutons d'action dans une cellule sans créer de widget par ligne"""
+
+    def __init__(self, actions, parent=None):
+        super().__init__(parent)
+        # actions : liste de (libellé, fonction appelée avec la clé de la ligne)
+        self.actions = list(actions)
+
+    def _zones(self, rect):
+        largeur = rect.width() // max(len(self.actions), 1)
+        return [QRect(rect.x() + i * largeur, rect.y(), largeur, rect.height()).adjusted(2, 2, -2, -2)
+                for i in range(len(self.actions))]
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        for zone, (libelle, _) in zip(self._zones(option.rect), self.actions):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#f7b731"))
+            painter.drawRoundedRect(zone, 5, 5)
+            painter.setPen(QColor("white"))
+            painter.drawText(zone, Qt.AlignCenter, libelle)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            for zone, (_, fonction) in zip(self._zones(option.rect), self.actions):
+                if zone.contains(event.pos()):
+                    fonction(model.cle(index.row()))
+                    return True
+        return False
+
+
+def formater_valeur(valeur):
+    """Texte affiché pour une valeur SQL (réels arrondis à 2 décimales, '-' si absente)"""
+    if valeur is None:
+        return "-"
+    if isinstance(valeur, float):
+        return str(round(valeur, 2))
+    return str(valeur)
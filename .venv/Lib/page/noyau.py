@@ -0,0 +1,114 @@
+import anonymisation
+import connexion
+import consolidation
+import deliberation
+import depot
+import importation
+import rapports
+import statistiques
+from connexion import fermer_connexion, get_connexion
+
+# API du jury sans interface graphique : les mêmes opérations que BFEMApp, utilisables depuis
+# un script, la ligne de commande (cli.py) ou les mesures de performance (benchmark.py).
+# Toutes les fonctions travaillent sur la connexion du thread courant.
+
+
+# ======================= BASE ======================== #
+
+def ouvrir_base(chemin):
+    """Utilise désormais la base `chemin` (créée et migrée si besoin) ; retourne la connexion"""
+    fermer_connexion()
+    connexion.CHEMIN_BASE = chemin
+    return get_connexion()
+
+
+# ======================= CANDIDATS ET MATIÈRES ======================== #
+
+def inscrire_candidat(**champs):
+    """Inscrit un candidat à partir des champs de importation.COLONNES_CANDIDAT et COLONNES_RELEVE
+    (mêmes règles de validation que l'import CSV) ; retourne son ID"""
+    candidat, releve = importation.valider_candidat({colonne: str(valeur) for colonne, valeur in champs.items()
+                                                     if valeur is not None})
+    return depot.ajouter_candidat(candidat, releve)
+
+
+def ajouter_matiere(nom, coefficient, tour=1, facultative=False):
+    """Ajoute une matière et initialise les notes des candidats ; retourne son ID"""
+    return depot.ajouter_matiere(nom, coefficient, tour, facultative)
+
+
+def saisir_notes(candidat_id, notes, tour=1):
+    """Enregistre les notes {matiere_id: note} d'un candidat pour un tour"""
+    depot.enregistrer_notes(candidat_id, notes, tour)
+
+
+def importer_candidats(chemin, progression=None):
+    """Importe un registre CSV de candidats ; retourne (nombre importé, erreurs par ligne)"""
+    return importation.importer_candidats(chemin, progression)
+
+
+def importer_notes(chemin, tour=1, progression=None):
+    """Importe une feuille de notes CSV (par anonymat) ; retourne (nombre importé, erreurs par ligne)"""
+    return importation.importer_notes(chemin, tour, progression)
+
+
+# ======================= ANONYMAT ET DÉLIBÉRATION ======================== #
+
+def attribuer_anonymats(largeur=None):
+    """Attribue un anonymat aux candidats qui n'en ont pas ; retourne leur nombre"""
+    return anonymisation.attribuer_anonymats(get_connexion(), largeur)
+
+
+def deliberer(tour=1, incremental=False):
+    """Délibère un tour (seulement les candidats modifiés si incremental) ; retourne leur nombre"""
+    return deliberation.deliberer(get_connexion(), tour=tour, incremental=incremental)
+
+
+# ======================= EXPORTS ======================== #
+
+def exporter_liste(tour, categorie, chemin=None, progression=None):
+    """Liste PDF des admis, admissibles ou ajournés d'un tour ; retourne le chemin"""
+    return rapports.generer_liste(tour, categorie, chemin, progression)
+
+
+def exporter_pv(tour, chemin=None, jury="", progression=None):
+    """Procès-verbal PDF de délibération d'un tour ; retourne le chemin"""
+    return rapports.generer_pv(tour, chemin, jury, progression)
+
+
+def exporter_candidats(chemin="liste_candidats.pdf", progression=None):
+    """Liste d'émargement PDF de tous les candidats ; retourne leur nombre"""
+    return rapports.generer_liste_candidats(chemin, progression)
+
+
+def exporter_releves(destination, tour=1, un_fichier_par_candidat=False, processus=None, progression=None):
+    """Relevés de notes PDF de tous les candidats (un fichier ou un dossier) ; retourne leur nombre"""
+    return rapports.generer_releves(destination, tour, un_fichier_par_candidat, processus, progression)
+
+
+# ======================= STATISTIQUES ======================== #
+
+def bilan(tour=1):
+    """Bilan d'un tour (effectif, décisions, moyennes, taux d'admission)"""
+    return statistiques.bilan(tour)
+
+
+def repartition(tour, critere):
+    """Répartition des décisions d'un tour par établissement, sexe ou type de candidat"""
+    return statistiques.repartition(tour, critere)
+
+
+# ======================= CONSOLIDATION NATIONALE ======================== #
+
+def exporter_centre(chemin, complet=False, nouveau_code=False):
+    """Paquet du centre pour la base nationale : les candidats modifiés depuis le dernier export
+    (tous si complet). nouveau_code : la base est une copie de celle d'un autre centre, elle reçoit
+    son propre code et le paquet est complet. Retourne la version du journal incluse"""
+    if nouveau_code:
+        consolidation.nouveau_code_centre()
+    return consolidation.exporter_centre(chemin, 0 if complet else consolidation.derniere_exportation())
+
+
+def fusionner_centres(chemins, progression=None):
+    """Fusionne des paquets de centres dans la base courante ; retourne (bilans, erreurs)"""
+    return consolidation.fusionner(chemins, progression)
@@ -0,0 +1,335 @@
+import io
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from html import escape
+from itertools import groupby
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm, mm
+from reportlab.platypus import BaseDocTemplate, Frame, PageBreak, PageTemplate, Paragraph, Spacer, Table, TableStyle
+
+import connexion
+import depot
+
+# Styles partagés par tous les documents
+STYLES = getSampleStyleSheet()
+STYLE_TABLEAU = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),  # En-tête en gris
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),  # Texte en blanc
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),  # Centrer les textes
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),  # Police de l'en-tête
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),  # Fond beige pour le reste
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black)  # Bordures de tableau
+])
+
+# Mise en page : marges, hauteur des lignes de tableau
+MARGE = 1.5 * cm
+MARGE_HAUTE = 2.5 * cm
+HAUTEUR_LIGNE = 18
+HAUTEUR_ENTETE = 22
+
+# Colonnes (en-tête, largeur) des listes de résultats
+COLONNES_LISTE = [("Numéro de Table", 100), ("Nom", 150), ("Prénom", 150), ("Points", 100)]
+COLONNES_LISTE_DATE = [("Numéro de Table", 100), ("Nom", 120), ("Prénom", 140), ("Date de Naissance", 110),
+                       ("Points", 80)]
+
+# Modèles des listes de résultats : (titre, fichier, colonnes)
+LISTES = {
+    (1, "admis"): ("Liste des admis au premier tour", "liste_admis.pdf", COLONNES_LISTE),
+    (1, "admissibles"): ("Liste des candidats admissibles au 2e tour", "liste_admissibles.pdf", COLONNES_LISTE_DATE),
+    (1, "ajournes"): ("Liste des candidats ajournés", "liste_ajournes.pdf", COLONNES_LISTE_DATE),
+    (2, "admis"): ("Liste des admis du deuxième tour", "liste_admis_2eme_tour.pdf", COLONNES_LISTE),
+    (2, "ajournes"): ("Liste des ajournés du deuxième tour", "liste_ajournes_2eme_tour.pdf", COLONNES_LISTE_DATE),
+}
+
+COLONNES_PV = [("N° Table", 60), ("Nom", 105), ("Prénom", 115), ("Points", 55), ("Moyenne", 55),
+               ("Décision", 90), ("Repêch.", 45)]
+COLONNES_RELEVE = [("Matière", 180), ("1er Tour", 90), ("2e Tour", 90), ("Coeff", 60)]
+
+# Liste d'émargement des candidats (largeurs en mm, comme l'ancien export)
+COLONNES_CANDIDATS = [("N°", 12), ("Nom", 24), ("Prénom", 24), ("Date", 18), ("Lieu", 20), ("Sex.", 8),
+                      ("Type", 13), ("Étab.", 26), ("Nat.", 12), ("Signature", 23)]
+COLONNES_CANDIDATS = [(entete, largeur * mm) for entete, largeur in COLONNES_CANDIDATS]
+STYLE_TABLEAU_COMPACT = TableStyle(STYLE_TABLEAU.getCommands() + [('FONTSIZE', (0, 0), (-1, -1), 7)])
+TYPES_ABREGES = {"Candidat normal": "Normal", "Candidat libre": "Libre"}
+
+# Relevés en lot : candidats par tâche envoyée à un processus
+TAILLE_TRANCHE = 250
+
+
+# ======================= MOTEUR ======================== #
+
+def _document(chemin, titre=None):
+    """Document A4 : le titre (s'il y en a un) et le numéro de page sont dessinés sur chaque page"""
+    doc = BaseDocTemplate(chemin, pagesize=A4, title=titre or "", leftMargin=MARGE, rightMargin=MARGE,
+                          topMargin=MARGE_HAUTE, bottomMargin=MARGE, pageCompression=1)
+    largeur, hauteur = A4
+
+    def decorer(canvas, doc):
+        canvas.saveState()
+        if titre:
+            canvas.setFont("Helvetica-Bold", 16)
+            canvas.drawCentredString(largeur / 2, hauteur - 1.5 * cm, titre)
+        canvas.setFont("Helvetica", 9)
+        canvas.drawRightString(largeur - MARGE, 1 * cm, f"Page {doc.page}")
+        canvas.restoreState()
+
+    cadre = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id="corps")
+    doc.addPageTemplates([PageTemplate(id="page", frames=[cadre], onPage=decorer)])
+    return doc
+
+
+class _Flux(list):
+    """Liste de flowables remplie à la demande par un générateur.
+
+    ReportLab ne consomme le récit que par la tête (flowables[0]) : on ne garde en mémoire que
+    le flowable en cours au lieu du document entier.
+    """
+
+    def __init__(self, source):
+        super().__init__()
+        self._source = iter(source)
+
+    def __len__(self):
+        if not super().__len__():
+            suivant = next(self._source, None)
+            if suivant is not None:
+                self.append(suivant)
+        return super().__len__()
+
+
+def _construire(doc, recit):
+    """Met en page un récit (générateur de flowables) ; la pagination est faite par ReportLab"""
+    doc.build(_Flux(recit))
+
+
+def _tableau(colonnes, lignes, style=STYLE_TABLEAU):
+    table = Table([[entete for entete, _ in colonnes]] + lignes, colWidths=[largeur for _, largeur in colonnes],
+                  rowHeights=[HAUTEUR_ENTETE] + [HAUTEUR_LIGNE] * len(lignes), repeatRows=1)
+    table.setStyle(style)
+    return table
+
+
+def _tableaux(colonnes, lignes, doc, style=STYLE_TABLEAU, progression=None):
+    """Découpe un flux de lignes en tableaux d'une page (en-tête répété), sans tout charger en mémoire"""
+    par_page = int((doc.height - HAUTEUR_ENTETE - 6) // HAUTEUR_LIGNE)
+    lot = []
+    faites = 0
+    for ligne in lignes:
+        lot.append(ligne)
+        if len(lot) == par_page:
+            yield _tableau(colonnes, lot, style)
+            faites += len(lot)
+            lot = []
+            if progression:
+                progression(faites, 0)
+    if lot:
+        yield _tableau(colonnes, lot, style)
+
+
+def _nombre(valeur):
+    """Texte d'une note ou d'un total (2 décimales, '-' si absent)"""
+    return "-" if valeur is None else str(round(valeur, 2))
+
+
+def _texte(valeur):
+    """Texte d'une valeur SQL quelconque (réels arrondis à 2 décimales, '-' si absente)"""
+    return _nombre(valeur) if valeur is None or isinstance(valeur, float) else str(valeur)
+
+
+# ======================= LISTES ET PV ======================== #
+
+def generer_liste(tour, categorie, chemin=None, progression=None):
+    """Génère la liste PDF d'une catégorie de résultats (admis, admissibles, ajournés) ; retourne le chemin"""
+    titre, fichier, colonnes = LISTES[(tour, categorie)]
+    chemin = chemin or fichier
+    avec_date = colonnes is COLONNES_LISTE_DATE
+
+    lignes = ([str(numero_table), nom, prenom] + ([date_naissance] if avec_date else []) + [_nombre(total_points)]
+              for _, numero_table, nom, prenom, date_naissance, total_points in depot.iterer_resultats(tour, categorie))
+
+    doc = _document(chemin, titre)
+    _construire(doc, _tableaux(colonnes, lignes, doc, progression=progression))
+    return chemin
+
+
+def generer_pv(tour, chemin=None, jury="", progression=None):
+    """Génère le procès-verbal de délibération d'un tour : bilan, liste par mérite et signatures"""
+    libelle_tour = "premier tour" if tour == 1 else "deuxième tour"
+    chemin = chemin or f"pv_deliberation_tour_{tour}.pdf"
+    effectifs, repechables = depot.bilan_deliberation(tour)
+    total = sum(effectifs.values())
+    admis = effectifs.get("Admis d'office", 0)
+
+    def recit():
+        yield Paragraph(f"Procès-verbal de délibération du {libelle_tour}", STYLES["Title"])
+        yield Paragraph(f"{jury} — séance du {date.today():%d/%m/%Y}", STYLES["Normal"])
+        yield Spacer(1, 12)
+
+        bilan = [["Décision", "Effectif"]] + [[presentation or "Non délibéré", str(nombre)]
+                                              for presentation, nombre in sorted(effectifs.items(),
+                                                                                 key=lambda e: e[0] or "")]
+        bilan += [["Repêchables", str(repechables)], ["Total", str(total)],
+                  ["Taux d'admission", f"{100 * admis / total:.2f} %" if total else "-"]]
+        table = Table(bilan, colWidths=[200, 100])
+        table.setStyle(STYLE_TABLEAU)
+        yield table
+        yield Spacer(1, 18)
+
+        lignes = ([str(numero_table), nom, prenom, _nombre(total_points), _nombre(moyenne), presentation or "-",
+                   "Oui" if repechable else "-"]
+                  for numero_table, nom, prenom, total_points, moyenne, presentation, repechable
+                  in depot.iterer_deliberation(tour))
+        yield from _tableaux(COLONNES_PV, lignes, doc, progression=progression)
+
+        yield Spacer(1, 36)
+        signatures = Table([["Le Président du jury", "Les membres du jury"]], colWidths=[doc.width / 2] * 2,
+                           rowHeights=[80])
+        signatures.setStyle(TableStyle([('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                                        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold')]))
+        yield signatures
+
+    doc = _document(chemin)
+    _construire(doc, recit())
+    return chemin
+
+
+def generer_liste_candidats(chemin="liste_candidats.pdf", progression=None):
+    """Génère la liste d'émargement de tous les candidats (triés par nom) ; retourne le nombre de candidats"""
+    nombre = 0
+
+    def lignes():
+        nonlocal nombre
+        for ligne in depot.iterer_candidats_export():
+            nombre += 1
+            *valeurs, type_candidat, etablissement, nationalite = [_texte(valeur) for valeur in ligne]
+            yield valeurs + [TYPES_ABREGES.get(type_candidat, type_candidat), etablissement, nationalite, ""]
+
+    doc = _document(chemin, "Liste des Candidats")
+    _construire(doc, _tableaux(COLONNES_CANDIDATS, lignes(), doc, STYLE_TABLEAU_COMPACT, progression))
+    return nombre
+
+
+# ======================= IMPRESSION ======================== #
+
+def tableau_html(entetes, lignes, progression=None):
+    """Tableau HTML d'un flux de lignes, écrit au fil de l'eau dans un tampon (coût linéaire)"""
+    tampon = io.StringIO()
+    tampon.write("<table border='1' cellpadding='5' cellspacing='0'><tr>")
+    for entete in entetes:
+        tampon.write(f"<th>{escape(entete)}</th>")
+    tampon.write("</tr>")
+
+    for numero, ligne in enumerate(lignes, start=1):
+        tampon.write("<tr>")
+        for valeur in ligne:
+            tampon.write(f"<td>{escape(_texte(valeur))}</td>")
+        tampon.write("</tr>")
+        if progression and numero % 1000 == 0:
+            progression(numero, 0)
+
+    tampon.write("</table>")
+    return tampon.getvalue()
+
+
+# ======================= RELEVÉS DE NOTES ======================== #
+
+def _releve(lignes):
+    """Flowables du relevé d'un candidat à partir de ses lignes (voir depot.iterer_releves)"""
+    _, numero_table, nom, prenom, total_points, moyenne = lignes[0][:6]
+    notes = [[matiere, _nombre(note1), _nombre(note2), str(coefficient)]
+             for *_, matiere, note1, note2, coefficient in lignes if matiere is not None]
+
+    yield Paragraph(f"Relevé de Notes - {prenom} {nom} (Table {numero_table})", STYLES["Title"])
+    yield Spacer(1, 12)
+    if notes:
+        yield _tableau(COLONNES_RELEVE, notes)
+    yield Spacer(1, 12)
+    yield Paragraph(f"Total Points : {_nombre(total_points)} &nbsp;&nbsp; Moyenne : {_nombre(moyenne)}",
+                    STYLES["Heading3"])
+
+
+def _par_candidat(premier_id, dernier_id, tour):
+    """Regroupe le flux des relevés par candidat : (numero_table, lignes)"""
+    for _, lignes in groupby(depot.iterer_releves(premier_id, dernier_id, tour), key=lambda ligne: ligne[0]):
+        lignes = list(lignes)
+        yield lignes[0][1], lignes
+
+
+def _nom_fichier(numero_table):
+    return "releve_" + re.sub(r"[^\w-]", "_", str(numero_table)) + ".pdf"
+
+
+def generer_releve(candidat_id, chemin, tour=1):
+    """Génère le relevé de notes PDF d'un candidat ; retourne False si le candidat est introuvable"""
+    for _, lignes in _par_candidat(candidat_id, candidat_id, tour):
+        _construire(_document(chemin), _releve(lignes))
+        return True
+    return False
+
+
+def _generer_tranche(dossier, premier_id, dernier_id, tour):
+    """Tâche d'un processus : un fichier par candidat d'une tranche ; retourne le nombre de relevés"""
+    nombre = 0
+    for numero_table, lignes in _par_candidat(premier_id, dernier_id, tour):
+        _construire(_document(os.path.join(dossier, _nom_fichier(numero_table))), _releve(lignes))
+        nombre += 1
+    return nombre
+
+
+def _initialiser_processus(chemin_base):
+    # Processus démarré à neuf (spawn) : il ouvre sa propre connexion sur la même base
+    connexion.CHEMIN_BASE = chemin_base
+
+
+def generer_releves(destination, tour=1, un_fichier_par_candidat=False, processus=None, progression=None):
+    """Génère les relevés de notes de tous les candidats ; retourne le nombre de relevés.
+
+    Un seul PDF (`destination` est un fichier) ou un fichier par candidat (`destination` est un
+    dossier, tranches réparties sur un pool de processus). progression(faits, total) est appelée
+    au fil de l'eau.
+    """
+    tranches = depot.tranches_candidats(TAILLE_TRANCHE)
+    total = depot.compter_candidats()
+
+    if not un_fichier_par_candidat:
+        def recit():
+            faits = 0
+            for premier_id, dernier_id in tranches:
+                for _, lignes in _par_candidat(premier_id, dernier_id, tour):
+                    if faits:
+                        yield PageBreak()
+                    yield from _releve(lignes)
+                    faits += 1
+                if progression:
+                    progression(faits, total)
+
+        _construire(_document(destination), recit())
+        return total
+
+    os.makedirs(destination, exist_ok=True)
+    faits = 0
+    # Pas de fork : le processus fils hériterait de la connexion SQLite du thread appelant
+    with ProcessPoolExecutor(max_workers=processus, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_initialiser_processus,
+                             initargs=(os.path.abspath(connexion.CHEMIN_BASE),)) as pool:
+        taches = [pool.submit(_generer_tranche, destination, premier_id, dernier_id, tour)
+                  for premier_id, dernier_id in tranches]
+        try:
+            for tache in as_completed(taches):
+                faits += tache.result()
+                if progression:
+                    progression(faits, total)
+        except BaseException:
+            # Annulation ou erreur : les tranches pas encore commencées sont abandonnées
+            for tache in taches:
+                tache.cancel()
+            raise
+    return faits
@@ -0,0 +1,308 @@
+import connexion
+
+# Tables de résultats et colonnes de notes de chaque tour
+RESULTATS = {1: "resultat", 2: "resultat_2e_tour"}
+COLONNES_NOTE = {1: "note_premier_tour", 2: "note_deuxieme_tour"}
+
+# Critères de répartition des résultats (colonnes de la table candidat)
+CRITERES = {"etablissement": "Établissement", "sexe": "Sexe", "type_candidat": "Type de candidat"}
+
+PRESENTATION_VIDE = "Non délibéré"
+ADMIS = "Admis d'office"
+
+# Histogrammes : tranches d'un point, la note 20 est comptée dans la dernière tranche [19, 20]
+NOMBRE_TRANCHES = 20
+
+# Tables de synthèse tenues à jour par triggers : les statistiques se lisent sans parcourir
+# les tables de candidats, de notes ni de résultats.
+_TABLES = [
+    # Effectifs et sommes par tour, établissement, sexe, type de candidat et décision
+    """
+    CREATE TABLE IF NOT EXISTS stat_resultat (
+        tour INTEGER NOT NULL,
+        etablissement TEXT NOT NULL,
+        sexe TEXT NOT NULL,
+        type_candidat TEXT NOT NULL,
+        presentation TEXT NOT NULL,
+        effectif INTEGER NOT NULL DEFAULT 0,
+        repechables INTEGER NOT NULL DEFAULT 0,
+        somme_points REAL NOT NULL DEFAULT 0,
+        somme_moyennes REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (tour, etablissement, sexe, type_candidat, presentation)
+    ) WITHOUT ROWID
+    """,
+    # Effectif et somme des notes par matière, tour et tranche d'un point
+    """
+    CREATE TABLE IF NOT EXISTS stat_note (
+        matiere_id INTEGER NOT NULL,
+        tour INTEGER NOT NULL,
+        tranche INTEGER NOT NULL,
+        effectif INTEGER NOT NULL DEFAULT 0,
+        somme REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (matiere_id, tour, tranche)
+    ) WITHOUT ROWID
+    """,
+]
+
+
+# ======================= TRIGGERS ======================== #
+# Comme pour le suivi de délibération, une ligne de synthèse manquante est créée avec NOT EXISTS
+# (un INSERT OR IGNORE ou un UPSERT hériterait de la politique de conflit de l'instruction
+# déclenchante), puis ses compteurs sont incrémentés ou décrémentés par UPDATE.
+
+def _compter(table, cle, valeurs, signe):
+    """Instructions ajoutant (signe '+') ou retirant (signe '-') une ligne dans sa synthèse.
+
+    `cle` et `valeurs` associent les colonnes de la table de synthèse à des expressions SQL ;
+    une clé NULL (ligne source introuvable) n'a aucun effet.
+    """
+    condition = " AND ".join(f"{colonne} = {expression}" for colonne, expression in cle.items())
+    instructions = ""
+    if signe == "+":
+        instructions += f"""
+            INSERT INTO {table} ({", ".join(cle)})
+            SELECT {", ".join(cle.values())}
+            WHERE {" AND ".join(f"{expression} IS NOT NULL" for expression in cle.values())}
+              AND NOT EXISTS (SELECT 1 FROM {table} WHERE {condition});"""
+    affectations = ", ".join(f"{colonne} = {colonne} {signe} {expression}" for colonne, expression in valeurs.items())
+    return instructions + f"""
+            UPDATE {table} SET {affectations} WHERE {condition};"""
+
+
+def _resultat(tour, ligne):
+    """Clé et valeurs de synthèse d'une ligne de résultat (NEW ou OLD)"""
+    candidat = f"(SELECT {{}} FROM candidat WHERE id = {ligne}.candidat_id)"
+    cle = {"tour": str(tour),
+           "etablissement": candidat.format("etablissement"),
+           "sexe": candidat.format("sexe"),
+           "type_candidat": candidat.format("type_candidat"),
+           "presentation": f"COALESCE({ligne}.presentation, '{PRESENTATION_VIDE}')"}
+    valeurs = {"effectif": "1",
+               "repechables": f"COALESCE({ligne}.repechable, 0)",
+               "somme_points": f"COALESCE({ligne}.total_points, 0)",
+               "somme_moyennes": f"COALESCE({ligne}.moyenne, 0)"}
+    return cle, valeurs
+
+
+def _resultat_du_candidat(tour, ligne):
+    """Clé et valeurs de synthèse du résultat d'un candidat (ligne NEW ou OLD de candidat)"""
+    resultat = f"(SELECT {{}} FROM {RESULTATS[tour]} WHERE candidat_id = {ligne}.id)"
+    cle = {"tour": str(tour),
+           "etablissement": f"{ligne}.etablissement",
+           "sexe": f"{ligne}.sexe",
+           "type_candidat": f"{ligne}.type_candidat",
+           "presentation": resultat.format(f"COALESCE(presentation, '{PRESENTATION_VIDE}')")}
+    valeurs = {"effectif": "1",
+               "repechables": resultat.format("COALESCE(repechable, 0)"),
+               "somme_points": resultat.format("COALESCE(total_points, 0)"),
+               "somme_moyennes": resultat.format("COALESCE(moyenne, 0)")}
+    return cle, valeurs
+
+
+def _note(tour, ligne):
+    """Clé et valeurs de synthèse de la note d'un tour d'une ligne de note (NEW ou OLD)"""
+    note = f"{ligne}.{COLONNES_NOTE[tour]}"
+    cle = {"matiere_id": f"{ligne}.matiere_id",
+           "tour": str(tour),
+           "tranche": f"MIN(CAST({note} AS INTEGER), {NOMBRE_TRANCHES - 1})"}
+    return cle, {"effectif": "1", "somme": note}
+
+
+def _triggers():
+    triggers = []
+    for tour, table in RESULTATS.items():
+        triggers += [
+            f"""
+            CREATE TRIGGER IF NOT EXISTS stat_{table}_insert AFTER INSERT ON {table}
+            BEGIN {_compter("stat_resultat", *_resultat(tour, "NEW"), "+")}
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS stat_{table}_update
+            AFTER UPDATE OF total_points, moyenne, repechable, presentation, candidat_id ON {table}
+            BEGIN {_compter("stat_resultat", *_resultat(tour, "OLD"), "-")}
+                  {_compter("stat_resultat", *_resultat(tour, "NEW"), "+")}
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS stat_{table}_delete AFTER DELETE ON {table}
+            BEGIN {_compter("stat_resultat", *_resultat(tour, "OLD"), "-")}
+            END
+            """,
+        ]
+
+    for tour, colonne in COLONNES_NOTE.items():
+        triggers += [
+            f"""
+            CREATE TRIGGER IF NOT EXISTS stat_note_{tour}_insert AFTER INSERT ON note
+            WHEN NEW.{colonne} IS NOT NULL
+            BEGIN {_compter("stat_note", *_note(tour, "NEW"), "+")}
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS stat_note_{tour}_update AFTER UPDATE OF {colonne}, matiere_id ON note
+            WHEN OLD.{colonne} IS NOT NEW.{colonne} OR OLD.matiere_id IS NOT NEW.matiere_id
+            BEGIN {_compter("stat_note", *_note(tour, "OLD"), "-")}
+                  {_compter("stat_note", *_note(tour, "NEW"), "+")}
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS stat_note_{tour}_delete AFTER DELETE ON note
+            WHEN OLD.{colonne} IS NOT NULL
+            BEGIN {_compter("stat_note", *_note(tour, "OLD"), "-")}
+            END
+            """,
+        ]
+
+    # Un candidat qui change de groupe (ou disparaît) déplace ses résultats des deux tours.
+    # BEFORE DELETE : ses résultats sont encore lisibles, qu'ils soient supprimés en cascade ou non.
+    deplacer = "".join(_compter("stat_resultat", *_resultat_du_candidat(tour, "OLD"), "-")
+                       + _compter("stat_resultat", *_resultat_du_candidat(tour, "NEW"), "+") for tour in RESULTATS)
+    retirer = "".join(_compter("stat_resultat", *_resultat_du_candidat(tour, "OLD"), "-") for tour in RESULTATS)
+    triggers += [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS stat_candidat_update AFTER UPDATE OF etablissement, sexe, type_candidat ON candidat
+        WHEN OLD.etablissement IS NOT NEW.etablissement OR OLD.sexe IS NOT NEW.sexe
+             OR OLD.type_candidat IS NOT NEW.type_candidat
+        BEGIN {deplacer}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS stat_candidat_delete BEFORE DELETE ON candidat
+        BEGIN {retirer}
+        END
+        """,
+    ]
+    return triggers
+
+
+def _agregats(filtre=""):
+    """Contributions aux tables de synthèse : [(table, clés, compteurs, SELECT)], les colonnes du SELECT
+    portant le nom des colonnes de la table. `filtre` (sous-requête d'id) restreint les candidats."""
+    cles_resultat = ["tour", "etablissement", "sexe", "type_candidat", "presentation"]
+    compteurs_resultat = ["effectif", "repechables", "somme_points", "somme_moyennes"]
+    requetes = []
+    for tour, table in RESULTATS.items():
+        requetes.append(("stat_resultat", cles_resultat, compteurs_resultat, f"""
+            SELECT {tour} AS tour, c.etablissement, c.sexe, c.type_candidat,
+                   COALESCE(r.presentation, '{PRESENTATION_VIDE}') AS presentation,
+                   COUNT(*) AS effectif, SUM(COALESCE(r.repechable, 0)) AS repechables,
+                   SUM(COALESCE(r.total_points, 0)) AS somme_points, SUM(COALESCE(r.moyenne, 0)) AS somme_moyennes
+            FROM {table} r
+            JOIN candidat c ON c.id = r.candidat_id
+            {f"WHERE c.id IN ({filtre})" if filtre else ""}
+            GROUP BY 2, 3, 4, 5
+        """))
+    for tour, colonne in COLONNES_NOTE.items():
+        requetes.append(("stat_note", ["matiere_id", "tour", "tranche"], ["effectif", "somme"], f"""
+            SELECT matiere_id, {tour} AS tour, MIN(CAST({colonne} AS INTEGER), {NOMBRE_TRANCHES - 1}) AS tranche,
+                   COUNT(*) AS effectif, SUM({colonne}) AS somme
+            FROM note
+            WHERE {colonne} IS NOT NULL {f"AND candidat_id IN ({filtre})" if filtre else ""}
+            GROUP BY 1, 3
+        """))
+    return requetes
+
+
+def reconstruire(cursor):
+    """Recalcule entièrement les tables de synthèse (installation ou réparation)"""
+    cursor.execute("DELETE FROM stat_resultat")
+    cursor.execute("DELETE FROM stat_note")
+    for table, cles, compteurs, requete in _agregats():
+        cursor.execute(f"INSERT INTO {table} ({', '.join(cles + compteurs)}) {requete}")
+
+
+def ajuster(cursor, candidats, signe):
+    """Ajoute (signe = 1) ou retire (signe = -1) en bloc la contribution de candidats (sous-requête
+    de leurs id) : pour les écritures de masse faites triggers suspendus"""
+    for table, cles, compteurs, requete in _agregats(candidats):
+        # Hors d'un trigger, l'UPSERT est sûr ; « WHERE true » lève l'ambiguïté avec ON CONFLICT
+        cursor.execute(f"""
+            INSERT INTO {table} ({", ".join(cles + compteurs)})
+            SELECT {", ".join(cles + [f"{signe} * {compteur}" for compteur in compteurs])} FROM ({requete}) WHERE true
+            ON CONFLICT DO UPDATE SET {", ".join(f"{compteur} = {compteur} + excluded.{compteur}"
+                                                 for compteur in compteurs)}
+        """)
+
+
+def installer(cursor):
+    """Crée les tables de synthèse et leurs triggers, puis les remplit depuis les données existantes"""
+    for instruction in _TABLES + _triggers():
+        cursor.execute(instruction)
+    reconstruire(cursor)
+
+
+# ======================= LECTURE ======================== #
+
+def marqueur():
+    """Valeur qui change dès qu'une écriture a été validée sur la base (par ce thread ou un autre)"""
+    conn = connexion.get_connexion()
+    return conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes
+
+
+def bilan(tour):
+    """Chiffres clés d'un tour : effectif, effectifs par décision, repêchables, moyenne, taux d'admission.
+
+    La moyenne et le taux d'admission ne portent que sur les candidats délibérés (`deliberes`) :
+    les résultats « Non délibéré » valent 0 et fausseraient les deux. None si personne n'est délibéré.
+    """
+    lignes = connexion.get_connexion().execute("""
+        SELECT presentation, SUM(effectif), SUM(repechables), SUM(somme_points), SUM(somme_moyennes)
+        FROM stat_resultat
+        WHERE tour = ?
+        GROUP BY presentation
+    """, (tour,)).fetchall()
+
+    decisions = {presentation: nombre for presentation, nombre, *_ in lignes if nombre}
+    deliberees = [ligne for ligne in lignes if ligne[0] != PRESENTATION_VIDE]
+    deliberes = sum(ligne[1] for ligne in deliberees)
+    return {
+        "effectif": sum(ligne[1] for ligne in lignes),
+        "deliberes": deliberes,
+        "decisions": decisions,
+        "repechables": sum(ligne[2] for ligne in deliberees),
+        "moyenne_points": sum(ligne[3] for ligne in deliberees) / deliberes if deliberes else None,
+        "moyenne": sum(ligne[4] for ligne in deliberees) / deliberes if deliberes else None,
+        "taux_admission": decisions.get(ADMIS, 0) / deliberes if deliberes else None,
+    }
+
+
+def repartition(tour, critere):
+    """Résultats des candidats délibérés d'un tour, ventilés selon un critère (voir CRITERES) :
+    [(valeur, effectif, admis, taux d'admission, moyenne, repêchables)] par effectif décroissant
+    """
+    if critere not in CRITERES:
+        raise ValueError(f"Critère inconnu : {critere}")
+    lignes = connexion.get_connexion().execute(f"""
+        SELECT {critere}, SUM(effectif),
+               SUM(CASE WHEN presentation = ? THEN effectif ELSE 0 END),
+               SUM(somme_moyennes), SUM(repechables)
+        FROM stat_resultat
+        WHERE tour = ? AND presentation <> ?
+        GROUP BY {critere}
+        HAVING SUM(effectif) > 0
+        ORDER BY 2 DESC, 1
+    """, (ADMIS, tour, PRESENTATION_VIDE)).fetchall()
+    return [(valeur, effectif, admis, admis / effectif, somme_moyennes / effectif, repechables)
+            for valeur, effectif, admis, somme_moyennes, repechables in lignes]
+
+
+def histogramme(matiere_id, tour):
+    """Distribution des notes d'une matière : effectif de chaque tranche d'un point (0 à 19)"""
+    effectifs = [0] * NOMBRE_TRANCHES
+    for tranche, effectif in connexion.get_connexion().execute(
+            "SELECT tranche, effectif FROM stat_note WHERE matiere_id = ? AND tour = ?", (matiere_id, tour)):
+        effectifs[tranche] = effectif
+    return effectifs
+
+
+def moyennes_matieres(tour):
+    """[(matiere_id, nom, nombre de notes, moyenne)] des matières d'un tour"""
+    return connexion.get_connexion().execute("""
+        SELECT m.id, m.nom, COALESCE(SUM(s.effectif), 0), SUM(s.somme) / NULLIF(SUM(s.effectif), 0)
+        FROM matiere m
+        LEFT JOIN stat_note s ON s.matiere_id = m.id AND s.tour = m.tour
+        WHERE m.tour = ?
+        GROUP BY m.id
+        ORDER BY m.id
+    """, (tour,)).fetchall()
@@ -0,0 +1,203 @@
+import sqlite3
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtWidgets import QHBoxLayout, QLabel, QProgressBar, QPushButton, QVBoxLayout, QWidget
+
+from connexion import fermer_connexion, get_connexion
+
+# États d'une tâche (libellés affichés dans le panneau)
+EN_ATTENTE = "⏳ En attente"
+EN_COURS = "⚙️ En cours"
+TERMINEE = "✅ Terminée"
+ANNULEE = "⛔ Annulée"
+ECHOUEE = "❌ Échec"
+
+# Attente maximale des tâches annulées à la fermeture de l'application (ms)
+DELAI_FERMETURE = 5000
+
+# Instructions SQLite entre deux vérifications de l'annulation pendant une requête
+INSTRUCTIONS_ANNULATION = 10000
+
+
+class TacheAnnulee(Exception):
+    """Levée dans le thread de la tâche quand l'utilisateur l'a annulée"""
+
+
+class SignauxTache(QObject):
+    """Signaux d'une tâche (un QRunnable ne peut pas en émettre lui-même)"""
+
+    etat = pyqtSignal(str)
+    progression = pyqtSignal(int, int)  # (faits, total) ; total à 0 = durée inconnue
+    terminee = pyqtSignal(object)  # résultat de la fonction
+    echouee = pyqtSignal(str)  # message d'erreur
+
+
+class Tache(QRunnable):
+    """Exécute `fonction(tache)` dans un thread du pool.
+
+    La fonction signale son avancement avec tache.avancer(faits, total) ; c'est aussi là que
+    l'annulation est prise en compte. La tâche utilise sa propre connexion SQLite, fermée à la fin :
+    une requête en cours sur cette connexion est aussi interrompue (délibération, import...).
+    """
+
+    def __init__(self, titre, fonction):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.titre = titre
+        self.fonction = fonction
+        self.signaux = SignauxTache()
+        self.etat = EN_ATTENTE
+        self.annulee = False
+
+    def annuler(self):
+        """Demande l'annulation : effective au prochain appel à avancer() ou à la requête SQLite
+        en cours (interrompue, sa transaction est annulée)"""
+        self.annulee = True
+
+    def avancer(self, faits, total=0):
+        if self.annulee:
+            raise TacheAnnulee()
+        self.signaux.progression.emit(int(faits), int(total))
+
+    def _changer_etat(self, etat):
+        self.etat = etat
+        self.signaux.etat.emit(etat)
+
+    def run(self):
+        if self.annulee:
+            self._changer_etat(ANNULEE)
+            return
+
+        self._changer_etat(EN_COURS)
+        try:
+            # Une valeur vraie du gestionnaire interrompt la requête (OperationalError)
+            get_connexion().set_progress_handler(lambda: self.annulee, INSTRUCTIONS_ANNULATION)
+            resultat = self.fonction(self)
+        except TacheAnnulee:
+            self._changer_etat(ANNULEE)
+        except sqlite3.OperationalError as e:
+            # Requête interrompue par annuler()
+            if self.annulee:
+                self._changer_etat(ANNULEE)
+            else:
+                self._echouer(e)
+        except Exception as e:
+            self._echouer(e)
+        else:
+            self._changer_etat(TERMINEE)
+            self.signaux.terminee.emit(resultat)
+        finally:
+            # Les threads du pool sont réutilisés : la connexion de la tâche ne doit pas leur survivre
+            fermer_connexion()
+
+    def _echouer(self, erreur):
+        traceback.print_exc()
+        self._changer_etat(ECHOUEE)
+        self.signaux.echouee.emit(str(erreur))
+
+
+class GestionnaireTaches(QObject):
+    """File des tâches de fond de l'application (pool de threads Qt)"""
+
+    tache_ajoutee = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.taches = []
+
+    def soumettre(self, titre, fonction, terminee=None, echouee=None):
+        """Lance `fonction(tache)` en arrière-plan ; terminee(résultat) et echouee(message) sont
+        appelées dans le thread de l'interface"""
+        tache = Tache(titre, fonction)
+        if terminee:
+            tache.signaux.terminee.connect(terminee)
+        if echouee:
+            tache.signaux.echouee.connect(echouee)
+
+        self.taches.append(tache)
+        self.tache_ajoutee.emit(tache)
+        self.pool.start(tache)
+        return tache
+
+    def oublier_terminees(self):
+        """Retire de la liste les tâches qui ne tournent plus"""
+        self.taches = [tache for tache in self.taches if tache.etat in (EN_ATTENTE, EN_COURS)]
+
+    def annuler_tout(self):
+        for tache in self.taches:
+            tache.annuler()
+
+    def attendre(self, delai=-1):
+        """Attend la fin des tâches en cours (à la fermeture de l'application)"""
+        return self.pool.waitForDone(delai)
+
+
+class LigneTache(QWidget):
+    """Une tâche dans le panneau : titre, état, barre de progression et bouton d'annulation"""
+
+    def __init__(self, tache, parent=None):
+        super().__init__(parent)
+        self.tache = tache
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(5, 2, 5, 2)
+
+        self.titre = QLabel(tache.titre)
+        self.titre.setMinimumWidth(220)
+        self.etat = QLabel(tache.etat)
+        self.etat.setMinimumWidth(110)
+        self.barre = QProgressBar()
+        self.barre.setRange(0, 0)
+        self.annuler = QPushButton("✖", clicked=tache.annuler)
+        self.annuler.setFixedWidth(30)
+        self.annuler.setToolTip("Annuler la tâche")
+
+        for widget in (self.titre, self.etat, self.barre, self.annuler):
+            layout.addWidget(widget)
+
+        tache.signaux.etat.connect(self.maj_etat)
+        tache.signaux.progression.connect(self.maj_progression)
+
+    def maj_etat(self, etat):
+        self.etat.setText(etat)
+        if etat not in (EN_ATTENTE, EN_COURS):
+            self.annuler.setEnabled(False)
+            if self.barre.maximum() == 0:
+                self.barre.setRange(0, 1)
+            if etat == TERMINEE:
+                self.barre.setValue(self.barre.maximum())
+
+    def maj_progression(self, faits, total):
+        self.barre.setRange(0, total)
+        self.barre.setValue(min(faits, total) if total else 0)
+
+
+class PanneauTaches(QWidget):
+    """Liste des tâches de fond, mise à jour par leurs signaux"""
+
+    def __init__(self, gestionnaire, parent=None):
+        super().__init__(parent)
+        self.gestionnaire = gestionnaire
+        layout = QVBoxLayout(self)
+
+        self.lignes = QVBoxLayout()
+        layout.addLayout(self.lignes)
+        layout.addStretch()
+
+        effacer = QPushButton("🧹 Effacer les tâches terminées", clicked=self.effacer_terminees)
+        effacer.setStyleSheet("background-color: #555; color: white; padding: 6px; border-radius: 5px;")
+        layout.addWidget(effacer)
+
+        gestionnaire.tache_ajoutee.connect(self.ajouter)
+
+    def ajouter(self, tache):
+        self.lignes.addWidget(LigneTache(tache, self))
+
+    def effacer_terminees(self):
+        self.gestionnaire.oublier_terminees()
+        for position in reversed(range(self.lignes.count())):
+            ligne = self.lignes.itemAt(position).widget()
+            if ligne.tache not in self.gestionnaire.taches:
+                self.lignes.removeWidget(ligne)
+                ligne.deleteLater()
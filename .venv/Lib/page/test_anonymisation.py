@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+import anonymisation
+
+
+def _inscrire(conn, prefixe, nombre):
+    """Candidats sans anonymat : seuls le numéro de table et les champs obligatoires comptent ici"""
+    with conn:
+        conn.executemany("""
+            INSERT INTO candidat (numero_table, prenom, nom, date_naissance, lieu_naissance, sexe,
+                                  type_candidat, etablissement, nationalite, etat_sportif)
+            VALUES (?, 'Moussa', 'Ndiaye', '2009-01-01', 'Thiès', 'M', 'Candidat normal', 'CEM Thiès',
+                    'Sénégalaise', 'Apte')
+        """, [(f"{prefixe}{numero:04d}",) for numero in range(nombre)])
+
+
+def _anonymats(conn):
+    return dict(conn.execute("SELECT id, anonymat FROM candidat").fetchall())
+
+
+@pytest.mark.parametrize("graine", range(20))
+def test_tirage_sans_remise(graine):
+    aleatoire = random.Random(graine)
+    deja_pris = aleatoire.sample(range(90, 160), 30) + [5, 500]  # dont des numéros hors de l'intervalle
+    libres = set(range(100, 150)) - set(deja_pris)
+    nombre = aleatoire.randint(1, len(libres))
+
+    numeros = anonymisation.tirer_sans_remise(100, 150, deja_pris, nombre, aleatoire)
+    assert len(numeros) == nombre
+    assert len(set(numeros)) == nombre
+    assert set(numeros) <= libres
+
+
+def test_tirage_de_tous_les_numeros_libres():
+    numeros = anonymisation.tirer_sans_remise(10, 20, [10, 13, 19], 7, random.Random(0))
+    assert sorted(numeros) == [11, 12, 14, 15, 16, 17, 18]
+
+
+def test_tirage_uniforme():
+    # Chaque numéro libre doit pouvoir sortir, à fréquence comparable
+    aleatoire = random.Random(0)
+    effectifs = {}
+    for _ in range(3000):
+        for numero in anonymisation.tirer_sans_remise(0, 10, [2, 3, 7], 2, aleatoire):
+            effectifs[numero] = effectifs.get(numero, 0) + 1
+    assert set(effectifs) == {0, 1, 4, 5, 6, 8, 9}
+    assert max(effectifs.values()) < 1.2 * min(effectifs.values())
+
+
+def test_tirage_impossible():
+    with pytest.raises(ValueError):
+        anonymisation.tirer_sans_remise(0, 10, [1, 2], 9)
+
+
+def test_largeur_automatique():
+    assert anonymisation.largeur_automatique(1) == anonymisation.LARGEUR_MINIMALE
+    assert anonymisation.largeur_automatique(900) == 4
+    assert anonymisation.largeur_automatique(901) == 5
+
+
+def test_attribution(base):
+    _inscrire(base, "G", 150)
+    assert anonymisation.attribuer_anonymats(base) == 150
+
+    anonymats = _anonymats(base)
+    assert len(set(anonymats.values())) == 150
+    assert all(1000 <= anonymat <= 9999 for anonymat in anonymats.values())
+    assert anonymisation.attribuer_anonymats(base) == 0
+
+    # Les nouveaux candidats reçoivent des numéros libres, les anciens gardent le leur
+    _inscrire(base, "H", 50)
+    assert anonymisation.attribuer_anonymats(base) == 50
+    apres = _anonymats(base)
+    assert {candidat_id: apres[candidat_id] for candidat_id in anonymats} == anonymats
+    assert len(set(apres.values())) == 200
+
+
+def test_attribution_impossible_annulee(base):
+    _inscrire(base, "G", 20)
+    # Un seul chiffre : 9 numéros pour 20 candidats
+    with pytest.raises(ValueError):
+        anonymisation.attribuer_anonymats(base, largeur=1)
+    assert not base.in_transaction
+    assert set(_anonymats(base).values()) == {0}
@@ -0,0 +1,65 @@
+import json
+
+import benchmark
+import cli
+import connexion
+
+CLES_MESURE = {"version", "date", "python", "sqlite", "machine", "taille", "etape", "secondes"}
+
+
+def test_generer_deliberer_stats(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(connexion, "CHEMIN_BASE", connexion.CHEMIN_BASE)
+    base = str(tmp_path / "jury.db")
+
+    assert cli.main(["--base", base, "stats"]) == 0
+    assert "0 candidat(s) dont 0 délibéré(s), moyenne -, taux d'admission -" in capsys.readouterr().out
+
+    assert cli.main(["--base", base, "generer", "60", "--graine", "5"]) == 0
+    assert cli.main(["--base", base, "anonymat"]) == 0
+    assert cli.main(["--base", base, "deliberer", "--tour", "1"]) == 0
+    assert "60 candidat(s) délibéré(s)" in capsys.readouterr().out
+
+    assert cli.main(["--base", base, "stats", "--critere", "sexe"]) == 0
+    sortie = capsys.readouterr().out
+    assert "60 candidat(s) dont 60 délibéré(s)" in sortie
+    assert "taux d'admission -" not in sortie
+    assert "Sexe" in sortie
+    # Chaque commande referme sa connexion
+    assert getattr(connexion._local, "conn", None) is None
+
+
+def test_erreur_signalee(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(connexion, "CHEMIN_BASE", connexion.CHEMIN_BASE)
+    assert cli.main(["--base", str(tmp_path / "jury.db"), "importer-candidats", str(tmp_path / "absent.csv")]) == 1
+    assert "absent.csv" in capsys.readouterr().err
+
+
+def test_historique_du_benchmark(tmp_path, monkeypatch):
+    monkeypatch.setattr(connexion, "CHEMIN_BASE", connexion.CHEMIN_BASE)
+    fichier = str(tmp_path / "benchmarks.jsonl")
+    lignes = []
+    mesures = benchmark.executer([30], str(tmp_path / "bases"), version="v1", fichier=fichier, afficher=lignes.append)
+
+    with open(fichier, encoding="utf-8") as entree:
+        historique = [json.loads(ligne) for ligne in entree]
+    assert historique == mesures
+    assert all(set(mesure) == CLES_MESURE for mesure in historique)
+    assert [mesure["etape"] for mesure in historique] == ["generation"] + [
+        nom for nom, _ in benchmark.etapes(str(tmp_path), avec_qt=True)]
+    assert {(mesure["version"], mesure["taille"]) for mesure in historique} == {("v1", 30)}
+    assert all(mesure["secondes"] >= 0 for mesure in historique)
+
+
+def test_comparaison_avec_la_version_precedente():
+    def mesure(version, etape, secondes):
+        return {"version": version, "taille": 1000, "etape": etape, "secondes": secondes}
+
+    historique = [mesure("v1", "deliberation_tour1", 1.0), mesure("v1", "statistiques", 0.01),
+                  mesure("v1", "pdf_pv", 2.0)]
+    nouvelles = [mesure("v2", "deliberation_tour1", 1.5), mesure("v2", "statistiques", 0.02),
+                 mesure("v2", "pdf_pv", 2.1)]
+    # statistiques double, mais de 10 ms seulement : sous ECART_MINIMUM ; pdf_pv sous le seuil relatif
+    assert [(etape, round(ecart, 2)) for _, etape, _, _, ecart in benchmark.comparer(nouvelles, historique)] == [
+        ("deliberation_tour1", 0.5)]
+    # Les mesures de la même version ne servent pas de référence
+    assert benchmark.comparer(nouvelles, nouvelles) == []
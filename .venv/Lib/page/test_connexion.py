@@ -0,0 +1,52 @@
+import threading
+
+import connexion
+import database
+
+
+def test_une_connexion_par_thread(base):
+    assert connexion.get_connexion() is base
+
+    connexions = []
+    def ouvrir():
+        connexions.append(connexion.get_connexion())
+        connexions[-1].execute("SELECT COUNT(*) FROM candidat").fetchone()
+        connexion.fermer_connexion()
+
+    fils = [threading.Thread(target=ouvrir) for _ in range(2)]
+    for thread in fils:
+        thread.start()
+    for thread in fils:
+        thread.join()
+    assert len(connexions) == 2
+    assert connexions[0] is not connexions[1]
+    assert base not in connexions
+    # Le thread principal garde sa connexion
+    assert connexion.get_connexion() is base
+
+
+def test_reglages_de_la_connexion(base):
+    assert base.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    assert base.execute("PRAGMA synchronous").fetchone() == (1,)  # NORMAL
+    assert base.execute("PRAGMA temp_store").fetchone() == (2,)  # MEMORY
+    assert base.execute("PRAGMA user_version").fetchone() == (len(database.MIGRATIONS),)
+
+
+def test_fermeture(base):
+    connexion.fermer_connexion()
+    nouvelle = connexion.get_connexion()
+    assert nouvelle is not base
+    assert nouvelle.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+def test_transaction(base):
+    with connexion.transaction() as cursor:
+        cursor.execute("INSERT INTO matiere (nom, coefficient, tour) VALUES ('Maths', 4, 1)")
+    try:
+        with connexion.transaction() as cursor:
+            cursor.execute("INSERT INTO matiere (nom, coefficient, tour) VALUES ('Français', 2, 1)")
+            raise RuntimeError("interrompue")
+    except RuntimeError:
+        pass
+    assert not base.in_transaction
+    assert base.execute("SELECT nom FROM matiere").fetchall() == [("Maths",)]
@@ -0,0 +1,212 @@
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+import consolidation
+import depot
+import generateur
+import noyau
+import statistiques
+from connexion import get_connexion
+
+
+def _centre(tmp_path, nom, prefixe, nombre, graine):
+    """Base d'un centre : candidats fictifs anonymisés et délibérés aux deux tours ; retourne son chemin"""
+    chemin = str(tmp_path / f"{nom}.db")
+    noyau.ouvrir_base(chemin)
+    depot.ajouter_jury("IA Dakar", "IEF Dakar", "Dakar", nom, "M. Sarr", "770000000")
+    generateur.generer(nombre, graine, prefixe)
+    noyau.attribuer_anonymats()
+    noyau.deliberer(1)
+    noyau.deliberer(2)
+    return chemin
+
+
+def _exporter(centre, paquet, complet=False):
+    noyau.ouvrir_base(centre)
+    return noyau.exporter_centre(str(paquet), complet)
+
+
+def _fusionner(nationale, *paquets):
+    noyau.ouvrir_base(nationale)
+    bilans, erreurs = noyau.fusionner_centres([str(paquet) for paquet in paquets])
+    return [bilan[1:] for bilan in bilans], erreurs
+
+
+def _contenu(prefixe):
+    """Résultats et notes des candidats dont le numéro de table commence par `prefixe`, sans id"""
+    conn = get_connexion()
+    resultats = conn.execute("""
+        SELECT c.numero_table, c.nom, r.total_points, r.presentation, r2.total_points, r2.presentation
+        FROM candidat c JOIN resultat r ON r.candidat_id = c.id JOIN resultat_2e_tour r2 ON r2.candidat_id = c.id
+        WHERE c.numero_table LIKE ? || '%' ORDER BY 1
+    """, (prefixe,)).fetchall()
+    notes = conn.execute("""
+        SELECT c.numero_table, m.nom, n.note_premier_tour, n.note_deuxieme_tour
+        FROM note n JOIN candidat c ON c.id = n.candidat_id JOIN matiere m ON m.id = n.matiere_id
+        WHERE c.numero_table LIKE ? || '%' ORDER BY 1, 2
+    """, (prefixe,)).fetchall()
+    return resultats, notes
+
+
+def _stats_coherentes():
+    conn = get_connexion()
+    lire = lambda: sorted(tuple(round(valeur, 6) if isinstance(valeur, float) else valeur for valeur in ligne)
+                          for ligne in conn.execute("SELECT * FROM stat_resultat WHERE effectif <> 0"))
+    maintenues = lire()
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    statistiques.reconstruire(cursor)
+    reconstruites = lire()
+    conn.rollback()
+    return maintenues == reconstruites
+
+
+@pytest.fixture
+def centres(base, tmp_path):
+    """Deux centres (A : 30 candidats, B : 20) et le chemin de la base nationale"""
+    a = _centre(tmp_path, "Centre A", "A", 30, 1)
+    b = _centre(tmp_path, "Centre B", "B", 20, 2)
+    return a, b, str(tmp_path / "nationale.db")
+
+
+def test_fusion_complete(centres, tmp_path):
+    a, b, nationale = centres
+    attendu = {}
+    for centre, prefixe in ((a, "A"), (b, "B")):
+        _exporter(centre, tmp_path / f"{prefixe}.paquet", complet=True)
+        attendu[prefixe] = _contenu(prefixe)
+
+    noyau.ouvrir_base(nationale)
+    triggers = get_connexion().execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone()[0]
+    bilans, erreurs = _fusionner(nationale, tmp_path / "A.paquet", tmp_path / "B.paquet")
+
+    assert erreurs == []
+    assert bilans == [("Centre A", 30, 0, 0), ("Centre B", 20, 0, 0)]
+    assert _contenu("A") == attendu["A"]
+    assert _contenu("B") == attendu["B"]
+    conn = get_connexion()
+    # Les anonymats sont propres à chaque centre : ils ne sont pas repris
+    assert conn.execute("SELECT COUNT(*) FROM candidat WHERE anonymat <> 0").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone()[0] == triggers
+    assert [centre[:3] for centre in consolidation.lister_centres()] == [("Centre A", "Dakar", 30),
+                                                                         ("Centre B", "Dakar", 20)]
+    assert _stats_coherentes()
+
+
+def test_resynchronisation_incrementale(centres, tmp_path):
+    a, b, nationale = centres
+    _exporter(a, tmp_path / "A1.paquet", complet=True)
+    _fusionner(nationale, tmp_path / "A1.paquet")
+
+    # Au centre : une note changée, un candidat supprimé, un candidat ajouté
+    noyau.ouvrir_base(a)
+    conn = get_connexion()
+    matiere_id = depot.matieres_du_tour(1)[0][0]
+    depot.enregistrer_notes(1, {matiere_id: 20}, 1)
+    with conn:
+        conn.execute("DELETE FROM candidat WHERE id = 2")
+    generateur.generer(1, 3, "AN")
+    noyau.deliberer(1, incremental=True)
+    attendu = _contenu("A")
+
+    _exporter(a, tmp_path / "A2.paquet")
+    # Le paquet incrémental ne contient que les candidats modifiés (le supprimé est dans le journal)
+    paquet = sqlite3.connect(str(tmp_path / "A2.paquet"))
+    assert paquet.execute("SELECT COUNT(*) FROM candidat").fetchone()[0] == 2
+    assert paquet.execute("SELECT COUNT(*) FROM journal_candidat").fetchone()[0] == 3
+    paquet.close()
+
+    bilans, erreurs = _fusionner(nationale, tmp_path / "A2.paquet")
+    assert (bilans, erreurs) == ([("Centre A", 2, 1, 0)], [])
+    assert _contenu("A") == attendu
+    assert _stats_coherentes()
+
+    # Rien de neuf depuis : rien à transférer
+    _exporter(a, tmp_path / "A3.paquet")
+    assert _fusionner(nationale, tmp_path / "A3.paquet") == ([("Centre A", 0, 0, 0)], [])
+
+
+def test_doublon_numero_table(centres, tmp_path):
+    a, b, nationale = centres
+    noyau.ouvrir_base(b)
+    with get_connexion() as conn:
+        conn.execute("UPDATE candidat SET numero_table = 'A0000005' WHERE id = 1")
+    for centre, prefixe in ((a, "A"), (b, "B")):
+        _exporter(centre, tmp_path / f"{prefixe}.paquet", complet=True)
+
+    bilans, _ = _fusionner(nationale, tmp_path / "A.paquet", tmp_path / "B.paquet")
+    assert bilans[1] == ("Centre B", 19, 0, 1)
+    assert consolidation.lister_doublons() == [("A0000005", "Centre B", "Centre A")]
+
+    # Le centre corrige le numéro : le candidat est transféré au prochain envoi
+    noyau.ouvrir_base(b)
+    with get_connexion() as conn:
+        conn.execute("UPDATE candidat SET numero_table = 'B9999999' WHERE id = 1")
+    _exporter(b, tmp_path / "B2.paquet")
+    assert _fusionner(nationale, tmp_path / "B2.paquet") == ([("Centre B", 1, 0, 0)], [])
+    assert consolidation.lister_doublons() == []
+    assert get_connexion().execute("SELECT COUNT(*) FROM candidat").fetchone()[0] == 50
+
+
+def test_paquet_intermediaire_manquant(centres, tmp_path):
+    a, _, nationale = centres
+    _exporter(a, tmp_path / "A1.paquet", complet=True)
+    _fusionner(nationale, tmp_path / "A1.paquet")
+
+    # Deux envois successifs ; le premier n'arrive pas à la base nationale
+    noyau.ouvrir_base(a)
+    matiere_id = depot.matieres_du_tour(1)[0][0]
+    for numero in (2, 3):
+        depot.enregistrer_notes(numero, {matiere_id: 19}, 1)
+        _exporter(a, tmp_path / f"A{numero}.paquet")
+
+    bilans, erreurs = _fusionner(nationale, tmp_path / "A3.paquet")
+    assert bilans == []
+    assert "paquet intermédiaire manque" in erreurs[0][1]
+
+    assert _fusionner(nationale, tmp_path / "A2.paquet", tmp_path / "A3.paquet")[1] == []
+    noyau.ouvrir_base(a)
+    attendu = _contenu("A")
+    noyau.ouvrir_base(nationale)
+    assert _contenu("A") == attendu
+
+
+def test_paquet_invalide_n_interrompt_pas_la_fusion(centres, tmp_path):
+    a, _, nationale = centres
+    _exporter(a, tmp_path / "A.paquet", complet=True)
+    (tmp_path / "corrompu.paquet").write_text("pas une base")
+
+    bilans, erreurs = _fusionner(nationale, tmp_path / "absent.paquet", tmp_path / "corrompu.paquet",
+                                 tmp_path / "A.paquet")
+    assert bilans == [("Centre A", 30, 0, 0)]
+    assert [os.path.basename(chemin) for chemin, _ in erreurs] == ["absent.paquet", "corrompu.paquet"]
+
+
+def test_bases_copiees(centres, tmp_path):
+    # Copie d'une base jamais exportée : chaque copie tire son propre code au premier export
+    a, _, nationale = centres
+    noyau.fermer_connexion()
+    copie = str(tmp_path / "copie.db")
+    shutil.copy(a, copie)
+    noyau.ouvrir_base(copie)
+    with get_connexion() as conn:
+        conn.execute("UPDATE candidat SET numero_table = 'C' || substr(numero_table, 2)")
+    _exporter(a, tmp_path / "A.paquet")
+    _exporter(copie, tmp_path / "C.paquet")
+
+    # Copie d'une base déjà exportée : nouveau code demandé explicitement
+    noyau.fermer_connexion()
+    seconde = str(tmp_path / "seconde.db")
+    shutil.copy(a, seconde)
+    noyau.ouvrir_base(seconde)
+    with get_connexion() as conn:
+        conn.execute("UPDATE candidat SET numero_table = 'D' || substr(numero_table, 2)")
+    noyau.exporter_centre(str(tmp_path / "D.paquet"), nouveau_code=True)
+
+    bilans, erreurs = _fusionner(nationale, tmp_path / "A.paquet", tmp_path / "C.paquet", tmp_path / "D.paquet")
+    assert erreurs == []
+    assert [bilan[1] for bilan in bilans] == [30, 30, 30]
+    assert len(consolidation.lister_centres()) == 3
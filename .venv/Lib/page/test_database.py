@@ -0,0 +1,99 @@
+import sqlite3
+
+import pytest
+
+import database
+
+
+def _index(conn):
+    return {nom for (nom,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+def _schema(conn):
+    return conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY type, name").fetchall()
+
+
+def _version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "bfem.db"))
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def base_ancienne(conn):
+    """Base créée par l'ancien script (tables seules, user_version à 0), avec les doublons qu'il laissait passer"""
+    cursor = conn.cursor()
+    database.creer_tables(cursor)
+    cursor.executemany("""
+        INSERT INTO candidat (numero_table, prenom, nom, date_naissance, lieu_naissance, sexe, type_candidat,
+                              etablissement, nationalite, etat_sportif, anonymat)
+        VALUES (?, 'Awa', 'Diop', '2009-03-12', 'Dakar', 'F', 'Candidat normal', 'CEM Dakar', 'Sénégalaise', 'Apte', ?)
+    """, [("T1", 1234), ("T2", 1234), ("T3", 0)])
+    cursor.execute("INSERT INTO matiere (nom, coefficient, tour) VALUES ('Maths', 4, 1)")
+    cursor.executemany("INSERT INTO note (note_premier_tour, matiere_id, candidat_id) VALUES (?, 1, 1)", [(8,), (12,)])
+    cursor.executemany("INSERT INTO resultat (total_points, moyenne, candidat_id) VALUES (?, 0, 1)", [(0,), (48,)])
+    conn.commit()
+    assert _version(conn) == 0
+    return conn
+
+
+def test_base_vide(conn):
+    assert database.migrer(conn) == len(database.MIGRATIONS)
+    assert _version(conn) == len(database.MIGRATIONS)
+    assert {"idx_note_candidat_matiere", "idx_candidat_anonymat_unique"} <= _index(conn)
+    assert not conn.in_transaction
+
+
+def test_base_ancienne(base_ancienne):
+    conn = base_ancienne
+    database.migrer(conn)
+    assert _version(conn) == len(database.MIGRATIONS)
+
+    # Doublons résorbés : la note et le résultat les plus récents sont gardés, l'anonymat en double est à réattribuer
+    assert conn.execute("SELECT note_premier_tour FROM note").fetchall() == [(12,)]
+    assert conn.execute("SELECT total_points FROM resultat").fetchall() == [(48,)]
+    assert conn.execute("SELECT numero_table, anonymat FROM candidat ORDER BY id").fetchall() == [
+        ("T1", 1234), ("T2", 0), ("T3", 0)]
+    # Base existante : tout le monde sera délibéré une fois
+    assert conn.execute("SELECT COUNT(*) FROM deliberation_en_attente").fetchone()[0] == 6
+
+
+def test_migration_idempotente(base_ancienne):
+    conn = base_ancienne
+    database.migrer(conn)
+    schema = _schema(conn)
+    changements = conn.total_changes
+
+    assert database.migrer(conn) == len(database.MIGRATIONS)
+    assert _schema(conn) == schema
+    assert conn.total_changes == changements
+
+
+def test_migration_en_echec_annulee(conn, monkeypatch):
+    def echec(cursor):
+        cursor.execute("CREATE TABLE temporaire (id INTEGER)")
+        cursor.execute("SELECT * FROM table_inexistante")
+
+    monkeypatch.setattr(database, "MIGRATIONS", database.MIGRATIONS[:2] + [echec])
+    with pytest.raises(sqlite3.OperationalError):
+        database.migrer(conn)
+    # Les versions réussies restent acquises, la version en échec ne laisse rien
+    assert _version(conn) == 2
+    assert "temporaire" not in {nom for _, nom, _ in _schema(conn)}
+
+
+def test_pas_d_index_sur_les_mots_de_passe(conn):
+    database.migrer(conn)
+    assert "idx_membre_jury_email" not in _index(conn)
+
+    # Base migrée par une version précédente : l'index est retiré
+    conn.execute("CREATE INDEX idx_membre_jury_email ON membre_jury (email, mot_de_passe)")
+    conn.execute("PRAGMA user_version = 6")
+    database.migrer(conn)
+    assert "idx_membre_jury_email" not in _index(conn)
+    assert _version(conn) == len(database.MIGRATIONS)
@@ -0,0 +1,143 @@
+import random
+
+import pytest
+
+import deliberation
+
+# (nom, coefficient, tour, facultative)
+MATIERES = [
+    ("Français", 2, 1, 0),
+    ("Mathématiques", 4, 1, 0),
+    ("EPS", 1, 1, 0),
+    ("Facultatif", 1, 1, 1),
+    ("Français (2e tour)", 2, 2, 0),
+    ("Mathématiques (2e tour)", 4, 2, 0),
+]
+
+
+@pytest.fixture
+def base_notee(base):
+    _inscrire(base, 60, random.Random(0))
+    return base
+
+
+def _inscrire(conn, nombre, aleatoire):
+    """Inscrit `nombre` candidats avec leurs notes, comme le fait l'application"""
+    with conn:
+        conn.executemany("INSERT INTO matiere (nom, coefficient, tour, facultative) VALUES (?, ?, ?, ?)", MATIERES)
+        matieres = conn.execute("SELECT id, coefficient, tour FROM matiere").fetchall()
+        for numero in range(nombre):
+            releve_id = conn.execute(
+                "INSERT INTO releve_scolaire (moyenne_generale, nombre_de_fois) VALUES (12, 1)").lastrowid
+            candidat_id = conn.execute("""
+                INSERT INTO candidat (numero_table, prenom, nom, date_naissance, lieu_naissance, sexe,
+                                      type_candidat, etablissement, nationalite, etat_sportif, releve_scolaire_id)
+                VALUES (?, 'Awa', 'Diop', '2009-03-12', 'Dakar', 'F', 'Candidat normal', 'CEM Dakar',
+                        'Sénégalaise', 'Apte', ?)
+            """, (f"T{numero:04d}", releve_id)).lastrowid
+            for table in ("resultat", "resultat_2e_tour"):
+                conn.execute(f"INSERT INTO {table} (candidat_id, total_points, moyenne, presentation) "
+                             f"VALUES (?, 0, 0, '')", (candidat_id,))
+            for matiere_id, coefficient, tour in matieres:
+                note = aleatoire.randint(4, 18)
+                if tour == 1:
+                    conn.execute("INSERT INTO releve_notes_1er_tour (candidat_id, matiere_id, note, points) "
+                                 "VALUES (?, ?, ?, ?)", (candidat_id, matiere_id, note, note * coefficient))
+                else:
+                    conn.execute("INSERT INTO note (note_deuxieme_tour, matiere_id, candidat_id) VALUES (?, ?, ?)",
+                                 (note, matiere_id, candidat_id))
+
+
+def _resultats(conn):
+    return {table: conn.execute(f"SELECT candidat_id, total_points, moyenne, repechable, presentation "
+                                f"FROM {table} ORDER BY candidat_id").fetchall()
+            for table in ("resultat", "resultat_2e_tour")}
+
+
+def _matieres(conn, tour):
+    return [matiere_id for (matiere_id,) in conn.execute("SELECT id FROM matiere WHERE tour = ?", (tour,))]
+
+
+def _modifier_notes(conn, tour, nombre, aleatoire):
+    """Change une note de `nombre` candidats tirés au hasard, comme la saisie des notes"""
+    matieres = _matieres(conn, tour)
+    candidats = [candidat_id for (candidat_id,) in conn.execute("SELECT id FROM candidat")]
+    with conn:
+        for candidat_id in aleatoire.sample(candidats, nombre):
+            matiere_id, note = aleatoire.choice(matieres), aleatoire.randint(0, 20)
+            if tour == 1:
+                conn.execute("""
+                    UPDATE releve_notes_1er_tour
+                    SET note = ?, points = ? * (SELECT coefficient FROM matiere WHERE id = matiere_id)
+                    WHERE candidat_id = ? AND matiere_id = ?
+                """, (note, note, candidat_id, matiere_id))
+            else:
+                conn.execute("UPDATE note SET note_deuxieme_tour = ? WHERE candidat_id = ? AND matiere_id = ?",
+                             (note, candidat_id, matiere_id))
+
+
+@pytest.mark.parametrize("tour", [1, 2])
+def test_incrementale_egale_complete(base_notee, tour):
+    conn = base_notee
+    deliberation.deliberer(conn, tour)
+    aleatoire = random.Random(tour)
+
+    _modifier_notes(conn, tour, 15, aleatoire)
+    # Un changement de coefficient touche tous les candidats qui ont une note dans la matière
+    with conn:
+        conn.execute("UPDATE matiere SET coefficient = coefficient + 1 WHERE id = ?", (_matieres(conn, tour)[0],))
+    assert deliberation.deliberer(conn, tour, incremental=True) > 0
+    _modifier_notes(conn, tour, 5, aleatoire)
+    assert deliberation.deliberer(conn, tour, incremental=True) <= 5
+    incrementale = _resultats(conn)
+
+    deliberation.deliberer(conn, tour)
+    assert _resultats(conn) == incrementale
+    assert conn.execute("SELECT COUNT(*) FROM deliberation_en_attente WHERE tour = ?", (tour,)).fetchone()[0] == 0
+
+
+def test_incrementale_sans_changement(base_notee):
+    deliberation.deliberer(base_notee, 1)
+    assert deliberation.deliberer(base_notee, 1, incremental=True) == 0
+
+
+def test_annulation_entre_les_etapes(base_notee):
+    conn = base_notee
+    avant = _resultats(conn)
+
+    def annuler(etape, total):
+        if etape == 2:
+            raise RuntimeError("annulée")
+
+    with pytest.raises(RuntimeError):
+        deliberation.deliberer(conn, 1, progression=annuler)
+    assert not conn.in_transaction
+    assert _resultats(conn) == avant
+
+
+def test_bonus_eps_et_facultatif(base_notee):
+    conn = base_notee
+    # Notes à 10, sauf EPS à 14 (bonus de 4) et épreuve facultative à 16 (bonus de 6)
+    with conn:
+        conn.execute("UPDATE releve_notes_1er_tour SET note = 10, points = 10 * (SELECT coefficient FROM matiere "
+                     "WHERE id = matiere_id) WHERE candidat_id = 1")
+        conn.execute("""
+            UPDATE releve_notes_1er_tour SET note = CASE matiere_id WHEN 3 THEN 14 ELSE 16 END,
+                                             points = CASE matiere_id WHEN 3 THEN 14 ELSE 16 END
+            WHERE candidat_id = 1 AND matiere_id IN (3, 4)
+        """)
+    deliberation.deliberer(conn, 1)
+    total_points = conn.execute("SELECT total_points FROM resultat WHERE candidat_id = 1").fetchone()[0]
+    assert total_points == 2 * 10 + 4 * 10 + 14 + 16 + 4 + 6
+
+
+@pytest.mark.parametrize("total_points, presentation, repechable", [
+    (180, "Admis d'office", 0),
+    (175, "Admissible", 1),
+    (153, "Admissible", 0),
+    (150, "Ajourné", 1),
+    (143, "Ajourné", 0),
+])
+def test_seuils(total_points, presentation, repechable):
+    # 20 coefficients : la moyenne reste sous la moyenne de repêchage
+    assert deliberation.calculer_resultat(total_points, 20)[1:] == (repechable, presentation)
@@ -0,0 +1,43 @@
+import sqlite3
+
+import pytest
+
+import depot
+
+CANDIDAT = ["T0001", "Awa", "Diop", "2009-03-12", "Dakar", "F", "Candidat normal", "CEM Dakar", "Sénégalaise", "Apte"]
+
+
+def test_crud_matiere(base):
+    maths = depot.ajouter_matiere("Maths", 4, 1)
+    anglais = depot.ajouter_matiere("Anglais (2e tour)", 2, 2, facultative=True)
+    assert depot.lister_matieres() == [(maths, "Maths", 4, 1), (anglais, "Anglais (2e tour)", 2, 2)]
+    assert depot.lister_matieres(tour=2) == [(anglais, "Anglais (2e tour)", 2, 2)]
+
+    depot.modifier_matiere(maths, "Mathématiques", 5, True)
+    assert depot.infos_matiere(maths) == ("Mathématiques", 5, 1, 1)
+    depot.supprimer_matiere(anglais)
+    assert depot.infos_matiere(anglais) is None
+    assert not base.in_transaction
+
+
+def test_modification_annulee_en_cas_d_erreur(base):
+    maths = depot.ajouter_matiere("Maths", 4, 1)
+    depot.ajouter_matiere("Français", 2, 1)
+    with pytest.raises(sqlite3.IntegrityError):
+        depot.modifier_matiere(maths, "Français", 4, False)
+    assert not base.in_transaction
+    assert depot.infos_matiere(maths) == ("Maths", 4, 0, 1)
+
+
+def test_modification_et_suppression_candidat(base):
+    depot.ajouter_matiere("Maths", 4, 1)
+    candidat_id = depot.ajouter_candidat(CANDIDAT, [12, 11, 14, 13, 12.5, 1])
+    assert depot.infos_candidat(candidat_id) == tuple(CANDIDAT[1:]) + (0,)
+    assert depot.lister_releves_scolaires() == [("Awa", "Diop", "2009-03-12", "Dakar", 12, 11, 14, 13, 12.5, 1)]
+
+    depot.modifier_candidat(candidat_id, "Awa", "Ndiaye", "2009-03-12", "Dakar", "F", "Candidat libre",
+                            "CEM Dakar", "Sénégalaise", "Inapte", 1234)
+    assert depot.infos_candidat(candidat_id) == ("Awa", "Ndiaye", "2009-03-12", "Dakar", "F", "Candidat libre",
+                                                 "CEM Dakar", "Sénégalaise", "Inapte", 1234)
+    depot.supprimer_candidat(candidat_id)
+    assert depot.infos_candidat(candidat_id) is None
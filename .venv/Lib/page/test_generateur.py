@@ -0,0 +1,51 @@
+import sqlite3
+
+import pytest
+
+import generateur
+
+
+def _contenu(conn):
+    return (conn.execute("SELECT c.numero_table, c.nom, r.moyenne_generale FROM candidat c "
+                         "JOIN releve_scolaire r ON r.id = c.releve_scolaire_id ORDER BY c.id").fetchall(),
+            conn.execute("SELECT candidat_id, matiere_id, note_premier_tour, note_deuxieme_tour FROM note "
+                         "ORDER BY 1, 2").fetchall())
+
+
+def test_generation(base, monkeypatch):
+    monkeypatch.setattr(generateur, "TAILLE_LOT", 40)
+    assert generateur.generer(100, graine=4) == 100
+
+    compter = lambda requete: base.execute(requete).fetchone()[0]
+    assert compter("SELECT COUNT(*) FROM candidat") == 100
+    assert compter("SELECT COUNT(DISTINCT releve_scolaire_id) FROM candidat") == 100
+    assert compter("SELECT COUNT(*) FROM resultat") == compter("SELECT COUNT(*) FROM resultat_2e_tour") == 100
+    # Une note par candidat et par matière, aux deux tours
+    assert compter("SELECT COUNT(*) FROM note") == 100 * len(generateur.MATIERES)
+    assert compter("SELECT COUNT(*) FROM note WHERE note_premier_tour IS NULL AND note_deuxieme_tour IS NULL") == 0
+    assert base.execute("SELECT MIN(numero_table), MAX(numero_table) FROM candidat").fetchone() == ("G0000001",
+                                                                                                  "G0000100")
+
+
+def test_meme_graine_memes_donnees(base):
+    generateur.generer(30, graine=7)
+    premiere = _contenu(base)
+    with base:
+        for table in ("note", "releve_notes_1er_tour", "releve_notes_2e_tour", "resultat", "resultat_2e_tour",
+                      "candidat", "releve_scolaire"):
+            base.execute(f"DELETE FROM {table}")
+    generateur.generer(30, graine=7)
+    candidats, notes = _contenu(base)
+    assert candidats == premiere[0]
+    assert [note[2:] for note in notes] == [note[2:] for note in premiere[1]]
+
+
+def test_numero_de_table_deja_pris(base):
+    generateur.generer(10, graine=1)
+    with base:
+        base.execute("DELETE FROM candidat WHERE numero_table = 'G0000001'")
+    # 9 inscrits : le numéro suivant, G0000010, existe déjà ; rien n'est écrit
+    with pytest.raises(sqlite3.IntegrityError, match="G0000010"):
+        generateur.generer(5, graine=2)
+    assert not base.in_transaction
+    assert base.execute("SELECT COUNT(*) FROM candidat").fetchone()[0] == 9
@@ -0,0 +1,124 @@
+import pytest
+
+import anonymisation
+import depot
+import importation
+from connexion import transaction
+
+ENTETE = ";".join(importation.COLONNES_CANDIDAT + importation.COLONNES_RELEVE)
+
+
+def _ligne(numero_table, sexe="F", date="12/03/2009", moyenne_3e="13,5"):
+    return (f"{numero_table};Awa;Diop;{date};Dakar;{sexe};Candidat normal;CEM Dakar;Sénégalaise;Apte;"
+            f"12;11;14;{moyenne_3e};1")
+
+
+def _csv(tmp_path, lignes, nom="registre.csv"):
+    chemin = tmp_path / nom
+    chemin.write_text("\n".join(lignes) + "\n", encoding="utf-8")
+    return str(chemin)
+
+
+def _ajouter_matiere(nom, coefficient):
+    """Matière du 1er tour ajoutée comme depuis l'écran des matières ; retourne son id"""
+    with transaction() as cursor:
+        cursor.execute("INSERT INTO matiere (nom, coefficient, tour) VALUES (?, ?, 1)", (nom, coefficient))
+        matiere_id = cursor.lastrowid
+        depot.initialiser_matiere(cursor, matiere_id, tour=1)
+    return matiere_id
+
+
+def _numeros_table(conn):
+    return [numero for (numero,) in conn.execute("SELECT numero_table FROM candidat ORDER BY id")]
+
+
+def test_import_candidats(base, tmp_path):
+    _ajouter_matiere("Maths", 4)
+    importes, erreurs = importation.importer_candidats(_csv(tmp_path, [ENTETE, _ligne("T1", "masculin"),
+                                                                       _ligne("T2", date="2009-01-31")]))
+    assert (importes, erreurs) == (2, [])
+
+    candidat = base.execute("""
+        SELECT c.sexe, c.date_naissance, r.moyenne_3e, r.moyenne_generale
+        FROM candidat c JOIN releve_scolaire r ON r.id = c.releve_scolaire_id
+        WHERE c.numero_table = 'T1'
+    """).fetchone()
+    assert candidat == ("M", "2009-03-12", 13.5, (12 + 11 + 14 + 13.5) / 4)
+    # Résultats et relevés de notes initialisés comme pour une inscription à la main
+    assert base.execute("SELECT COUNT(*) FROM resultat").fetchone()[0] == 2
+    assert base.execute("SELECT COUNT(*) FROM releve_notes_1er_tour").fetchone()[0] == 2
+
+
+def test_lignes_invalides_signalees(base, tmp_path):
+    lignes = [ENTETE, _ligne("T1"), _ligne("T2", sexe="X"), _ligne("T3", date="31/02/2009"),
+              _ligne("T4", moyenne_3e="21"), _ligne(""), _ligne("T5")]
+    importes, erreurs = importation.importer_candidats(_csv(tmp_path, lignes))
+
+    assert importes == 2
+    assert [numero for numero, _ in erreurs] == [3, 4, 5, 6]
+    assert _numeros_table(base) == ["T1", "T5"]
+
+
+def test_colonne_manquante(base, tmp_path):
+    # Les moyennes sont facultatives, pas les colonnes du candidat
+    entete = ENTETE.replace(";etat_sportif", "")
+    ligne = _ligne("T1").replace(";Apte", "")
+    assert importation.importer_candidats(_csv(tmp_path, [ENTETE.split(";moyenne_6e")[0], "T0;A;B;2009-01-01;Dakar;F;"
+                                                          "Candidat normal;CEM Dakar;Sénégalaise;Apte"])) == (1, [])
+    with pytest.raises(ValueError, match="etat_sportif"):
+        importation.importer_candidats(_csv(tmp_path, [entete, ligne]))
+
+
+def test_numero_de_table_deja_utilise(base, tmp_path):
+    importation.importer_candidats(_csv(tmp_path, [ENTETE, _ligne("T1")]))
+    importes, erreurs = importation.importer_candidats(_csv(tmp_path, [ENTETE, _ligne("T1"), _ligne("T2")]))
+    assert importes == 1
+    assert erreurs == [(2, "Numéro de table déjà utilisé : T1")]
+
+
+def test_lot_rejoue_ligne_par_ligne(base, tmp_path, monkeypatch):
+    # Doublon à l'intérieur d'un même lot : l'index unique fait échouer le lot, qui est rejoué
+    # ligne par ligne ; seule la seconde occurrence est rejetée
+    monkeypatch.setattr(importation, "TAILLE_LOT", 3)
+    rejoues = []
+    ligne_par_ligne = importation._ecrire_ligne_par_ligne
+    monkeypatch.setattr(importation, "_ecrire_ligne_par_ligne",
+                        lambda conn, lot, *args: rejoues.append(len(lot)) or ligne_par_ligne(conn, lot, *args))
+    lignes = [ENTETE] + [_ligne(numero) for numero in ("T1", "T2", "T2", "T3", "T4", "T5", "T6")]
+    importes, erreurs = importation.importer_candidats(_csv(tmp_path, lignes))
+
+    assert rejoues == [3]
+    assert importes == 6
+    assert erreurs == [(4, "Numéro de table déjà utilisé : T2")]
+    assert _numeros_table(base) == ["T1", "T2", "T3", "T4", "T5", "T6"]
+    # Chaque candidat pointe vers son propre relevé, malgré le lot rejoué
+    assert base.execute("SELECT COUNT(DISTINCT releve_scolaire_id) FROM candidat").fetchone()[0] == 6
+    assert base.execute("SELECT COUNT(*) FROM releve_scolaire").fetchone()[0] == 6
+
+
+def test_import_notes(base, tmp_path):
+    maths = _ajouter_matiere("Maths", 4)
+    francais = _ajouter_matiere("Français", 2)
+    importation.importer_candidats(_csv(tmp_path, [ENTETE, _ligne("T1"), _ligne("T2")]))
+    anonymisation.attribuer_anonymats(base)
+    (a1,), (a2,) = base.execute("SELECT anonymat FROM candidat ORDER BY id").fetchall()
+
+    feuille = ["anonymat;Maths;Français", f"{a1};12,5;", f"{a2};8;15", "abc;10;10", "99999999;10;10", f"{a1};25;1"]
+    importes, erreurs = importation.importer_notes(_csv(tmp_path, feuille, "notes.csv"), 1)
+    assert importes == 2
+    assert [numero for numero, _ in erreurs] == [4, 5, 6]
+
+    notes = dict(((candidat, matiere), (note, points)) for candidat, matiere, note, points in base.execute(
+        "SELECT c.anonymat, r.matiere_id, r.note, r.points FROM releve_notes_1er_tour r "
+        "JOIN candidat c ON c.id = r.candidat_id"))
+    assert notes[(a1, maths)] == (12.5, 50)
+    assert notes[(a1, francais)] == (0, 0)  # cellule vide : note inchangée
+    assert notes[(a2, francais)] == (15, 30)
+    assert base.execute("SELECT note_premier_tour FROM note n JOIN candidat c ON c.id = n.candidat_id "
+                        "WHERE c.anonymat = ? AND n.matiere_id = ?", (a2, maths)).fetchone() == (8,)
+
+
+def test_notes_matiere_inconnue(base, tmp_path):
+    _ajouter_matiere("Maths", 4)
+    with pytest.raises(ValueError, match="Physique"):
+        importation.importer_notes(_csv(tmp_path, ["anonymat;Maths;Physique", "1234;10;10"]), 1)
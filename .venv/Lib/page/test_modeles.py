@@ -0,0 +1,125 @@
+import os
+
+import pytest
+
+pytest.importorskip("PyQt5")
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+import depot
+import generateur
+from modeles import ModeleGrilleNotes, ModeleSQL
+
+COLONNES = ["numero_table", "prenom", "nom", "sexe", "etablissement", "anonymat"]
+
+
+@pytest.fixture(scope="module")
+def application():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def petites_pages(application, monkeypatch):
+    monkeypatch.setattr(ModeleSQL, "TAILLE_PAGE", 30)
+
+
+def _tout_charger(modele):
+    modele.recharger()
+    while modele.canFetchMore():
+        modele.fetchMore()
+    return [modele.cle(ligne) for ligne in range(modele.rowCount())]
+
+
+def _candidats(**options):
+    return ModeleSQL(depot.REQUETE_CANDIDATS, COLONNES, COLONNES + ["Actions"],
+                     colonnes_filtre=["numero_table", "nom", "anonymat"], **options)
+
+
+def test_chargement_par_pages(base_generee, petites_pages):
+    modele = _candidats()
+    modele.recharger()
+    assert modele.rowCount() == 30
+    assert modele.canFetchMore()
+    modele.fetchMore()
+    assert modele.rowCount() == 60
+
+    ids = _tout_charger(modele)
+    assert len(ids) == 200
+    assert not modele.canFetchMore()
+    assert modele.columnCount() == len(COLONNES) + 1
+    assert modele.headerData(2, Qt.Horizontal) == "nom"
+    assert modele.data(modele.index(0, 0)) == "G0000001"
+    assert modele.data(modele.index(0, len(COLONNES))) is None  # colonne d'actions
+
+
+def test_tri_et_filtre(base_generee, petites_pages):
+    modele = _candidats()
+    modele.recharger()
+    modele.sort(COLONNES.index("nom"), Qt.DescendingOrder)
+    ids = _tout_charger(modele)
+    attendu = [candidat_id for (candidat_id,) in base_generee.execute("SELECT id FROM candidat ORDER BY nom DESC, id")]
+    assert ids == attendu
+
+    modele.filtrer(" Diop ")
+    attendu = [candidat_id for (candidat_id,) in base_generee.execute(
+        "SELECT id FROM candidat WHERE numero_table LIKE '%Diop%' OR nom LIKE '%Diop%' "
+        "OR CAST(anonymat AS TEXT) LIKE '%Diop%' ORDER BY nom DESC, id")]
+    assert 0 < len(attendu) < 200
+    assert _tout_charger(modele) == attendu
+    assert [ligne[0] for ligne in modele.toutes_les_lignes()] == attendu
+
+    # Colonne d'actions : pas de tri
+    modele.sort(len(COLONNES), Qt.AscendingOrder)
+    assert modele.tri == ("nom", Qt.DescendingOrder)
+
+
+def test_ex_aequo_departages_par_id(base_generee, petites_pages):
+    # Deux valeurs seulement : chaque page est faite d'ex aequo
+    modele = _candidats(tri=("sexe", Qt.AscendingOrder))
+    ids = _tout_charger(modele)
+    assert ids == [candidat_id for (candidat_id,) in base_generee.execute("SELECT id FROM candidat ORDER BY sexe, id")]
+
+
+def _grille_attendue(conn, tour, matieres, ordre):
+    colonne = "note_premier_tour" if tour == 1 else "note_deuxieme_tour"
+    notes = {(candidat_id, matiere_id): note for candidat_id, matiere_id, note in conn.execute(
+        f"SELECT candidat_id, matiere_id, {colonne} FROM note")}
+    return [(candidat_id, anonymat) + tuple(notes.get((candidat_id, matiere_id)) for matiere_id, _ in matieres)
+            for candidat_id, anonymat in conn.execute(f"SELECT id, anonymat FROM candidat ORDER BY {ordre}")]
+
+
+def _lignes(modele):
+    return [tuple(modele._lignes[ligne]) for ligne in range(modele.rowCount())]
+
+
+@pytest.mark.parametrize("tour", [1, 2])
+def test_grille_des_notes(base_generee, petites_pages, tour):
+    matieres = depot.matieres_du_tour(tour)
+    modele = ModeleGrilleNotes(tour, matieres)
+    _tout_charger(modele)
+    assert modele.columnCount() == len(matieres) + 2
+    assert modele.headerData(1, Qt.Horizontal) == matieres[0][1]
+    assert _lignes(modele) == _grille_attendue(base_generee, tour, matieres, "anonymat, id")
+
+    modele.sort(0, Qt.DescendingOrder)
+    _tout_charger(modele)
+    assert _lignes(modele) == _grille_attendue(base_generee, tour, matieres, "anonymat DESC, id")
+
+    # Tri sur une matière : pivot de toutes les lignes, mêmes valeurs
+    modele.sort(1, Qt.AscendingOrder)
+    _tout_charger(modele)
+    lignes = _lignes(modele)
+    assert sorted(lignes) == sorted(_grille_attendue(base_generee, tour, matieres, "id"))
+    assert [ligne[2] for ligne in lignes] == sorted(ligne[2] for ligne in lignes)
+
+
+def test_grille_avant_anonymat(base, petites_pages):
+    # Anonymats pas encore attribués : tous à 0, l'id fixe l'ordre des pages
+    generateur.generer(100, graine=2)
+    matieres = depot.matieres_du_tour(1)
+    modele = ModeleGrilleNotes(1, matieres)
+    assert _tout_charger(modele) == list(range(1, 101))
+
+    modele.filtrer("0")
+    assert len(_tout_charger(modele)) == 100
@@ -0,0 +1,28 @@
+import os
+
+import connexion
+import rapports
+
+
+def test_releves_un_fichier_par_candidat(base_generee, tmp_path, monkeypatch):
+    # Plusieurs tranches réparties sur deux processus, chacun avec sa propre connexion
+    monkeypatch.setattr(rapports, "TAILLE_TRANCHE", 60)
+    dossier = tmp_path / "releves"
+    avancement = []
+    faits = rapports.generer_releves(str(dossier), un_fichier_par_candidat=True, processus=2,
+                                     progression=lambda faits, total: avancement.append((faits, total)))
+
+    numeros = [numero for (numero,) in base_generee.execute("SELECT numero_table FROM candidat")]
+    assert faits == len(numeros) == 200
+    assert sorted(os.listdir(dossier)) == sorted(rapports._nom_fichier(numero) for numero in numeros)
+    assert all(os.path.getsize(dossier / fichier) > 0 for fichier in os.listdir(dossier))
+    assert avancement[-1] == (200, 200)
+    # La connexion du thread appelant reste utilisable
+    assert connexion.get_connexion() is base_generee
+    assert base_generee.execute("SELECT COUNT(*) FROM candidat").fetchone() == (200,)
+
+
+def test_releves_en_un_seul_fichier(base_generee, tmp_path):
+    chemin = tmp_path / "releves.pdf"
+    assert rapports.generer_releves(str(chemin)) == 200
+    assert chemin.read_bytes().startswith(b"%PDF")
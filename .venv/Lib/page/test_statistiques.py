@@ -0,0 +1,152 @@
+import random
+
+import pytest
+
+import deliberation
+import depot
+import importation
+import statistiques
+
+TABLES = ["stat_resultat", "stat_note"]
+
+TYPES = ["Candidat normal", "Candidat libre"]
+ETABLISSEMENTS = ["CEM Dakar", "CEM Thiès", "CEM Kaolack"]
+
+
+@pytest.fixture
+def base_notee(base, tmp_path):
+    """120 candidats importés d'un registre, notés aux deux tours"""
+    with base:
+        # 18 coefficients au 1er tour : 10 de moyenne font les 180 points du seuil d'admission
+        base.executemany("INSERT INTO matiere (nom, coefficient, tour) VALUES (?, ?, ?)",
+                         [("Français", 6, 1), ("Mathématiques", 6, 1), ("Anglais", 4, 1), ("Histoire", 2, 1),
+                          ("Français (2e tour)", 3, 2), ("Mathématiques (2e tour)", 3, 2)])
+    aleatoire = random.Random(0)
+    lignes = [";".join(importation.COLONNES_CANDIDAT)]
+    for numero in range(120):
+        lignes.append(f"S{numero:04d};Fatou;Sow;2009-05-12;Dakar;{aleatoire.choice('MF')};{aleatoire.choice(TYPES)};"
+                      f"{aleatoire.choice(ETABLISSEMENTS)};Sénégalaise;Apte")
+    registre = tmp_path / "registre.csv"
+    registre.write_text("\n".join(lignes) + "\n", encoding="utf-8")
+    assert importation.importer_candidats(str(registre)) == (120, [])
+
+    candidats = [candidat_id for (candidat_id,) in base.execute("SELECT id FROM candidat")]
+    for tour in (1, 2):
+        matieres = [matiere_id for matiere_id, _ in depot.matieres_du_tour(tour)]
+        for candidat_id in candidats:
+            depot.enregistrer_notes(candidat_id, {matiere_id: aleatoire.randint(3, 19) for matiere_id in matieres}, tour)
+    return base
+
+
+def _synthese(conn):
+    """Lignes non vides des tables de synthèse (sommes arrondies : l'ordre d'addition varie)"""
+    synthese = {}
+    for table in TABLES:
+        lignes = conn.execute(f"SELECT * FROM {table} WHERE effectif <> 0").fetchall()
+        synthese[table] = sorted(tuple(round(valeur, 6) if isinstance(valeur, float) else valeur for valeur in ligne)
+                                 for ligne in lignes)
+    return synthese
+
+
+def _reconstruite(conn):
+    """Synthèse recalculée depuis les données, sans toucher à la base"""
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        statistiques.reconstruire(cursor)
+        return _synthese(conn)
+    finally:
+        conn.rollback()
+
+
+def test_coherence_apres_deliberation(base_notee):
+    conn = base_notee
+    deliberation.deliberer(conn, 1)
+    deliberation.deliberer(conn, 2)
+    assert _synthese(conn)["stat_resultat"]
+    assert _synthese(conn) == _reconstruite(conn)
+
+
+def test_coherence_apres_modifications(base_notee):
+    conn = base_notee
+    deliberation.deliberer(conn, 1)
+    aleatoire = random.Random(0)
+    candidats = [candidat_id for (candidat_id,) in conn.execute("SELECT id FROM candidat")]
+
+    for tour in (1, 2):
+        matieres = [matiere_id for matiere_id, _ in depot.matieres_du_tour(tour)]
+        for candidat_id in aleatoire.sample(candidats, 20):
+            depot.enregistrer_notes(candidat_id, {aleatoire.choice(matieres): aleatoire.randint(0, 20)}, tour)
+    deliberation.deliberer(conn, 1, incremental=True)
+
+    with conn:
+        # Changement des critères de ventilation, note effacée, candidat supprimé
+        conn.execute("UPDATE candidat SET etablissement = 'CEM Test', sexe = 'M' WHERE id IN (?, ?)", candidats[:2])
+        conn.execute("UPDATE note SET note_premier_tour = NULL WHERE candidat_id = ?", (candidats[2],))
+        conn.execute("DELETE FROM candidat WHERE id = ?", (candidats[3],))
+    assert _synthese(conn) == _reconstruite(conn)
+
+
+def test_ajustement_en_bloc(base_notee):
+    conn = base_notee
+    deliberation.deliberer(conn, 1)
+    avant = _synthese(conn)
+    cursor = conn.cursor()
+
+    cursor.execute("BEGIN IMMEDIATE")
+    statistiques.ajuster(cursor, "SELECT id FROM candidat WHERE id % 3 = 0", -1)
+    assert _synthese(conn) != avant
+    statistiques.ajuster(cursor, "SELECT id FROM candidat WHERE id % 3 = 0", 1)
+    assert _synthese(conn) == avant
+
+    statistiques.ajuster(cursor, "SELECT id FROM candidat", -1)
+    assert _synthese(conn) == {table: [] for table in TABLES}
+    conn.rollback()
+
+
+def test_bilan(base_notee):
+    conn = base_notee
+    deliberation.deliberer(conn, 1)
+    bilan = statistiques.bilan(1)
+
+    effectif, admis, moyenne = conn.execute(
+        "SELECT COUNT(*), SUM(presentation = ?), AVG(moyenne) FROM resultat", (statistiques.ADMIS,)).fetchone()
+    assert bilan["effectif"] == bilan["deliberes"] == effectif == 120
+    assert bilan["decisions"][statistiques.ADMIS] == admis
+    assert abs(bilan["moyenne"] - moyenne) < 1e-9
+    assert sum(ligne[1] for ligne in statistiques.repartition(1, "sexe")) == effectif
+
+
+def test_bilan_sans_les_non_deliberes(base_notee, tmp_path):
+    conn = base_notee
+    deliberation.deliberer(conn, 1)
+    attendu = statistiques.bilan(1)
+
+    # Nouveaux inscrits pas encore délibérés : comptés dans l'effectif, pas dans la moyenne ni le taux
+    registre = tmp_path / "retardataires.csv"
+    registre.write_text(";".join(importation.COLONNES_CANDIDAT) + "\n" + "\n".join(
+        f"R{numero};Modou;Fall;2009-01-02;Thiès;M;Candidat libre;CEM Thiès;Sénégalaise;Apte" for numero in range(30)),
+        encoding="utf-8")
+    importation.importer_candidats(str(registre))
+    bilan = statistiques.bilan(1)
+
+    assert bilan["effectif"] == 150
+    assert bilan["deliberes"] == 120
+    assert bilan["decisions"][statistiques.PRESENTATION_VIDE] == 30
+    for cle in ("moyenne_points", "moyenne", "taux_admission", "repechables"):
+        assert bilan[cle] == pytest.approx(attendu[cle])
+    assert sum(ligne[1] for ligne in statistiques.repartition(1, "etablissement")) == 120
+
+    # Au 2e tour, seuls les candidats notés au 2e tour sont délibérés
+    assert statistiques.bilan(2)["moyenne"] is None
+    deliberation.deliberer(conn, 2)
+    bilan = statistiques.bilan(2)
+    moyenne = conn.execute("SELECT AVG(moyenne) FROM resultat_2e_tour WHERE presentation <> ?",
+                           (statistiques.PRESENTATION_VIDE,)).fetchone()[0]
+    assert (bilan["effectif"], bilan["deliberes"]) == (150, 120)
+    assert bilan["moyenne"] == pytest.approx(moyenne)
+
+
+def test_bilan_sans_candidat(base):
+    assert statistiques.bilan(1) == {"effectif": 0, "deliberes": 0, "decisions": {}, "repechables": 0,
+                                     "moyenne_points": None, "moyenne": None, "taux_admission": None}
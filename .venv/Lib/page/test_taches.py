@@ -0,0 +1,99 @@
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("PyQt5")
+from PyQt5.QtWidgets import QApplication
+
+import connexion
+import taches
+from connexion import get_connexion, transaction
+
+# Requête sans fin pratique : seule l'annulation l'arrête
+REQUETE_LONGUE = """
+    WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n LIMIT 1000000000)
+    SELECT COUNT(*) FROM n
+"""
+
+
+@pytest.fixture
+def gestionnaire(base):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    application = QApplication.instance() or QApplication([])
+    gestionnaire = taches.GestionnaireTaches()
+    # Un seul thread : les tâches passent l'une après l'autre, dans l'ordre de soumission
+    gestionnaire.pool.setMaxThreadCount(1)
+    yield gestionnaire
+    gestionnaire.annuler_tout()
+    assert gestionnaire.attendre(taches.DELAI_FERMETURE)
+    application.processEvents()
+
+
+def test_requete_longue_annulee(gestionnaire, base):
+    demarree = threading.Event()
+
+    def fonction(tache):
+        conn = get_connexion()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("INSERT INTO matiere (nom, coefficient, tour) VALUES ('Annulée', 1, 1)")
+        demarree.set()
+        return conn.execute(REQUETE_LONGUE).fetchone()
+
+    def ecrire(tache):
+        with transaction() as cursor:
+            cursor.execute("INSERT INTO matiere (nom, coefficient, tour) VALUES ('Suivante', 1, 1)")
+
+    tache = gestionnaire.soumettre("Requête longue", fonction)
+    # En file derrière elle : n'attend pas le verrou d'écriture de la tâche annulée
+    suivante = gestionnaire.soumettre("Suivante", ecrire)
+    assert demarree.wait(10)
+    tache.annuler()
+    assert gestionnaire.attendre(10000)
+
+    assert tache.etat == taches.ANNULEE
+    assert suivante.etat == taches.TERMINEE
+    assert [nom for (nom,) in base.execute("SELECT nom FROM matiere")] == ["Suivante"]
+
+    # Plus aucune connexion ouverte : la fermeture de la dernière supprime le journal WAL
+    connexion.fermer_connexion()
+    assert not os.path.exists(connexion.CHEMIN_BASE + "-wal")
+
+
+def test_annulation_entre_les_etapes(gestionnaire):
+    demarree = threading.Event()
+    etapes = []
+
+    def fonction(tache):
+        demarree.set()
+        for etape in range(10 ** 6):
+            tache.avancer(etape, 10 ** 6)
+            etapes.append(etape)
+            get_connexion().execute("SELECT 1")
+
+    tache = gestionnaire.soumettre("Étapes", fonction)
+    assert demarree.wait(10)
+    tache.annuler()
+    assert gestionnaire.attendre(10000)
+    assert tache.etat == taches.ANNULEE
+    assert len(etapes) < 10 ** 6
+
+
+def test_echec_et_annulation_avant_le_depart(gestionnaire):
+    def echouer(tache):
+        get_connexion().execute("SELECT * FROM table_inconnue")
+
+    messages = []
+    echouee = gestionnaire.soumettre("Échec", echouer, echouee=messages.append)
+    # En attente derrière la première (un seul thread) : annulée avant de démarrer
+    jamais = gestionnaire.soumettre("Jamais lancée", lambda tache: pytest.fail("tâche annulée exécutée"))
+    jamais.annuler()
+    assert gestionnaire.attendre(10000)
+    QApplication.processEvents()
+
+    # Une requête en erreur sans annulation est un échec, pas une annulation
+    assert echouee.etat == taches.ECHOUEE
+    assert "table_inconnue" in messages[0]
+    assert jamais.etat == taches.ANNULEE
+    gestionnaire.oublier_terminees()
+    assert gestionnaire.taches == []